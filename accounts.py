@@ -0,0 +1,127 @@
+import boto3
+import threading
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError, ProfileNotFound
+
+# Upper bound on accounts resolved concurrently
+MAX_ACCOUNT_WORKERS = 8
+
+# Session name used when assuming roles
+ROLE_SESSION_NAME = 'smart-rds-viewer'
+
+# Registered sessions and AWS account IDs keyed by account name (profile name or role alias)
+_sessions = {}
+_account_ids = {}
+_sessions_lock = threading.Lock()
+
+
+def register_session(name: str, session, account_id: Optional[str] = None) -> None:
+    """Register a boto3 session and its AWS account ID under an account name."""
+    with _sessions_lock:
+        _sessions[name] = session
+        _account_ids[name] = account_id
+
+
+def get_session(name: Optional[str] = None):
+    """Get the session registered for an account, or None for the default credential chain."""
+    if name is None:
+        return None
+    return _sessions[name]
+
+
+def get_registered_account_id(name: str) -> Optional[str]:
+    """AWS account ID captured when an account was resolved."""
+    return _account_ids.get(name)
+
+
+def get_registered_accounts() -> List[str]:
+    """Names of all registered accounts in registration order."""
+    with _sessions_lock:
+        return list(_sessions)
+
+
+def load_role_arns(path: str) -> List[Dict]:
+    """
+    Read role ARNs from a file, one per line, optionally followed by an alias.
+
+    Blank lines and lines starting with '#' are ignored, e.g.:
+        arn:aws:iam::111111111111:role/ReadOnly prod
+        arn:aws:iam::222222222222:role/ReadOnly
+    """
+    roles = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            roles.append({'role_arn': parts[0], 'alias': parts[1] if len(parts) > 1 else None})
+    return roles
+
+
+def session_for_profile(profile: str) -> Dict:
+    """Create a session for a named profile and look up its account ID."""
+    session = boto3.Session(profile_name=profile)
+    identity = session.client('sts').get_caller_identity()
+    return {'name': profile, 'account_id': identity['Account'], 'session': session}
+
+
+def session_for_role(role_arn: str, alias: Optional[str] = None) -> Dict:
+    """Assume a role with the default credentials and create a session from the temporary credentials."""
+    sts = boto3.Session().client('sts')
+    response = sts.assume_role(RoleArn=role_arn, RoleSessionName=ROLE_SESSION_NAME)
+    credentials = response['Credentials']
+    session = boto3.Session(
+        aws_access_key_id=credentials['AccessKeyId'],
+        aws_secret_access_key=credentials['SecretAccessKey'],
+        aws_session_token=credentials['SessionToken'],
+    )
+    # arn:aws:iam::<account-id>:role/<name>
+    account_id = role_arn.split(':')[4]
+    return {'name': alias or account_id, 'account_id': account_id, 'session': session}
+
+
+def build_account_sessions(profiles: Optional[str] = None, role_arn_file: Optional[str] = None) -> List[str]:
+    """
+    Build and register one session per account, resolving all accounts concurrently.
+
+    Args:
+        profiles: Comma-separated AWS profile names
+        role_arn_file: Path to a file of role ARNs to assume (see load_role_arns)
+
+    Returns:
+        Names of the accounts that were resolved successfully. Accounts that fail
+        are reported and skipped so the rest of the fleet can still be shown.
+    """
+    tasks = []
+    if profiles:
+        for profile in profiles.split(','):
+            profile = profile.strip()
+            if profile:
+                tasks.append((profile, session_for_profile, (profile,)))
+    if role_arn_file:
+        for role in load_role_arns(role_arn_file):
+            tasks.append((role['alias'] or role['role_arn'], session_for_role, (role['role_arn'], role['alias'])))
+
+    if not tasks:
+        return []
+
+    print(f"[INFO] Resolving {len(tasks)} AWS accounts...")
+    accounts = []
+    with ThreadPoolExecutor(max_workers=min(MAX_ACCOUNT_WORKERS, len(tasks))) as executor:
+        futures = [(label, executor.submit(func, *func_args)) for label, func, func_args in tasks]
+        for label, future in futures:
+            try:
+                account = future.result()
+            except (BotoCoreError, ClientError, ProfileNotFound) as e:
+                print(f"[WARN] Skipping account {label}: {e}")
+                continue
+            if account['name'] in accounts:
+                print(f"[WARN] Skipping duplicate account {account['name']}")
+                continue
+            register_session(account['name'], account['session'], account['account_id'])
+            accounts.append(account['name'])
+
+    print(f"[INFO] Using {len(accounts)}/{len(tasks)} AWS accounts")
+    return accounts
@@ -1,13 +1,10 @@
-import boto3
-import threading
 from datetime import datetime, timedelta
 import pytz
 from typing import Dict, List, Optional, Tuple
 from botocore.exceptions import BotoCoreError, ClientError
-from fetch import get_optimized_rds_client
+from concurrent.futures import ThreadPoolExecutor
+from fetch import get_optimized_rds_client, get_instance_key, get_account_id, group_by_region, MAX_REGION_WORKERS
 
-# Thread-local storage for boto3 clients
-_local = threading.local()
 
 def get_local_timezone():
     """Get the local timezone."""
@@ -67,67 +64,80 @@ def fetch_backup_maintenance_data(rds_instances: List[Dict]) -> Tuple[Dict, Dict
     if not rds_instances:
         return {}, {}
     
-    # Group instances by region
-    instances_by_region = {}
-    for instance in rds_instances:
-        region = instance.get('Region', 'ap-south-1')
-        if region not in instances_by_region:
-            instances_by_region[region] = []
-        instances_by_region[region].append(instance)
+    # Group instances by account and region and process them in parallel
+    instances_by_region = group_by_region(rds_instances)
     
     backup_data = {}
     maintenance_data = {}
     
-    # Process each region
-    for region, instances in instances_by_region.items():
-        try:
-            rds = get_optimized_rds_client(region)
+    with ThreadPoolExecutor(max_workers=min(MAX_REGION_WORKERS, len(instances_by_region))) as executor:
+        futures = [
+            executor.submit(fetch_backup_maintenance_for_region, region, instances, account)
+            for (account, region), instances in instances_by_region.items()
+        ]
+        for future in futures:
+            region_backup, region_maintenance = future.result()
+            backup_data.update(region_backup)
+            maintenance_data.update(region_maintenance)
+    
+    return backup_data, maintenance_data
+
+def fetch_backup_maintenance_for_region(region: str, instances: List[Dict], account: Optional[str] = None) -> Tuple[Dict, Dict]:
+    """Fetch backup and maintenance data for the instances of a single account and region."""
+    backup_data = {}
+    maintenance_data = {}
+    
+    try:
+        rds = get_optimized_rds_client(region, account)
+        
+        # Get pending maintenance actions for this region
+        pending_maintenance = fetch_pending_maintenance_actions(rds)
+        
+        # Account ID captured once per run (during credential validation or account resolution)
+        account_id = get_account_id(account)
+        
+        # Process each instance
+        for instance in instances:
+            instance_id = instance['DBInstanceIdentifier']
+            instance_key = get_instance_key(instance)
             
-            # Get pending maintenance actions for this region
-            pending_maintenance = fetch_pending_maintenance_actions(rds)
+            # Extract backup information directly from instance data
+            backup_info = {
+                'backup_window': instance.get('PreferredBackupWindow') or 'Not set',
+                'backup_retention_period': instance.get('BackupRetentionPeriod', 0),
+                'backup_target': instance.get('BackupTarget') or 'Unknown',
+                'automated_backup_enabled': (instance.get('BackupRetentionPeriod', 0) or 0) > 0
+            }
+            backup_data[instance_key] = backup_info
             
-            # Process each instance
-            for instance in instances:
-                instance_id = instance['DBInstanceIdentifier']
-                
-                # Extract backup information directly from instance data
-                backup_info = {
-                    'backup_window': instance.get('PreferredBackupWindow') or 'Not set',
-                    'backup_retention_period': instance.get('BackupRetentionPeriod', 0),
-                    'backup_target': instance.get('BackupTarget') or 'Unknown',
-                    'automated_backup_enabled': (instance.get('BackupRetentionPeriod', 0) or 0) > 0
-                }
-                backup_data[instance_id] = backup_info
-                
-                # Extract maintenance information directly from instance data
-                maintenance_window = instance.get('PreferredMaintenanceWindow') or 'Not set'
-                next_maintenance = calculate_next_maintenance_time(maintenance_window)
-                
-                # Build instance ARN for pending maintenance lookup
-                region = instance.get('Region', 'ap-south-1')
-                # For Aurora instances, we need to check both instance and cluster ARNs
-                instance_arn = f"arn:aws:rds:{region}:333720180770:db:{instance_id}"
-                cluster_id = instance.get('DBClusterIdentifier')
-                cluster_arn = f"arn:aws:rds:{region}:333720180770:cluster:{cluster_id}" if cluster_id else None
-                
-                # Check for pending maintenance actions
-                pending_actions = []
-                if instance_arn in pending_maintenance:
-                    pending_actions.extend(pending_maintenance[instance_arn])
-                if cluster_arn and cluster_arn in pending_maintenance:
-                    pending_actions.extend(pending_maintenance[cluster_arn])
-                
-                maintenance_info = {
-                    'maintenance_window': maintenance_window,
-                    'next_maintenance_time': next_maintenance,
-                    'pending_actions': pending_actions,
-                    'has_pending_maintenance': len(pending_actions) > 0
-                }
-                maintenance_data[instance_id] = maintenance_info
-                
-        except (BotoCoreError, ClientError) as e:
-            print(f"Error fetching data for region {region}: {e}")
-            continue
+            # Extract maintenance information directly from instance data
+            maintenance_window = instance.get('PreferredMaintenanceWindow') or 'Not set'
+            next_maintenance = calculate_next_maintenance_time(maintenance_window)
+            
+            # Build instance ARN for pending maintenance lookup
+            # For Aurora instances, we need to check both instance and cluster ARNs
+            instance_arn = instance.get('DBInstanceArn') or f"arn:aws:rds:{region}:{account_id}:db:{instance_id}"
+            cluster_id = instance.get('DBClusterIdentifier')
+            owner_id = account_id or instance_arn.split(':')[4]
+            cluster_arn = f"arn:aws:rds:{region}:{owner_id}:cluster:{cluster_id}" if cluster_id else None
+            
+            # Check for pending maintenance actions
+            pending_actions = []
+            if instance_arn in pending_maintenance:
+                pending_actions.extend(pending_maintenance[instance_arn])
+            if cluster_arn and cluster_arn in pending_maintenance:
+                pending_actions.extend(pending_maintenance[cluster_arn])
+            
+            maintenance_info = {
+                'maintenance_window': maintenance_window,
+                'next_maintenance_time': next_maintenance,
+                'pending_actions': pending_actions,
+                'has_pending_maintenance': len(pending_actions) > 0
+            }
+            maintenance_data[instance_key] = maintenance_info
+            
+    except (BotoCoreError, ClientError) as e:
+        print(f"Error fetching data for region {region}: {e}")
     
     return backup_data, maintenance_data
 
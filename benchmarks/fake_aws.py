@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Local AWS stand-in for Smart RDS Viewer
+Serves the RDS, CloudWatch, Pricing, Performance Insights and STS calls the tool makes from a synthetic fleet,
+with configurable latency and throttling
+
+Usage:
+    fleet = generate_fleet(10000)
+    aws = FakeAWS(fleet, latency=0.02)
+    clients.set_client_factory(aws.client)
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from botocore.exceptions import ClientError
+
+# describe_* page size used by RDS when MaxRecords is not given
+RDS_PAGE_SIZE = 100
+
+# GetMetricData limits
+MAX_METRIC_DATA_QUERIES = 500
+MAX_METRIC_DATAPOINTS = 100800
+
+# Error codes each service uses when throttling
+THROTTLE_CODES = {'rds': 'Throttling', 'cloudwatch': 'Throttling', 'pricing': 'ThrottlingException',
+                  'sts': 'Throttling', 'pi': 'ThrottlingException'}
+
+# Metrics Insights limits
+MAX_INSIGHTS_SERIES = 500
+MAX_INSIGHTS_HOURS = 3
+INSIGHTS_QUERY = re.compile(r'SELECT\s+(\w+)\((\w+)\)\s+FROM\s+SCHEMA\("AWS/RDS",\s*(\w+)\)\s+'
+                            r'GROUP BY\s+(\w+)(?:\s+LIMIT\s+(\d+))?\s*$', re.IGNORECASE)
+INSIGHTS_FUNCTIONS = {'AVG': 'Average', 'MAX': 'Maximum', 'MIN': 'Minimum', 'SUM': 'Sum'}
+
+# Multipliers applied to the average for other statistics
+STAT_FACTORS = {'Average': 1.0, 'Maximum': 1.35, 'Minimum': 0.7, 'p5': 0.75, 'p50': 0.95, 'p90': 1.15, 'p95': 1.2, 'p99': 1.3}
+
+SIZE_WEIGHTS = {'micro': 0.5, 'small': 1, 'medium': 2, 'large': 4, 'xlarge': 8, '2xlarge': 16, '4xlarge': 32, '8xlarge': 64}
+
+
+def _utc(value):
+    """Naive datetimes are UTC, as botocore treats them."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _seeded(*parts):
+    """Deterministic Random for a metric series."""
+    return random.Random(zlib.crc32('|'.join(str(p) for p in parts).encode()))
+
+
+class FakeAWS:
+    """
+    In-process stand-in for the AWS APIs, backed by a synthetic fleet (see synthetic_fleet.generate_fleet).
+
+    Args:
+        fleet: Synthetic fleet dictionary
+        latency: Seconds added to every API call (per page for paginated calls)
+        throttle_rate: Probability that any call fails with a throttling error
+        concurrency_limits: {service: max concurrent calls per region}; calls beyond it are throttled,
+                            like AWS, which throttles each account and region on its own
+        seed: Seed for throttling decisions
+    """
+
+    def __init__(self, fleet, latency=0.0, throttle_rate=0.0, concurrency_limits=None, seed=0):
+        self.fleet = fleet
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.concurrency_limits = concurrency_limits or {}
+        self.calls = Counter()
+        self.throttled = Counter()
+        self.response_bytes = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = Counter()
+        self.now = datetime.now(timezone.utc)
+        self.models = {}
+
+        # Index the fleet the way the APIs look things up
+        self.instances_by_id = {}
+        self.instances_by_resource_id = {}
+        self.cluster_members = {}
+        for region, dbs in fleet['db_instances'].items():
+            for db in dbs:
+                self.instances_by_id[(region, db['DBInstanceIdentifier'])] = db
+                self.instances_by_resource_id[(region, db.get('DbiResourceId'))] = db
+                if db.get('DBClusterIdentifier'):
+                    self.cluster_members.setdefault((region, db['DBClusterIdentifier']), []).append(db)
+        self.products = {
+            key: [(json.loads(entry)['product']['attributes'], entry) for entry in entries]
+            for key, entries in fleet['price_lists'].items()
+        }
+
+    def client(self, service, region, account=None):
+        """Client factory for clients.set_client_factory()."""
+        client_classes = {'rds': FakeRDS, 'cloudwatch': FakeCloudWatch, 'pricing': FakePricing, 'sts': FakeSTS,
+                          'pi': FakePI}
+        if service not in client_classes:
+            raise ValueError(f"FakeAWS does not implement the {service} API")
+        return client_classes[service](self, service, region)
+
+    def call(self, service, operation, region=None):
+        """Record a call, apply throttling and latency. Returns a context manager for the call's duration."""
+        return _Call(self, service, operation, region)
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls.clear()
+            self.throttled.clear()
+            self.response_bytes.clear()
+
+    def format_calls(self):
+        """API call counts per operation, with throttled calls in brackets."""
+        parts = []
+        for (service, operation), count in sorted(self.calls.items()):
+            throttled = self.throttled.get((service, operation))
+            parts.append(f"{service}.{operation}={count}" + (f" ({throttled} throttled)" if throttled else ""))
+        return ", ".join(parts)
+
+
+class _Call:
+    def __init__(self, aws, service, operation, region=None):
+        self.aws = aws
+        self.service = service
+        self.operation = operation
+        self.scope = (service, region)
+
+    def __enter__(self):
+        aws = self.aws
+        with aws._lock:
+            aws.calls[(self.service, self.operation)] += 1
+            aws._in_flight[self.scope] += 1
+            limit = aws.concurrency_limits.get(self.service)
+            throttle = ((limit is not None and aws._in_flight[self.scope] > limit) or
+                        (aws.throttle_rate and aws._rng.random() < aws.throttle_rate))
+            if throttle:
+                aws.throttled[(self.service, self.operation)] += 1
+        if aws.latency:
+            time.sleep(aws.latency)
+        if throttle:
+            self._leave()
+            raise ClientError({'Error': {'Code': THROTTLE_CODES.get(self.service, 'Throttling'),
+                                         'Message': 'Rate exceeded'}}, self.operation)
+        return self
+
+    def __exit__(self, *exc):
+        self._leave()
+        return False
+
+    def _leave(self):
+        with self.aws._lock:
+            self.aws._in_flight[self.scope] -= 1
+
+
+class _FakeClient:
+    def __init__(self, aws, service, region):
+        self.aws = aws
+        self.region = region
+        self.meta = SimpleNamespace(region_name=region, endpoint_url=f'https://{service}.{region}.localhost')
+        self.service = service
+
+    def _error(self, code, message, operation):
+        return ClientError({'Error': {'Code': code, 'Message': message}}, operation)
+
+
+class _FakePaginator:
+    def __init__(self, client, operation, result_key, items):
+        self.client = client
+        self.operation = operation
+        self.result_key = result_key
+        self.items = items
+
+    def paginate(self, **kwargs):
+        page_size = kwargs.get('PaginationConfig', {}).get('PageSize') or kwargs.get('MaxRecords') or RDS_PAGE_SIZE
+        items = self.items()
+        for start in range(0, max(len(items), 1), page_size):
+            with self.client.aws.call(self.client.service, self.operation, self.client.region):
+                yield {self.result_key: items[start:start + page_size]}
+
+
+class FakeRDS(_FakeClient):
+    def get_paginator(self, operation):
+        fleet = self.aws.fleet
+        if operation == 'describe_db_instances':
+            return _FakePaginator(self, operation, 'DBInstances', lambda: fleet['db_instances'].get(self.region, []))
+        if operation == 'describe_reserved_db_instances':
+            return _FakePaginator(self, operation, 'ReservedDBInstances',
+                                  lambda: fleet['reserved_instances'].get(self.region, []))
+        if operation == 'describe_pending_maintenance_actions':
+            return _FakePaginator(self, operation, 'PendingMaintenanceActions',
+                                  lambda: fleet['pending_actions'].get(self.region, []))
+        raise ValueError(f"FakeRDS does not implement the {operation} paginator")
+
+    def describe_pending_maintenance_actions(self, **kwargs):
+        with self.aws.call('rds', 'describe_pending_maintenance_actions', self.region):
+            return {'PendingMaintenanceActions': self.aws.fleet['pending_actions'].get(self.region, [])}
+
+
+class FakeCloudWatch(_FakeClient):
+    def _metric_model(self, metric_name, dimensions, stat):
+        """
+        Deterministic value of a metric as a function of hours before now, shaped by the
+        instance it belongs to. Returns None when the resource does not report the metric.
+        """
+        dims = {d['Name']: d['Value'] for d in dimensions}
+        resource = dims.get('DBInstanceIdentifier') or dims.get('DBClusterIdentifier')
+        cache_key = (self.region, resource, metric_name, stat)
+        model = self.aws.models.get(cache_key)
+        if model is not None or cache_key in self.aws.models:
+            return model
+
+        rng = _seeded(self.region, resource, metric_name)
+        phase = rng.random() * 6
+        db = self.aws.instances_by_id.get((self.region, dims.get('DBInstanceIdentifier')))
+        factor = STAT_FACTORS.get(stat, 1.0)
+
+        if metric_name == 'FreeStorageSpace':
+            model = None
+            if db and db['StorageType'] != 'aurora':
+                allocated = db['AllocatedStorage'] * 1024 ** 3
+                free_now = allocated * rng.uniform(0.03, 0.9)
+                # Storage fills at a steady rate; grows back into the past
+                fill_per_hour = free_now / (rng.uniform(3, 400) * 24)
+                model = lambda hours_ago: min(allocated, free_now + fill_per_hour * hours_ago)
+        elif metric_name == 'VolumeBytesUsed':
+            model = None
+            if (self.region, resource) in self.aws.cluster_members:
+                used_now = rng.uniform(10, 5000) * 1024 ** 3
+                model = lambda hours_ago: max(0.0, used_now - used_now * 0.002 * hours_ago)
+        else:
+            if metric_name == 'CPUUtilization':
+                base = rng.uniform(2, 70)
+            elif metric_name == 'FreeableMemory':
+                size = (db or {}).get('DBInstanceClass', 'db.r6g.large').split('.')[-1]
+                base = SIZE_WEIGHTS.get(size, 4) * 2 * 1024 ** 3 * rng.uniform(0.1, 0.6)
+            elif metric_name == 'DatabaseConnections':
+                base = rng.uniform(0, 400)
+            elif metric_name in ('ReadIOPS', 'WriteIOPS'):
+                base = rng.uniform(0, (db or {}).get('Iops') or 3000) * 0.5
+            elif metric_name in ('ReadThroughput', 'WriteThroughput'):
+                base = rng.uniform(0, 100) * 1024 ** 2
+            elif metric_name == 'ReplicaLag':
+                base = rng.uniform(0, 5)
+            else:
+                base = rng.uniform(0, 100)
+            scale = base * factor
+            # Daily cycle of +-10% around the base value
+            model = lambda hours_ago: scale * (1 + 0.1 * math.sin(hours_ago / 24 * 2 * math.pi + phase))
+
+        self.aws.models[cache_key] = model
+        return model
+
+    def _metric_value(self, metric_name, dimensions, stat, timestamp):
+        model = self._metric_model(metric_name, dimensions, stat)
+        if model is None:
+            return None
+        return model((self.aws.now - timestamp).total_seconds() / 3600)
+
+    def _series(self, metric_stat, start, end, ascending):
+        metric = metric_stat['Metric']
+        period = metric_stat['Period']
+        model = self._metric_model(metric['MetricName'], metric.get('Dimensions', []), metric_stat['Stat'])
+        if model is None:
+            return [], []
+        # Datapoints are aligned to period boundaries like CloudWatch's (the start time is
+        # rounded down), and the most recent one is returned first
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        first = int((start - epoch).total_seconds()) // period * period
+        end_seconds = (end - epoch).total_seconds()
+        last = int(end_seconds) // period * period
+        if last >= end_seconds:
+            last -= period
+        count = max(0, (last - first) // period + 1)
+        timestamps = [epoch + timedelta(seconds=last - period * i) for i in range(count)]
+        if ascending:
+            timestamps.reverse()
+        hours = [(self.aws.now - ts).total_seconds() / 3600 for ts in timestamps]
+        return timestamps, [model(h) for h in hours]
+
+    def get_metric_data(self, MetricDataQueries, StartTime, EndTime, NextToken=None, ScanBy=None, **kwargs):
+        with self.aws.call('cloudwatch', 'get_metric_data', self.region):
+            if len(MetricDataQueries) > MAX_METRIC_DATA_QUERIES:
+                raise self._error('ValidationError', f'The collection MetricDataQueries must not have a size greater '
+                                  f'than {MAX_METRIC_DATA_QUERIES}.', 'GetMetricData')
+            ascending = ScanBy == 'TimestampAscending'
+            StartTime, EndTime = _utc(StartTime), _utc(EndTime)
+            results = []
+            datapoints = 0
+            start_index = int(NextToken) if NextToken else 0
+            for index in range(start_index, len(MetricDataQueries)):
+                query = MetricDataQueries[index]
+                if 'Expression' in query:
+                    results.extend(self._insights(query, StartTime, EndTime, ascending))
+                    continue
+                timestamps, values = self._series(query['MetricStat'], StartTime, EndTime, ascending)
+                if results and datapoints + len(values) > MAX_METRIC_DATAPOINTS:
+                    return {'MetricDataResults': results, 'NextToken': str(index), 'Messages': []}
+                datapoints += len(values)
+                if query.get('ReturnData', True):
+                    results.append({'Id': query['Id'], 'Label': query['MetricStat']['Metric']['MetricName'],
+                                    'Timestamps': timestamps, 'Values': values, 'StatusCode': 'Complete'})
+            return {'MetricDataResults': results, 'Messages': []}
+
+    def _insights(self, query, start, end, ascending):
+        """Metrics Insights query: one result per time series, labelled with the GROUP BY value."""
+        match = INSIGHTS_QUERY.match(query['Expression'].strip())
+        if not match:
+            raise self._error('ValidationError', f"FakeAWS cannot parse {query['Expression']!r}", 'GetMetricData')
+        function, metric_name, schema_dimension, group_by, limit = match.groups()
+        if (end - start).total_seconds() > MAX_INSIGHTS_HOURS * 3600:
+            raise self._error('ValidationError', f'Metrics Insights queries span at most {MAX_INSIGHTS_HOURS} hours',
+                              'GetMetricData')
+        limit = min(int(limit or MAX_INSIGHTS_SERIES), MAX_INSIGHTS_SERIES)
+        if group_by == 'DBClusterIdentifier':
+            resources = [cluster for region, cluster in self.aws.cluster_members if region == self.region]
+        else:
+            resources = [db['DBInstanceIdentifier'] for db in self.aws.fleet['db_instances'].get(self.region, [])]
+        metric_stat = {'Period': query.get('Period', 300), 'Stat': INSIGHTS_FUNCTIONS[function.upper()]}
+
+        results = []
+        for resource in resources:
+            metric_stat['Metric'] = {'MetricName': metric_name, 'Dimensions': [{'Name': group_by, 'Value': resource}]}
+            timestamps, values = self._series(metric_stat, start, end, ascending)
+            if not values:
+                continue
+            if len(results) == limit:
+                break
+            results.append({'Id': query['Id'], 'Label': resource, 'Timestamps': timestamps, 'Values': values,
+                            'StatusCode': 'Complete'})
+        return results
+
+    def get_metric_statistics(self, Namespace, MetricName, Dimensions, StartTime, EndTime, Period,
+                              Statistics=None, ExtendedStatistics=None, Unit=None):
+        with self.aws.call('cloudwatch', 'get_metric_statistics', self.region):
+            stats = list(Statistics or []) + list(ExtendedStatistics or [])
+            StartTime, EndTime = _utc(StartTime), _utc(EndTime)
+            datapoints = []
+            count = max(1, int((EndTime - StartTime).total_seconds() // Period))
+            for i in range(count):
+                timestamp = EndTime - timedelta(seconds=Period * (i + 1))
+                point = {'Timestamp': timestamp, 'Unit': Unit or 'None'}
+                for stat in stats:
+                    value = self._metric_value(MetricName, Dimensions, stat, timestamp)
+                    if value is None:
+                        return {'Label': MetricName, 'Datapoints': []}
+                    if stat in (Statistics or []):
+                        point[stat] = value
+                    else:
+                        point.setdefault('ExtendedStatistics', {})[stat] = value
+                datapoints.append(point)
+            return {'Label': MetricName, 'Datapoints': datapoints}
+
+
+class FakePricing(_FakeClient):
+    def get_products(self, ServiceCode, Filters=None, MaxResults=100, NextToken=None, FormatVersion=None):
+        with self.aws.call('pricing', 'get_products', self.region):
+            terms = {f['Field']: f['Value'] for f in (Filters or []) if f.get('Type', 'TERM_MATCH') == 'TERM_MATCH'}
+            region = terms.pop('regionCode', None)
+            engine = terms.pop('databaseEngine', None)
+            candidates = []
+            for (product_region, product_engine), products in self.aws.products.items():
+                if (region is None or product_region == region) and (engine is None or product_engine == engine):
+                    candidates.extend(products)
+            matching = [entry for attributes, entry in candidates
+                        if all(attributes.get(field, '').lower() == str(value).lower() for field, value in terms.items())]
+            start = int(NextToken) if NextToken else 0
+            response = {'PriceList': matching[start:start + MaxResults], 'FormatVersion': 'aws_v1'}
+            with self.aws._lock:
+                self.aws.response_bytes[('pricing', 'get_products')] += sum(len(entry) for entry in response['PriceList'])
+            if start + MaxResults < len(matching):
+                response['NextToken'] = str(start + MaxResults)
+            return response
+
+
+PI_WAIT_EVENTS = [('CPU', 'CPU'), ('IO:DataFileRead', 'IO'), ('Lock:transactionid', 'Lock'),
+                  ('LWLock:BufferMapping', 'LWLock'), ('Client:ClientRead', 'Client')]
+
+
+class FakePI(_FakeClient):
+    def _instance(self, identifier, operation):
+        db = self.aws.instances_by_resource_id.get((self.region, identifier))
+        if db is None or not db.get('PerformanceInsightsEnabled'):
+            raise self._error('NotAuthorizedException', f'No Performance Insights data for {identifier}', operation)
+        return db
+
+    def get_resource_metrics(self, ServiceType, Identifier, MetricQueries, StartTime, EndTime, PeriodInSeconds=60,
+                             **kwargs):
+        with self.aws.call('pi', 'get_resource_metrics', self.region):
+            self._instance(Identifier, 'GetResourceMetrics')
+            rng = _seeded(self.region, Identifier, 'db.load')
+            scale = rng.uniform(0.1, 8)
+            start, end = _utc(StartTime), _utc(EndTime)
+            count = int((end - start).total_seconds()) // PeriodInSeconds
+            points = [{'Timestamp': start + timedelta(seconds=PeriodInSeconds * i),
+                       'Value': scale * (1 + 0.5 * math.sin(i / 3 + rng.random()))}
+                      for i in range(count)]
+            return {'Identifier': Identifier, 'AlignedStartTime': start, 'AlignedEndTime': end,
+                    'MetricList': [{'Key': {'Metric': query['Metric']}, 'DataPoints': points}
+                                   for query in MetricQueries]}
+
+    def describe_dimension_keys(self, ServiceType, Identifier, StartTime, EndTime, Metric, GroupBy, **kwargs):
+        with self.aws.call('pi', 'describe_dimension_keys', self.region):
+            self._instance(Identifier, 'DescribeDimensionKeys')
+            rng = _seeded(self.region, Identifier, GroupBy['Group'])
+            limit = GroupBy.get('Limit', 10)
+            if GroupBy['Group'] == 'db.wait_event':
+                keys = [{'Dimensions': {'db.wait_event.name': name, 'db.wait_event.type': event_type},
+                         'Total': rng.uniform(0, 4)}
+                        for name, event_type in PI_WAIT_EVENTS[:limit]]
+            else:
+                tables = ['orders', 'customers', 'line_items', 'sessions', 'events']
+                keys = [{'Dimensions': {'db.sql_tokenized.statement':
+                                        f'SELECT * FROM {rng.choice(tables)} WHERE id = ? AND status = ?'},
+                         'Total': rng.uniform(0, 2)}
+                        for _ in range(limit)]
+            return {'AlignedStartTime': _utc(StartTime), 'AlignedEndTime': _utc(EndTime), 'Keys': keys}
+
+
+class FakeSTS(_FakeClient):
+    def get_caller_identity(self):
+        with self.aws.call('sts', 'get_caller_identity', self.region):
+            account_id = self.aws.fleet['account_id']
+            return {'UserId': 'AIDAFAKEUSER', 'Account': account_id,
+                    'Arn': f'arn:aws:iam::{account_id}:user/benchmark'}
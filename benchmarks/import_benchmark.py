@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for Smart RDS Viewer
+Checks that cheap CLI invocations stay within an import-time budget
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for `import rds_viewer`, in milliseconds
+IMPORT_BUDGET_MS = 50
+
+# Modules that --version, --help and argument errors must not load
+HEAVY_MODULES = ['boto3', 'botocore', 'rich', 'readchar']
+
+# Invocations that must return without loading HEAVY_MODULES: version, help, an unknown
+# flag and each option whose value is validated after parsing
+CHEAP_INVOCATIONS = [
+    ['--version'],
+    ['--help'],
+    ['--not-a-flag'],
+    ['--perf-metrics', 'bogus'],
+    ['--forecast-days', '3'],
+    ['--rightsizing', '0'],
+    ['--metrics-mode', 'bogus'],
+]
+
+
+def run_importtime(args):
+    """Run python -X importtime with args and return {module: cumulative_us}."""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    imports = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def measure_import_ms(runs):
+    """Best-of-N cumulative import time of rds_viewer in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        imports = run_importtime(['-c', 'import rds_viewer'])
+        timings.append(imports.get('rds_viewer', 0) / 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import-time budget of cheap CLI invocations")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"Import-time budget for rds_viewer in milliseconds (default: {IMPORT_BUDGET_MS})")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs, best one is reported (default: 5)")
+    args = parser.parse_args()
+
+    print("🚀 Smart RDS Viewer - Import-Time Benchmark")
+    print("-" * 40)
+    failed = False
+
+    import_ms = measure_import_ms(args.runs)
+    status = "✅" if import_ms <= args.budget_ms else "❌"
+    print(f"{status} import rds_viewer: {import_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+    failed |= import_ms > args.budget_ms
+
+    for flags in CHEAP_INVOCATIONS:
+        imports = run_importtime(['rds_viewer.py'] + flags)
+        loaded = [name for name in HEAVY_MODULES if name in imports]
+        command = ' '.join(flags)
+        if loaded:
+            print(f"❌ rds_viewer {command} loaded: {', '.join(loaded)}")
+            failed = True
+        else:
+            print(f"✅ rds_viewer {command} loads none of: {', '.join(HEAVY_MODULES)}")
+
+    if failed:
+        print("\n🔴 Import-time budget exceeded")
+        sys.exit(1)
+    print("\n🟢 Import-time budget met")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+GetMetricData batching benchmark for Smart RDS Viewer
+Compares request packing and concurrency settings on a synthetic fleet served by the local AWS stand-in
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_fleet import generate_fleet
+from fake_aws import FakeAWS
+
+# (label, batch_size, max_workers)
+CONFIGURATIONS = [
+    ('100 per request, sequential', 100, 1),
+    ('500 per request, sequential', 500, 1),
+    ('500 per request, concurrent', 500, None),
+]
+
+
+def build_queries(instances):
+    from metrics import build_metric_query
+    return [build_metric_query(f'metric_{idx}', 'FreeStorageSpace', 'DBInstanceIdentifier',
+                               inst['DBInstanceIdentifier'], unit='Bytes')
+            for idx, inst in enumerate(instances) if not inst.get('IsAurora')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GetMetricData batching on a synthetic fleet")
+    parser.add_argument("--size", type=int, default=10000, help="Fleet size (default: 10000)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Latency per API call (default: 50)")
+    parser.add_argument("--history-days", type=int, default=1,
+                        help="Window of the paginated run, at 5-minute resolution (default: 1)")
+    args = parser.parse_args()
+
+    import clients
+    import metrics
+    from fetch import fetch_rds_instances
+
+    region = 'us-east-1'
+    fleet = generate_fleet(args.size, [region])
+    aws = FakeAWS(fleet, latency=args.latency_ms / 1000)
+    clients.set_client_factory(aws.client)
+    with contextlib.redirect_stdout(io.StringIO()):
+        instances = fetch_rds_instances([region])
+    cloudwatch = clients.get_client('cloudwatch', region)
+    queries = build_queries(instances)
+
+    print("🚀 Smart RDS Viewer - GetMetricData Batching Benchmark")
+    print(f"   {len(queries)} FreeStorageSpace queries | latency: {args.latency_ms:.0f}ms")
+    print("-" * 40)
+
+    end_time = datetime.utcnow()
+    windows = [
+        ('latest hour, 1h period', end_time - timedelta(hours=1), 3600),
+        (f'{args.history_days} days, 5m period', end_time - timedelta(days=args.history_days), 300),
+    ]
+    for window_label, start_time, period in windows:
+        for query in queries:
+            query['MetricStat']['Period'] = period
+        print(f"\n📈 {window_label}")
+        reference = None
+        for label, batch_size, max_workers in CONFIGURATIONS:
+            aws.reset_counters()
+            start = time.perf_counter()
+            series = metrics.run_metric_queries(cloudwatch, queries, start_time, end_time, batch_size=batch_size,
+                                                max_workers=max_workers or metrics.MAX_BATCH_WORKERS)
+            duration = time.perf_counter() - start
+            datapoints = sum(len(values) for _, values in series.values())
+            requests = aws.calls[('cloudwatch', 'get_metric_data')]
+            print(f"⏱️  {label}: {duration:.3f}s, {requests} requests, {datapoints} datapoints")
+            if reference is None:
+                reference = series
+            elif series != reference:
+                print("❌ Results differ from the first configuration")
+                sys.exit(1)
+
+    clients.set_client_factory(None)
+    print("\n🟢 All configurations returned identical results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for Smart RDS Viewer
+Times the CPU-heavy functions on fixed synthetic fixtures and flags regressions against earlier runs
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_FILE = os.path.join(REPO_ROOT, 'benchmarks', 'results', 'offline_history.jsonl')
+
+DEFAULT_SIZE = 2000
+DEFAULT_REPEAT = 5
+
+# Runs compared against: the median of the last N runs on the same fixture size that were
+# not flagged (or were accepted with --update-baseline), so regressions never become the baseline
+BASELINE_RUNS = 5
+
+# Allowed slowdown per subsystem before a benchmark is flagged
+THRESHOLDS = {'pricing': 0.25, 'reserved_instances': 0.25, 'ui': 0.30, 'maintenance': 0.25, 'forecast': 0.25}
+
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_MS = 1.0
+
+# Hard ceilings in milliseconds, whatever the baseline: the table is re-rendered on every
+# key press, stage completion and Performance Insights update, so it must stay interactive
+BUDGETS_MS = {'ui.render_table': 100}
+
+# Terminal height the table is rendered for, so the visible page is the same on every machine
+RENDER_LINES = 60
+
+
+def build_fixtures(size, seed):
+    """Instances, RIs and pricing datasets as the fetchers return them, served by the local AWS stand-in."""
+    import clients
+    from synthetic_fleet import generate_fleet
+    from fake_aws import FakeAWS
+    from fetch import fetch_rds_instances, get_instance_key
+    from pricing import classify_pricing_records, iter_rds_pricing_data, map_engine_name_for_pricing, price_instances
+    from reserved_instances import fetch_reserved_instances, match_reserved_instances
+    from backup_maintenance import fetch_backup_maintenance_data
+    from forecast import FORECAST_DAYS
+    from metrics import fetch_storage_history
+
+    fleet = generate_fleet(size, seed=seed)
+    clients.set_client_factory(FakeAWS(fleet).client)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            instances = fetch_rds_instances(fleet['regions'])
+            reserved = fetch_reserved_instances(fleet['regions'])
+            backup_data, maintenance_data = fetch_backup_maintenance_data(instances)
+
+            # Same datasets fetch_pricing_for_region_engine() collects per region/engine
+            pricing_groups = []
+            groups = {}
+            for inst in instances:
+                groups.setdefault((inst['Region'], inst['Engine']), []).append(inst)
+            for (region, engine), group in sorted(groups.items()):
+                instance_types = set(inst['DBInstanceClass'] for inst in group)
+                datasets = classify_pricing_records(
+                    iter_rds_pricing_data(region, map_engine_name_for_pricing(engine)), instance_types)
+                pricing_groups.append((group, region, engine) + datasets)
+
+            prices = {}
+            for group in pricing_groups:
+                prices.update(price_instances(*group))
+            ri_matches = match_reserved_instances(instances, reserved)
+
+            # FreeStorageSpace history the storage forecast is fitted to
+            histories = {}
+            end_time = datetime.utcnow()
+            for region in fleet['regions']:
+                region_instances = [inst for inst in instances if inst['Region'] == region and not inst.get('IsAurora')]
+                histories.update(fetch_storage_history(clients.get_client('cloudwatch', region), region_instances,
+                                                       end_time, FORECAST_DAYS))
+    finally:
+        clients.set_client_factory(None)
+
+    # A fixed 40% free for non-Aurora instances; the value does not affect timings
+    metrics = {get_instance_key(inst): None if inst.get('IsAurora') else inst['AllocatedStorage'] * 1024 ** 3 * 0.4
+               for inst in instances}
+    return {
+        'instances': instances,
+        'reserved': reserved,
+        'pricing_groups': pricing_groups,
+        'prices': prices,
+        'ri_matches': ri_matches,
+        'metrics': metrics,
+        'backup_data': backup_data,
+        'maintenance_data': maintenance_data,
+        'histories': histories,
+    }
+
+
+def get_benchmarks(fx):
+    """(name, subsystem, function) for every benchmark, bound to the fixtures."""
+    from pricing import parse_pricing_components_v2, price_instances
+    from reserved_instances import match_reserved_instances, calculate_effective_pricing
+    from backup_maintenance import calculate_next_maintenance_time
+    from forecast import forecast_days_until_full
+    import ui
+    from rich.console import Console
+
+    def parse_components():
+        for group_instances, _, _, instance_data, storage_data, iops_data, throughput_data in fx['pricing_groups']:
+            for inst in group_instances:
+                parse_pricing_components_v2(instance_data, storage_data, iops_data, throughput_data,
+                                            inst['DBInstanceClass'], inst.get('StorageType', 'gp3'),
+                                            inst.get('AllocatedStorage', 0), inst.get('Iops', 0),
+                                            inst.get('StorageThroughput', 0), inst.get('MultiAZ', False))
+
+    def price_all():
+        for group in fx['pricing_groups']:
+            price_instances(*group)
+
+    windows = [inst.get('PreferredMaintenanceWindow') for inst in fx['instances']]
+
+    def next_maintenance():
+        for window in windows:
+            calculate_next_maintenance_time(window)
+
+    # ui.get_terminal_height() reads LINES first, as shutil.get_terminal_size() does
+    os.environ['LINES'] = str(RENDER_LINES)
+    view = ui.display_rds_table(fx['instances'], fx['metrics'], fx['prices'], fx['ri_matches'],
+                                fx['backup_data'], fx['maintenance_data'], headless=True)
+    rows = view['get_rows']()
+    view['sort_state'].update(key='total_price', ascending=False)
+    console = Console(file=io.StringIO(), width=200, force_terminal=True)
+
+    def render():
+        console.file = io.StringIO()
+        console.print(view['render_table']())
+
+    return [
+        ('parse_pricing_components_v2', 'pricing', parse_components),
+        ('price_instances', 'pricing', price_all),
+        ('match_reserved_instances', 'reserved_instances',
+         lambda: match_reserved_instances(fx['instances'], fx['reserved'])),
+        ('calculate_effective_pricing', 'reserved_instances',
+         lambda: calculate_effective_pricing(fx['prices'], fx['ri_matches'])),
+        ('ui.get_rows', 'ui', view['get_rows']),
+        ('ui.sort_rows', 'ui', lambda: view['sort_rows'](rows)),
+        ('ui.render_table', 'ui', render),
+        ('calculate_next_maintenance_time', 'maintenance', next_maintenance),
+        ('forecast_days_until_full', 'forecast', lambda: forecast_days_until_full(fx['histories'])),
+    ]
+
+
+def run_benchmark(func, repeat):
+    """Best-of-N wall time in seconds; the minimum is the least noisy estimate for CPU-bound code."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path, entry):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+
+
+def get_baseline(history, size):
+    """
+    Median time per benchmark over the last BASELINE_RUNS runs on the same fixture size and
+    machine, leaving out runs with regressions that were not accepted with --update-baseline.
+    """
+    runs = [run for run in history if run.get('size') == size and run.get('machine') == platform.node()
+            and (not run.get('regressions') or run.get('accepted'))]
+    baseline = {}
+    for run in runs[-BASELINE_RUNS:]:
+        for name, seconds in run['results'].items():
+            baseline.setdefault(name, []).append(seconds)
+    return {name: statistics.median(values) for name, values in baseline.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time CPU-heavy functions on fixed fixtures and flag regressions")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help=f"Fixture fleet size (default: {DEFAULT_SIZE})")
+    parser.add_argument("--seed", type=int, default=42, help="Fixture seed (default: 42)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Runs per benchmark, best one is kept (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Allowed slowdown for every subsystem, e.g. 0.2 for 20%% (default: per subsystem)")
+    parser.add_argument("--history", default=HISTORY_FILE, help="History file (default: benchmarks/results/offline_history.jsonl)")
+    parser.add_argument("--no-save", action="store_true", help="Do not add this run to the history")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Accept this run into the baseline even if it is slower (an intended slowdown)")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this text")
+    args = parser.parse_args()
+    if args.update_baseline and (args.no_save or args.filter):
+        parser.error("--update-baseline records the full run; it cannot be combined with --no-save or --filter")
+
+    print("🚀 Smart RDS Viewer - Offline Benchmark Suite")
+    print(f"   Fixture: {args.size} instances (seed {args.seed}) | best of {args.repeat}")
+    print("-" * 40)
+
+    fixtures = build_fixtures(args.size, args.seed)
+    history = load_history(args.history)
+    baseline = get_baseline(history, args.size)
+    if not baseline:
+        print("ℹ️  No baseline for this fixture size on this machine yet; this run becomes the baseline")
+
+    results = {}
+    regressions = []
+    for name, subsystem, func in get_benchmarks(fixtures):
+        if args.filter and args.filter not in name:
+            continue
+        seconds = run_benchmark(func, args.repeat)
+        results[name] = seconds
+        budget = BUDGETS_MS.get(name)
+        if budget is not None and seconds * 1000 > budget:
+            print(f"❌ {name}: {seconds * 1000:.2f}ms exceeds its {budget:.0f}ms budget")
+            regressions.append(name)
+            continue
+        threshold = args.threshold if args.threshold is not None else THRESHOLDS[subsystem]
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"⏱️  {name}: {seconds * 1000:.2f}ms")
+            continue
+        change = seconds / previous - 1 if previous else 0
+        regressed = change > threshold and (seconds - previous) * 1000 > MIN_REGRESSION_MS
+        status = "❌" if regressed else ("✅" if change < -threshold else "⏱️ ")
+        print(f"{status} {name}: {seconds * 1000:.2f}ms ({change:+.0%} vs {previous * 1000:.2f}ms, "
+              f"threshold {threshold:.0%})")
+        if regressed:
+            regressions.append(name)
+
+    if not args.no_save and not args.filter:
+        # Flagged runs are kept for the record but left out of the baseline unless accepted
+        append_history(args.history, {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'machine': platform.node(),
+            'python': platform.python_version(),
+            'size': args.size,
+            'results': results,
+            'regressions': regressions,
+            'accepted': args.update_baseline,
+        })
+
+    if regressions and args.update_baseline:
+        print(f"\n🟡 Accepted into the baseline: {', '.join(regressions)}")
+        return
+    if regressions:
+        print(f"\n🔴 Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\n🟢 No regressions")
+
+
+if __name__ == "__main__":
+    main()
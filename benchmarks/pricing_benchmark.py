@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Pricing parse benchmark for Smart RDS Viewer
+Compares the Pricing API pages and bytes of the single-pass catalog fetch, with and
+without sharing catalogs between engines, with the previous four queries per
+region/engine, then prices a synthetic fleet with the
+per-instance linear scan (parse_pricing_components_v2) and with a PriceIndex per group,
+and checks that all of them give identical results
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_fleet import generate_fleet
+from fake_aws import FakeAWS
+
+
+def group_instances(fleet):
+    """Instances per (region, engine), as fetch_rds_pricing() groups them."""
+    from fetch import fetch_rds_instances
+
+    groups = {}
+    for inst in fetch_rds_instances(fleet['regions']):
+        groups.setdefault((inst['Region'], inst['Engine']), []).append(inst)
+    return sorted(groups.items())
+
+
+def fetch_four_queries(region, engine, group):
+    """Datasets as the previous fetcher collected them: four get_products queries, two of them over the whole catalog."""
+    from pricing import get_rds_pricing_data, map_engine_name_for_pricing
+
+    pricing_engine = map_engine_name_for_pricing(engine)
+    instance_types = set(inst['DBInstanceClass'] for inst in group)
+    instance_data = [item for item in get_rds_pricing_data(region, pricing_engine)
+                     if item.get('InstanceType', '') in instance_types or not item.get('InstanceType')]
+    storage_data = get_rds_pricing_data(region, pricing_engine, [
+        {"Type": "TERM_MATCH", "Field": "productFamily", "Value": "Database Storage"}])
+    iops_data = get_rds_pricing_data(region, pricing_engine, [
+        {"Type": "TERM_MATCH", "Field": "productFamily", "Value": "Provisioned IOPS"}])
+    throughput_data = [item for item in get_rds_pricing_data(region, pricing_engine)
+                       if 'throughput' in item.get('UsageType', '').lower()]
+    return instance_data, storage_data, iops_data, throughput_data
+
+
+def fetch_single_pass(region, engine, group):
+    """Datasets as fetch_pricing_for_region_engine() collects them: one pass over the catalog."""
+    from pricing import classify_pricing_records, iter_rds_pricing_data, map_engine_name_for_pricing
+
+    instance_types = set(inst['DBInstanceClass'] for inst in group)
+    return classify_pricing_records(iter_rds_pricing_data(region, map_engine_name_for_pricing(engine)),
+                                    instance_types)
+
+
+def fetch_shared_pass():
+    """fetch_single_pass() for engines sharing a Pricing API engine, as fetch_rds_pricing() coalesces them."""
+    from concurrency import SingleFlight
+    from pricing import classify_pricing_records, fetch_pricing_catalog, map_engine_name_for_pricing
+
+    catalogs = SingleFlight(remember=True)
+
+    def fetch_datasets(region, engine, group):
+        instance_types = set(inst['DBInstanceClass'] for inst in group)
+        return classify_pricing_records(fetch_pricing_catalog(region, map_engine_name_for_pricing(engine),
+                                                              catalogs=catalogs), instance_types)
+    return fetch_datasets
+
+
+def build_pricing_groups(aws, fleet, fetch_datasets):
+    """(instances, region, engine, instance, storage, IOPS and throughput datasets) per region/engine."""
+    import clients
+
+    clients.set_client_factory(aws.client)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            groups = group_instances(fleet)
+            aws.reset_counters()
+            return [(group, region, engine) + tuple(fetch_datasets(region, engine, group))
+                    for (region, engine), group in groups]
+    finally:
+        clients.set_client_factory(None)
+
+
+def price_linear(pricing_groups):
+    from fetch import get_instance_key
+    from pricing import get_pricing_edition, parse_pricing_components_v2
+
+    prices = {}
+    for group, region, engine, instance_data, storage_data, iops_data, throughput_data in pricing_groups:
+        for inst in group:
+            prices[(get_instance_key(inst), region, engine)] = parse_pricing_components_v2(
+                instance_data, storage_data, iops_data, throughput_data,
+                inst['DBInstanceClass'], inst.get('StorageType', 'gp3'), inst.get('AllocatedStorage', 0),
+                inst.get('Iops', 0), inst.get('StorageThroughput', 0), inst.get('MultiAZ', False),
+                *get_pricing_edition(inst))
+    return prices
+
+
+def price_indexed(pricing_groups):
+    from pricing import price_instances
+
+    prices = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for group in pricing_groups:
+            prices.update(price_instances(*group))
+    return prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pricing lookups on a synthetic fleet")
+    parser.add_argument("--size", type=int, default=10000, help="Fleet size (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    fleet = generate_fleet(args.size)
+    aws = FakeAWS(fleet)
+
+    print("🚀 Smart RDS Viewer - Pricing Parse Benchmark")
+    print(f"   {args.size} instances")
+    print("-" * 40)
+
+    print("📥 Catalog fetch (get_products)")
+    fetched = {}
+    for label, fetch_datasets in (('four queries per group', fetch_four_queries),
+                                  ('single pass per group', fetch_single_pass),
+                                  ('single pass, shared catalogs', fetch_shared_pass())):
+        fetched[label] = build_pricing_groups(aws, fleet, fetch_datasets)
+        pages = aws.calls[('pricing', 'get_products')]
+        megabytes = aws.response_bytes[('pricing', 'get_products')] / 1e6
+        print(f"   {label}: {pages} pages, {megabytes:.1f} MB")
+    pricing_groups = fetched['single pass per group']
+    records = sum(len(group[3]) + len(group[4]) + len(group[5]) + len(group[6]) for group in pricing_groups)
+    if not (price_indexed(fetched['four queries per group']) == price_indexed(pricing_groups)
+            == price_indexed(fetched['single pass, shared catalogs'])):
+        print("❌ Prices differ between fetch methods")
+        sys.exit(1)
+
+    print(f"\n🔎 Lookups ({len(pricing_groups)} region/engine groups, {records} pricing records)")
+    results = {}
+    timings = {}
+    for label, func in (('linear scan per instance', price_linear), ('PriceIndex per group', price_indexed)):
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[label] = func(pricing_groups)
+            duration = time.perf_counter() - start
+            best = duration if best is None else min(best, duration)
+        timings[label] = best
+        print(f"   ⏱️  {label}: {best * 1000:.1f}ms")
+
+    linear, indexed = timings.values()
+    print(f"📊 Speedup: {linear / indexed:.1f}x")
+    if results['linear scan per instance'] != results['PriceIndex per group']:
+        print("❌ Results differ between methods")
+        sys.exit(1)
+    print("✅ Identical prices for every instance")
+
+
+if __name__ == "__main__":
+    main()
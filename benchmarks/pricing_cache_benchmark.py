@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Pricing cache benchmark for Smart RDS Viewer
+Fills the pricing cache with the rates of a multi-region, multi-engine synthetic fleet and
+times loading them back from the SQLite store, against the previous JSON file that was
+parsed whole on every run
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_fleet import REGION_PREFIXES, generate_instances
+
+
+def build_catalog(size, regions):
+    """{(region, pricing engine): {rate key: rate}} for every rate a fleet of the given size is priced from."""
+    from pricing import COMMON_RATE_KEYS, get_rate_keys, map_engine_name_for_pricing
+
+    rng = random.Random(7)
+    slices = {}
+    for region, dbs in generate_instances(size, regions, '123456789012', rng).items():
+        for inst in dbs:
+            rates = slices.setdefault((region, map_engine_name_for_pricing(inst['Engine'])), {})
+            for rate_key in list(get_rate_keys(inst).values()) + COMMON_RATE_KEYS:
+                rates.setdefault(rate_key, round(rng.uniform(0.01, 10), 4))
+    return slices
+
+
+def write_json_cache(path, slices):
+    """The previous cache file: pretty-printed JSON, rewritten whole."""
+    cache_data = {
+        "version": 3,
+        "slices": [{"region": region, "engine": engine, "timestamp": "2026-01-01T00:00:00",
+                    "rates": [[list(key), rate] for key, rate in rates.items()]}
+                   for (region, engine), rates in slices.items()],
+    }
+    with open(path, "w") as f:
+        json.dump(cache_data, f, indent=2)
+
+
+def load_json_cache(path):
+    """Loading the previous cache file: parse everything, rebuild every key."""
+    with open(path, "r") as f:
+        cache_data = json.load(f)
+    return {(entry["region"], entry["engine"]): {tuple(key): rate for key, rate in entry["rates"]}
+            for entry in cache_data["slices"]}
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pricing cache loads")
+    parser.add_argument("--size", type=int, default=50000, help="Instances whose rates fill the cache (default: 50000)")
+    parser.add_argument("--lookup", type=int, default=2000, help="Instances priced from the cache per run (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method, best is reported (default: 5)")
+    args = parser.parse_args()
+
+    from pricing import get_rate_keys, map_engine_name_for_pricing
+    from pricing_cache import PricingCache
+
+    regions = sorted(REGION_PREFIXES)
+    slices = build_catalog(args.size, regions)
+    total = sum(len(rates) for rates in slices.values())
+
+    # The rates a run for a smaller fleet in three of the regions looks up
+    wanted = {}
+    for region, dbs in generate_instances(args.lookup, regions[:3], '123456789012', random.Random(11)).items():
+        for inst in dbs:
+            wanted.setdefault((region, map_engine_name_for_pricing(inst['Engine'])), set()).update(
+                get_rate_keys(inst).values())
+    wanted_total = sum(len(keys) for keys in wanted.values())
+
+    print("🚀 Smart RDS Viewer - Pricing Cache Benchmark")
+    print(f"   {total} rates | {len(slices)} region/engine slices | {len(regions)} regions")
+    print(f"   Lookup: {wanted_total} rates of a {args.lookup}-instance fleet in {len(wanted)} slices")
+    print("-" * 40)
+
+    cache_dir = tempfile.mkdtemp(prefix='rds-pricing-cache-benchmark-')
+    try:
+        json_path = os.path.join(cache_dir, 'pricing_cache.json')
+        sqlite_path = os.path.join(cache_dir, 'pricing.sqlite3')
+
+        write_seconds = best_of(lambda: write_json_cache(json_path, slices), 1)
+        print(f"💾 JSON: {os.path.getsize(json_path) / 1e6:.1f} MB, written in {write_seconds * 1000:.0f}ms")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cache = PricingCache(sqlite_path)
+            for (region, engine), rates in slices.items():
+                cache.put_rates(region, engine, rates)
+            cache.close()
+        write_seconds = time.perf_counter() - start
+        print(f"💾 SQLite: {os.path.getsize(sqlite_path) / 1e6:.1f} MB, written in {write_seconds * 1000:.0f}ms")
+
+        def load_json():
+            loaded = load_json_cache(json_path)
+            return {slice_key: {key: loaded[slice_key][key] for key in keys if key in loaded.get(slice_key, {})}
+                    for slice_key, keys in wanted.items()}
+
+        def load_sqlite():
+            cache = PricingCache(sqlite_path)
+            try:
+                return {slice_key: cache.get_rates(*slice_key, keys) for slice_key, keys in wanted.items()}
+            finally:
+                cache.close()
+
+        if load_json() != load_sqlite():
+            print("❌ Rates differ between stores")
+            sys.exit(1)
+        json_seconds = best_of(load_json, args.repeat)
+        sqlite_seconds = best_of(load_sqlite, args.repeat)
+        print(f"\n⏱️  JSON (parse whole file): {json_seconds * 1000:.1f}ms")
+        print(f"⏱️  SQLite (open + key lookups): {sqlite_seconds * 1000:.1f}ms")
+        print(f"📊 Speedup: {json_seconds / sqlite_seconds:.1f}x")
+        print("✅ Identical rates from both stores")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Offline scale benchmark for Smart RDS Viewer
+Runs every fetcher and the table against a synthetic fleet served by a local AWS stand-in
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_fleet import generate_fleet, DEFAULT_REGIONS
+from fake_aws import FakeAWS
+from options import METRICS_MODES
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+
+
+def timed(results, name, func, *args, **kwargs):
+    """Run func quietly and record its duration under name."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    results[name] = time.perf_counter() - start
+    return result
+
+
+def render_once(instances, metrics, pricing, ri_matches, backup_data, maintenance_data):
+    """Open the table off-screen and quit on the first key press."""
+    import readchar
+    import ui
+    from rich.console import Console
+
+    original = (ui.console, ui.clear_terminal, readchar.readkey)
+    ui.console = Console(file=io.StringIO(), width=200, force_terminal=True)
+    ui.clear_terminal = lambda: None
+    readchar.readkey = lambda: 'q'
+    try:
+        ui.display_rds_table(instances, metrics, pricing, ri_matches, backup_data, maintenance_data)
+    finally:
+        ui.console, ui.clear_terminal, readchar.readkey = original
+
+
+def fetch_histories(instances, regions):
+    """FreeStorageSpace history of every non-Aurora instance, as the storage forecast gets it."""
+    import clients
+    from datetime import datetime
+    from forecast import FORECAST_DAYS
+    from metrics import fetch_storage_history
+
+    histories = {}
+    end_time = datetime.utcnow()
+    for region in regions:
+        region_instances = [inst for inst in instances if inst['Region'] == region and not inst.get('IsAurora')]
+        histories.update(fetch_storage_history(clients.get_client('cloudwatch', region), region_instances,
+                                               end_time, FORECAST_DAYS))
+    return histories
+
+
+def run_size(size, regions, args):
+    """Run the full pipeline once for a fleet of the given size. Returns ({step: seconds}, FakeAWS)."""
+    import clients
+    import pricing_cache
+    import metric_cache
+    from fetch import fetch_rds_instances
+    from metrics import fetch_storage_metrics
+    from pricing import fetch_rds_pricing
+    from reserved_instances import fetch_reserved_instances, match_reserved_instances, calculate_effective_pricing
+    from backup_maintenance import fetch_backup_maintenance_data
+    from forecast import forecast_days_until_full
+
+    fleet = generate_fleet(size, regions, seed=args.seed)
+    aws = FakeAWS(fleet, latency=args.latency_ms / 1000, throttle_rate=args.throttle_rate)
+    clients.set_client_factory(aws.client)
+
+    # Never touch the real pricing and metric caches
+    cache_dir = tempfile.mkdtemp(prefix='rds-scale-benchmark-')
+    pricing_cache.PRICING_CACHE_FILE = os.path.join(cache_dir, 'pricing.sqlite3')
+    metric_cache.METRIC_CACHE_FILE = os.path.join(cache_dir, 'metric_cache.bin')
+
+    results = {}
+    instances = timed(results, 'fetch_rds_instances', fetch_rds_instances, regions)
+    reserved = timed(results, 'fetch_reserved_instances', fetch_reserved_instances, regions)
+    metrics = timed(results, 'fetch_storage_metrics', fetch_storage_metrics, instances, args.metrics_mode)
+    histories = timed(results, 'fetch_storage_history', fetch_histories, instances, regions)
+    # Time the fit, not the one-off numpy import
+    import numpy  # noqa: F401
+    timed(results, 'forecast_days_until_full', forecast_days_until_full, histories)
+    prices = timed(results, 'fetch_rds_pricing', fetch_rds_pricing, instances, True)
+    backup_data, maintenance_data = timed(results, 'fetch_backup_maintenance_data',
+                                          fetch_backup_maintenance_data, instances)
+    ri_matches = timed(results, 'match_reserved_instances', match_reserved_instances, instances, reserved)
+    effective = timed(results, 'calculate_effective_pricing', calculate_effective_pricing, prices, ri_matches)
+    if not args.skip_ui:
+        timed(results, 'display_rds_table', render_once,
+              instances, metrics, effective, ri_matches, backup_data, maintenance_data)
+
+    concurrency = clients.format_concurrency_stats()
+    clients.set_client_factory(None)
+    if len(instances) != size:
+        print(f"⚠️  Expected {size} instances, fetched {len(instances)}")
+    return results, aws, concurrency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every fetcher and the table against a synthetic fleet")
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(',')], default=DEFAULT_SIZES,
+                        help="Comma-separated fleet sizes (default: 100,1000,10000,50000)")
+    parser.add_argument("--regions", type=lambda s: s.split(','), default=DEFAULT_REGIONS,
+                        help=f"Comma-separated regions (default: {','.join(DEFAULT_REGIONS)})")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Latency added to every API call (default: 20)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Fraction of API calls that are throttled (default: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="Fleet generator seed (default: 42)")
+    parser.add_argument("--metrics-mode", choices=METRICS_MODES, default=METRICS_MODES[0],
+                        help="CloudWatch fetch mode (default: batch)")
+    parser.add_argument("--skip-ui", action="store_true", help="Do not render the table")
+    args = parser.parse_args()
+
+    print("🚀 Smart RDS Viewer - Scale Benchmark (offline)")
+    print(f"   Regions: {', '.join(args.regions)} | latency: {args.latency_ms:.0f}ms | "
+          f"throttle rate: {args.throttle_rate:.0%}")
+    print("-" * 40)
+
+    all_results = {}
+    for size in args.sizes:
+        print(f"\n📦 {size} instances")
+        results, aws, concurrency = run_size(size, args.regions, args)
+        all_results[size] = results
+        for name, duration in results.items():
+            print(f"⏱️  {name}: {duration:.3f}s")
+        print(f"   Total: {sum(results.values()):.3f}s")
+        print(f"   API calls: {aws.format_calls()}")
+        print(f"   Concurrency: {concurrency}")
+
+    steps = list(next(iter(all_results.values())))
+    print("\n📊 RESULTS (seconds)")
+    print(f"{'step':<32}" + "".join(f"{size:>10}" for size in all_results))
+    for step in steps + ['total']:
+        row = [sum(r.values()) if step == 'total' else r.get(step, 0) for r in all_results.values()]
+        print(f"{step:<32}" + "".join(f"{value:>10.3f}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Synthetic fleet generator for Smart RDS Viewer
+Builds realistic RDS fleets, Reserved Instances, pending maintenance and pricing catalogs
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_REGIONS = ['us-east-1', 'eu-west-1', 'ap-south-1']
+DEFAULT_ACCOUNT_ID = '123456789012'
+
+# (engine, weight) - roughly what a mixed production fleet looks like
+ENGINES = [
+    ('mysql', 28), ('postgres', 28), ('aurora-mysql', 12), ('aurora-postgresql', 12),
+    ('mariadb', 6), ('oracle-se2', 4), ('oracle-ee', 2), ('sqlserver-se', 4), ('sqlserver-ee', 2), ('sqlserver-web', 2),
+]
+
+# Pricing API databaseEngine (and databaseEdition where the engine has several)
+PRICING_ENGINES = {
+    'mysql': ('MySQL', None), 'postgres': ('PostgreSQL', None), 'mariadb': ('MariaDB', None),
+    'aurora-mysql': ('Aurora MySQL', None), 'aurora-postgresql': ('Aurora PostgreSQL', None),
+    'oracle-se2': ('Oracle', 'Standard Two'), 'oracle-ee': ('Oracle', 'Enterprise'),
+    'sqlserver-se': ('SQL Server', 'Standard'), 'sqlserver-ee': ('SQL Server', 'Enterprise'),
+    'sqlserver-web': ('SQL Server', 'Web'),
+}
+
+FAMILIES = ['t3', 't4g', 'm5', 'm6g', 'm6i', 'r5', 'r6g', 'r6i', 'r7g']
+SIZES = [('micro', 0.5), ('small', 1), ('medium', 2), ('large', 4), ('xlarge', 8), ('2xlarge', 16), ('4xlarge', 32), ('8xlarge', 64)]
+BURSTABLE_SIZES = {'micro', 'small', 'medium', 'large', 'xlarge', '2xlarge'}
+
+# Pricing API usage type prefixes
+REGION_PREFIXES = {'us-east-1': 'USE1', 'us-east-2': 'USE2', 'us-west-2': 'USW2', 'eu-west-1': 'EU',
+                   'eu-central-1': 'EUC1', 'ap-south-1': 'APS3', 'ap-southeast-1': 'APS1', 'ap-northeast-1': 'APN1'}
+
+# Pricing API volumeType per RDS StorageType, with $/GB-month
+STORAGE_TYPES = {'gp2': ('General Purpose', 0.115), 'gp3': ('General Purpose-GP3', 0.115),
+                 'io1': ('Provisioned IOPS', 0.125), 'io2': ('Provisioned IOPS-IO2', 0.125),
+                 'standard': ('Magnetic', 0.10)}
+
+DAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+def all_instance_classes():
+    """Every instance class the generator can emit."""
+    classes = []
+    for family in FAMILIES:
+        for size, _ in SIZES:
+            if family.startswith('t') and size not in BURSTABLE_SIZES:
+                continue
+            classes.append(f'db.{family}.{size}')
+    return classes
+
+
+def _weighted_choice(rng, choices):
+    total = sum(weight for _, weight in choices)
+    pick = rng.uniform(0, total)
+    for value, weight in choices:
+        pick -= weight
+        if pick <= 0:
+            return value
+    return choices[-1][0]
+
+
+def _window(rng, hours=1, with_day=False):
+    """Random HH:MM-HH:MM window, optionally prefixed by days (ddd:HH:MM-ddd:HH:MM)."""
+    start = rng.randrange(0, 24 * 2) * 30
+    end = (start + hours * 60) % (24 * 60)
+    if with_day:
+        day = rng.choice(DAYS)
+        end_day = day if end > start else DAYS[(DAYS.index(day) + 1) % 7]
+        return f"{day}:{start // 60:02d}:{start % 60:02d}-{end_day}:{end // 60:02d}:{end % 60:02d}"
+    return f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+
+
+def _storage(rng, is_aurora):
+    """Random (StorageType, AllocatedStorage, Iops, StorageThroughput)."""
+    if is_aurora:
+        return 'aurora', 1, None, None
+    storage_type = _weighted_choice(rng, [('gp2', 30), ('gp3', 50), ('io1', 15), ('io2', 5)])
+    allocated = rng.choice([20, 50, 100, 200, 500, 1000, 2000, 4000])
+    if storage_type == 'gp2':
+        return storage_type, allocated, min(max(100, allocated * 3), 16000), None
+    if storage_type == 'gp3':
+        if allocated < 400:
+            return storage_type, allocated, 3000, 125
+        return storage_type, allocated, rng.choice([12000, 12000, 16000, 20000]), rng.choice([500, 500, 750, 1000])
+    return storage_type, allocated, rng.choice([1000, 3000, 5000, 10000, 20000]), None
+
+
+def generate_instances(size, regions, account_id, rng):
+    """DBInstances as describe_db_instances returns them, keyed by region."""
+    classes = all_instance_classes()
+    instances = {region: [] for region in regions}
+    aurora_cluster = {}  # (region, engine) -> [cluster_id, members left]
+
+    for i in range(size):
+        region = regions[i % len(regions)]
+        engine = _weighted_choice(rng, ENGINES)
+        is_aurora = engine.startswith('aurora')
+        instance_class = rng.choice(classes)
+        if engine.startswith(('oracle', 'sqlserver')) and instance_class.startswith('db.t4g'):
+            instance_class = instance_class.replace('t4g', 't3')
+        identifier = f"{engine.split('-')[0]}-{i:06d}"
+        storage_type, allocated, iops, throughput = _storage(rng, is_aurora)
+
+        db = {
+            'DBInstanceIdentifier': identifier,
+            'DBInstanceArn': f'arn:aws:rds:{region}:{account_id}:db:{identifier}',
+            'DBInstanceClass': instance_class,
+            'DbiResourceId': f'db-{i:026X}',
+            'PerformanceInsightsEnabled': i % 3 != 0,
+            'Engine': engine,
+            'LicenseModel': ('license-included' if engine.startswith(('oracle', 'sqlserver'))
+                             else 'postgresql-license' if 'postgres' in engine else 'general-public-license'),
+            'DBInstanceStatus': 'available',
+            'AllocatedStorage': allocated,
+            'StorageType': storage_type,
+            'Endpoint': {'Address': f'{identifier}.abc123.{region}.rds.amazonaws.com', 'Port': 5432},
+            'MultiAZ': not is_aurora and rng.random() < 0.3,
+            'PreferredBackupWindow': _window(rng),
+            'BackupRetentionPeriod': rng.choice([0, 1, 7, 7, 14, 35]),
+            'BackupTarget': 'region',
+            'PreferredMaintenanceWindow': _window(rng, with_day=True),
+            'AutoMinorVersionUpgrade': rng.random() < 0.8,
+        }
+        if iops:
+            db['Iops'] = iops
+        if throughput:
+            db['StorageThroughput'] = throughput
+        if is_aurora:
+            # Group Aurora instances into clusters of 1-3 members
+            cluster = aurora_cluster.get((region, engine))
+            if not cluster or cluster[1] == 0:
+                cluster = [f'{engine}-cluster-{i:06d}', rng.randint(1, 3)]
+                aurora_cluster[(region, engine)] = cluster
+            cluster[1] -= 1
+            db['DBClusterIdentifier'] = cluster[0]
+        instances[region].append(db)
+    return instances
+
+
+def generate_reserved_instances(instances, rng, now):
+    """Active ReservedDBInstances covering part of the fleet, keyed by region."""
+    reserved = {}
+    for region, dbs in instances.items():
+        reserved[region] = []
+        for i, db in enumerate(dbs[::20]):
+            start = now - timedelta(days=rng.randint(1, 700))
+            duration = rng.choice([31536000, 94608000])
+            reserved[region].append({
+                'ReservedDBInstanceId': f'ri-{region}-{i:05d}',
+                'ReservedDBInstancesOfferingId': f'offering-{i:05d}',
+                'DBInstanceClass': db['DBInstanceClass'],
+                'DBInstanceCount': rng.randint(1, 5),
+                'ProductDescription': db['Engine'],
+                'State': 'active' if rng.random() < 0.9 else 'retired',
+                'OfferingType': rng.choice(['No Upfront', 'Partial Upfront', 'All Upfront']),
+                'RecurringCharges': [{'RecurringChargeAmount': 0.05, 'RecurringChargeFrequency': 'Hourly'}],
+                'FixedPrice': rng.choice([0.0, 500.0, 1200.0]),
+                'UsagePrice': 0.0,
+                'StartTime': start,
+                'Duration': duration,
+                'MultiAZ': db['MultiAZ'],
+                'CurrencyCode': 'USD',
+            })
+    return reserved
+
+
+def generate_pending_actions(instances, rng, now):
+    """PendingMaintenanceActions for about 5% of instances and their clusters, keyed by region."""
+    pending = {}
+    for region, dbs in instances.items():
+        pending[region] = []
+        for db in dbs:
+            if rng.random() >= 0.05:
+                continue
+            resource = db['DBInstanceArn']
+            if db.get('DBClusterIdentifier') and rng.random() < 0.5:
+                resource = resource.replace(f":db:{db['DBInstanceIdentifier']}", f":cluster:{db['DBClusterIdentifier']}")
+            pending[region].append({
+                'ResourceIdentifier': resource,
+                'PendingMaintenanceActionDetails': [{
+                    'Action': rng.choice(['system-update', 'db-upgrade', 'os-upgrade']),
+                    'Description': 'New Operating System update is available',
+                    'AutoAppliedAfterDate': now + timedelta(days=rng.randint(1, 30)),
+                    'OptInStatus': 'pending',
+                }],
+            })
+    return pending
+
+
+def _product(sku, attributes, description, unit, price):
+    """One Pricing API PriceList entry, serialized the way get_products returns it."""
+    return json.dumps({
+        'product': {'productFamily': attributes['productFamily'], 'sku': sku, 'attributes': attributes},
+        'serviceCode': 'AmazonRDS',
+        'terms': {'OnDemand': {f'{sku}.JRTCKXETXF': {
+            'sku': sku,
+            'priceDimensions': {f'{sku}.JRTCKXETXF.6YS6EN2CT7': {
+                'unit': unit, 'description': description, 'pricePerUnit': {'USD': f'{price:.10f}'},
+            }},
+        }}},
+    })
+
+
+def generate_price_list(region, pricing_engine):
+    """Pricing catalog (instances, storage, IOPS, throughput) for one region and Pricing API engine."""
+    prefix = REGION_PREFIXES.get(region, region.replace('-', '').upper())
+    products = []
+    base = {'regionCode': region, 'databaseEngine': pricing_engine, 'servicecode': 'AmazonRDS'}
+    license_model = 'License included' if pricing_engine in ('Oracle', 'SQL Server') else 'No license required'
+    multiplier = {'Oracle': 1.8, 'SQL Server': 2.2}.get(pricing_engine, 1.0)
+    editions = [None]
+    if pricing_engine == 'Oracle':
+        editions = ['Standard Two', 'Enterprise']
+    elif pricing_engine == 'SQL Server':
+        editions = ['Standard', 'Enterprise', 'Web']
+
+    sku = 0
+    for instance_class in all_instance_classes():
+        weight = dict(SIZES)[instance_class.split('.')[2]]
+        for edition_name in editions:
+            for deployment, usage in (('Single-AZ', 'InstanceUsage'), ('Multi-AZ', 'Multi-AZUsage')):
+                sku += 1
+                price = 0.017 * weight * multiplier * (2 if deployment == 'Multi-AZ' else 1)
+                if edition_name == 'Enterprise':
+                    price *= 2
+                attributes = dict(base, productFamily='Database Instance', instanceType=instance_class,
+                                  deploymentOption=deployment, licenseModel=license_model,
+                                  usagetype=f'{prefix}-{usage}:{instance_class}')
+                if edition_name:
+                    attributes['databaseEdition'] = edition_name
+                products.append(_product(f'{prefix}{sku:08d}', attributes,
+                                         f'${price:.3f} per RDS {instance_class} {deployment} instance hour',
+                                         'Hrs', price))
+
+    for storage_type, (volume_type, price) in STORAGE_TYPES.items():
+        for deployment, infix in (('Single-AZ', ''), ('Multi-AZ', 'Multi-AZ-')):
+            sku += 1
+            attributes = dict(base, productFamily='Database Storage', volumeType=volume_type, deploymentOption=deployment,
+                              usagetype=f'{prefix}-RDS:{infix}{storage_type.upper()}-Storage')
+            products.append(_product(f'{prefix}{sku:08d}', attributes,
+                                     f'${price} per GB-month of {volume_type} storage', 'GB-Mo',
+                                     price * (2 if infix else 1)))
+
+    for usage, price in (('PIOPS', 0.10), ('IO2-PIOPS', 0.10), ('gp3-PIOPS', 0.02)):
+        for deployment, infix in (('Single-AZ', ''), ('Multi-AZ', 'Multi-AZ-')):
+            sku += 1
+            attributes = dict(base, productFamily='Provisioned IOPS', deploymentOption=deployment,
+                              usagetype=f'{prefix}-RDS:{infix}{usage}')
+            products.append(_product(f'{prefix}{sku:08d}', attributes,
+                                     f'${price} per IOPS-month', 'IOPS-Mo', price * (2 if infix else 1)))
+
+    for deployment, infix in (('Single-AZ', ''), ('Multi-AZ', 'Multi-AZ-')):
+        sku += 1
+        attributes = dict(base, productFamily='Provisioned Throughput', deploymentOption=deployment,
+                          usagetype=f'{prefix}-RDS:{infix}gp3-throughput')
+        products.append(_product(f'{prefix}{sku:08d}', attributes,
+                                 '$0.080 per MiBps-month', 'MiBps-Mo', 0.08 * (2 if infix else 1)))
+    return products
+
+
+def generate_fleet(size, regions=None, account_id=DEFAULT_ACCOUNT_ID, seed=42):
+    """
+    Generate a synthetic fleet.
+
+    Returns:
+        Dictionary with:
+        - account_id
+        - regions
+        - db_instances: {region: [DBInstance]} as returned by describe_db_instances
+        - reserved_instances: {region: [ReservedDBInstance]}
+        - pending_actions: {region: [PendingMaintenanceAction]}
+        - price_lists: {(region, databaseEngine): [PriceList JSON string]}
+    """
+    regions = list(regions or DEFAULT_REGIONS)
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    db_instances = generate_instances(size, regions, account_id, rng)
+
+    price_lists = {}
+    for region in regions:
+        for pricing_engine in sorted(set(engine for engine, _ in PRICING_ENGINES.values())):
+            price_lists[(region, pricing_engine)] = generate_price_list(region, pricing_engine)
+
+    return {
+        'account_id': account_id,
+        'regions': regions,
+        'db_instances': db_instances,
+        'reserved_instances': generate_reserved_instances(db_instances, rng, now),
+        'pending_actions': generate_pending_actions(db_instances, rng, now),
+        'price_lists': price_lists,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    fleet = generate_fleet(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
+    count = sum(len(dbs) for dbs in fleet['db_instances'].values())
+    ris = sum(len(r) for r in fleet['reserved_instances'].values())
+    products = sum(len(p) for p in fleet['price_lists'].values())
+    print(f"Generated {count} instances, {ris} reserved instances and {products} price list entries "
+          f"across {len(fleet['regions'])} regions")
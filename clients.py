@@ -0,0 +1,210 @@
+import boto3
+import logging
+import threading
+from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from accounts import get_session
+from concurrency import AIMDLimiter, LimitedClient
+
+# botocore's default pool size; clients never get fewer connections than this
+DEFAULT_POOL_SIZE = 10
+
+# Attempts per API call (first try included), throttled or failing transiently
+MAX_ATTEMPTS = 5
+
+# Upper bound on clients pre-warmed concurrently
+MAX_PREWARM_WORKERS = 8
+
+# Cheap read-only call per service that opens a pooled connection to its endpoint.
+# An error response (e.g. AccessDenied) still leaves the connection open for reuse.
+PREWARM_CALLS = {
+    'rds': ('describe_account_attributes', {}),
+    'cloudwatch': ('list_dashboards', {}),
+    'pricing': ('describe_services', {'ServiceCode': 'AmazonRDS', 'MaxResults': 1}),
+    'sts': ('get_caller_identity', {}),
+}
+
+logger = logging.getLogger(__name__)
+
+# Shared clients keyed by (service, region, account)
+_clients = {}
+
+# Connection pool size per service, set by the modules that own the worker pools
+_pool_sizes = {}
+
+# Session used for the default credential chain, created on first use
+_default_session = None
+
+# Optional replacement for session.client(), e.g. the local AWS stand-in in benchmarks/
+_client_factory = None
+
+# Adaptive concurrency limit per (service, region, account), the scope AWS throttles in,
+# so a throttle in one region or account never slows down the others
+_limiters = {}
+
+# Set by cancel_calls(); limiters created afterwards start cancelled
+_cancelled = False
+
+# Sessions are not thread-safe, so clients are created one at a time.
+# The clients themselves are thread-safe and shared by every worker thread.
+_lock = threading.Lock()
+
+
+def make_config(max_workers: int = DEFAULT_POOL_SIZE) -> Config:
+    """Client configuration with a connection pool large enough for max_workers concurrent callers."""
+    return Config(
+        max_pool_connections=max(max_workers, DEFAULT_POOL_SIZE),
+        # botocore is the only retry layer: the AIMDLimiter lowers concurrency on throttles
+        # but does not retry them again. Client-side rate limiting is left to the limiter;
+        # 'adaptive' would slow every call of the client down after a single throttle
+        retries={'max_attempts': MAX_ATTEMPTS, 'mode': 'standard'},
+        connect_timeout=10,
+        read_timeout=30
+    )
+
+
+def set_pool_size(service: str, max_workers: int) -> None:
+    """Size the connection pool of clients for a service to the number of threads that call it at once."""
+    _pool_sizes[service] = max_workers
+    for (limiter_service, _, _), limiter in list(_limiters.items()):
+        if limiter_service == service:
+            limiter.max_limit = max(max_workers, DEFAULT_POOL_SIZE)
+
+
+def get_limiter(service: str, region: str, account: Optional[str] = None) -> AIMDLimiter:
+    """Concurrency limiter for a service in one region and account, bounded by the client's connection pool size."""
+    key = (service, region, account)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = _limiters.setdefault(key, AIMDLimiter(service, max(_pool_sizes.get(service, DEFAULT_POOL_SIZE),
+                                                                      DEFAULT_POOL_SIZE)))
+        if _cancelled:
+            limiter.cancel()
+    return limiter
+
+
+def cancel_calls() -> None:
+    """
+    Make every later API call through a shared client fail fast, so worker pools of stages
+    that are still running drain instead of keeping the process alive after the table exits.
+    """
+    global _cancelled
+    _cancelled = True
+    for limiter in list(_limiters.values()):
+        limiter.cancel()
+
+
+def format_concurrency_stats() -> str:
+    """
+    One line per service, summed over its regions and accounts: current / max concurrency
+    (lowest and highest current limit when they differ), lowest limit reached, calls and throttles.
+    """
+    by_service = {}
+    for (service, _, _), limiter in list(_limiters.items()):
+        by_service.setdefault(service, []).append(limiter.stats())
+    lines = []
+    for service, stats in sorted(by_service.items()):
+        low = min(entry['limit'] for entry in stats)
+        high = max(entry['limit'] for entry in stats)
+        limit = f"{low}" if low == high else f"{low}-{high}"
+        scopes = f" in {len(stats)} regions/accounts" if len(stats) > 1 else ""
+        lines.append(f"{service}: limit {limit}/{max(entry['max_limit'] for entry in stats)}{scopes} "
+                     f"(lowest {min(entry['min_limit_seen'] for entry in stats)}), "
+                     f"{sum(entry['calls'] for entry in stats)} calls, "
+                     f"{sum(entry['throttles'] for entry in stats)} throttled")
+    return '; '.join(lines) if lines else 'no API calls'
+
+
+def set_client_factory(factory) -> None:
+    """
+    Create clients with factory(service, region, account) instead of boto3.
+
+    Pass None to go back to boto3. Clients created so far, and their concurrency
+    limits, are discarded.
+    """
+    global _client_factory
+    with _lock:
+        _client_factory = factory
+        _clients.clear()
+        _limiters.clear()
+
+
+def _get_session(account: Optional[str] = None):
+    """Session for an account, or the shared default session when account is None. Caller holds the lock."""
+    global _default_session
+    if account is not None:
+        return get_session(account)
+    if _default_session is None:
+        _default_session = boto3.Session()
+    return _default_session
+
+
+def get_client(service: str, region: str, account: Optional[str] = None):
+    """
+    Get the shared client for a service, region and account, creating it on first use.
+
+    The connection pool is sized from set_pool_size() for the service, and every API
+    call goes through the AIMDLimiter of the same service, region and account (see get_limiter()).
+    """
+    key = (service, region, account)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if _client_factory is not None:
+                client = _client_factory(service, region, account)
+            else:
+                session = _get_session(account)
+                client = session.client(service, region_name=region,
+                                        config=make_config(_pool_sizes.get(service, DEFAULT_POOL_SIZE)))
+            client = LimitedClient(client, get_limiter(service, region, account))
+            _clients[key] = client
+    return client
+
+
+def _open_connection(client, service: str) -> bool:
+    """Make the service's PREWARM_CALLS request so its connection is pooled for the first real call."""
+    if service not in PREWARM_CALLS:
+        return False
+    operation, params = PREWARM_CALLS[service]
+    try:
+        getattr(client, operation)(**params)
+    except ClientError:
+        pass
+    return True
+
+
+def prewarm(targets: List[Tuple[str, str, Optional[str]]]) -> int:
+    """
+    Create clients and open a connection to each endpoint in parallel.
+
+    Args:
+        targets: (service, region, account) tuples
+
+    Returns:
+        Number of endpoints that were warmed. Failures are logged at debug level;
+        the first real request simply opens its own connection.
+    """
+    def warm(target):
+        service, region, account = target
+        try:
+            return _open_connection(get_client(service, region, account), service)
+        except Exception as e:
+            logger.debug("Pre-warming %s in %s failed: %s", service, region, e)
+            return False
+
+    if not targets:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(MAX_PREWARM_WORKERS, len(targets))) as executor:
+        return sum(executor.map(warm, targets))
+
+
+def prewarm_in_background(targets: List[Tuple[str, str, Optional[str]]]) -> threading.Thread:
+    """Run prewarm() on a daemon thread so startup never waits for it."""
+    thread = threading.Thread(target=prewarm, args=(targets,), daemon=True)
+    thread.start()
+    return thread
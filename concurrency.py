@@ -0,0 +1,241 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Hashable, Optional
+
+from botocore.exceptions import ClientError
+
+# Error codes AWS services use for request throttling
+THROTTLING_CODES = {
+    'Throttling', 'ThrottlingException', 'ThrottledException', 'RequestThrottled',
+    'RequestThrottledException', 'TooManyRequestsException', 'RequestLimitExceeded',
+    'ProvisionedThroughputExceededException', 'SlowDown',
+}
+
+# Concurrency never drops below this, so a throttled service still makes progress
+MIN_LIMIT = 1
+
+# Limit is multiplied by this on throttling
+DECREASE_FACTOR = 0.5
+
+# Throttled calls of clients without their own retries (see AIMDLimiter.call) are retried
+# this many times, after a jittered exponential backoff
+MAX_THROTTLE_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.2
+
+
+class CallsCancelled(Exception):
+    """Raised instead of making an API call after the limiter was cancelled."""
+
+
+def is_throttling_error(error: Exception) -> bool:
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in THROTTLING_CODES
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent calls to one service
+    in one region and account (see clients.get_limiter()).
+
+    Every successful call raises the limit by 1/limit (about +1 per round of `limit`
+    calls), up to max_limit; a throttled call halves it. Throttles from calls started
+    before the last decrease belong to the same burst and do not decrease it again.
+    """
+
+    def __init__(self, service: str, max_limit: int, initial_limit: Optional[int] = None):
+        self.service = service
+        self.max_limit = max(MIN_LIMIT, max_limit)
+        self.limit = float(min(initial_limit or self.max_limit, self.max_limit))
+        self.in_flight = 0
+        self.epoch = 0  # incremented on every decrease
+        self.calls = 0
+        self.throttles = 0
+        self.decreases = 0
+        self.min_seen = self.limit
+        self.cancelled = False
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    def acquire(self) -> int:
+        """Wait for a free slot. Returns the epoch to pass to release()."""
+        with self._condition:
+            while not self.cancelled and self.in_flight >= int(self.limit):
+                self._condition.wait()
+            if self.cancelled:
+                raise CallsCancelled(f"{self.service} calls cancelled")
+            self.in_flight += 1
+            self.calls += 1
+            self._local.epoch = self.epoch
+            return self.epoch
+
+    def release(self, epoch: int, outcome: str = 'success') -> None:
+        """
+        Free a slot. outcome is 'success' (raises the limit), 'throttled' (lowers it) or
+        'error' (other failures, and throttles already reported through on_throttle()).
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if outcome == 'success':
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif outcome == 'throttled':
+                self._record_throttle(epoch)
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """Fail waiting and later calls with CallsCancelled; calls in flight finish normally."""
+        with self._condition:
+            self.cancelled = True
+            self._condition.notify_all()
+
+    def on_throttle(self, epoch: Optional[int] = None) -> None:
+        """Record a throttled attempt, e.g. one that botocore retries internally."""
+        if epoch is None:
+            epoch = getattr(self._local, 'epoch', self.epoch)
+        with self._condition:
+            self._record_throttle(epoch)
+
+    def _record_throttle(self, epoch: int) -> None:
+        self.throttles += 1
+        if epoch == self.epoch:
+            self.limit = max(MIN_LIMIT, self.limit * DECREASE_FACTOR)
+            self.min_seen = min(self.min_seen, self.limit)
+            self.epoch += 1
+            self.decreases += 1
+
+    def call(self, func, args=(), kwargs=None, observed=False):
+        """
+        Run func within the limit.
+
+        observed: the client retries throttled attempts itself and reports each of them
+                  through on_throttle() (botocore's retry hook), so a throttling error that
+                  reaches this point is final. Otherwise throttled calls are retried here
+                  with backoff, so every call has exactly one retry layer.
+        """
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            epoch = self.acquire()
+            try:
+                result = func(*args, **(kwargs or {}))
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                self.release(epoch, 'throttled' if throttled and not observed else 'error')
+                if not throttled or observed or attempt == MAX_THROTTLE_RETRIES:
+                    raise
+                time.sleep(random.uniform(0, BACKOFF_BASE_SECONDS * 2 ** attempt))
+                continue
+            self.release(epoch)
+            return result
+
+    def stats(self) -> Dict:
+        return {
+            'limit': int(self.limit),
+            'max_limit': self.max_limit,
+            'min_limit_seen': int(self.min_seen),
+            'calls': self.calls,
+            'throttles': self.throttles,
+            'decreases': self.decreases,
+        }
+
+
+class LimitedPaginator:
+    """Paginator whose page requests go through an AIMDLimiter."""
+
+    def __init__(self, paginator, limiter: AIMDLimiter, observed: bool = False):
+        self._paginator = paginator
+        self._limiter = limiter
+        self._observed = observed
+
+    def paginate(self, **kwargs):
+        pages = iter(self._paginator.paginate(**kwargs))
+        while True:
+            # A page iterator cannot resume after an error, so throttled pages are not retried here
+            epoch = self._limiter.acquire()
+            try:
+                page = next(pages)
+            except StopIteration:
+                self._limiter.release(epoch)
+                return
+            except Exception as e:
+                throttled = is_throttling_error(e) and not self._observed
+                self._limiter.release(epoch, 'throttled' if throttled else 'error')
+                raise
+            self._limiter.release(epoch)
+            yield page
+
+    def __getattr__(self, name):
+        return getattr(self._paginator, name)
+
+
+# Client methods that do not call the service
+LOCAL_METHODS = {'can_paginate', 'close', 'generate_presigned_url', 'generate_presigned_post', 'get_waiter'}
+
+
+class LimitedClient:
+    """
+    Client proxy that runs every API call (and paginator page) through an AIMDLimiter.
+
+    For botocore clients, throttled attempts that botocore retries internally are
+    reported to the limiter as they happen, through the client's needs-retry event.
+    """
+
+    def __init__(self, client, limiter: AIMDLimiter):
+        self._client = client
+        self._limiter = limiter
+        events = getattr(getattr(client, 'meta', None), 'events', None)
+        self._observed = events is not None
+        if events is not None:
+            events.register('needs-retry', self._on_needs_retry)
+
+    def _on_needs_retry(self, response=None, **kwargs):
+        # response is (http_response, parsed) for attempts that got an answer; returning None
+        # leaves the retry decision to botocore
+        if response is not None and response[1].get('Error', {}).get('Code') in THROTTLING_CODES:
+            self._limiter.on_throttle()
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name == 'get_paginator':
+            return lambda operation: LimitedPaginator(attr(operation), self._limiter, self._observed)
+        if name.startswith('_') or name in LOCAL_METHODS or not callable(attr):
+            return attr
+
+        def limited_call(*args, **kwargs):
+            return self._limiter.call(attr, args, kwargs, observed=self._observed)
+        return limited_call
+
+
+class SingleFlight:
+    """
+    Coalesce identical calls: the first caller for a key runs the function, callers that
+    ask for the same key meanwhile wait for it and get the same result (or exception).
+
+    With remember=True, finished results are kept too, so every caller of this
+    SingleFlight gets one call per key however they are scheduled.
+    """
+
+    def __init__(self, remember: bool = False):
+        self.remember = remember
+        self.flights = {}  # key -> Future
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func, *args, **kwargs):
+        with self.lock:
+            future = self.flights.get(key)
+            leader = future is None
+            if leader:
+                future = self.flights[key] = Future()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if leader:
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                if not self.remember:
+                    with self.lock:
+                        del self.flights[key]
+        return future.result()
@@ -1,35 +1,53 @@
 import boto3
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from botocore.exceptions import BotoCoreError, ClientError
-from botocore.config import Config
-
-# Optimized boto3 configuration
-OPTIMIZED_CONFIG = Config(
-    max_pool_connections=30,
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=10,
-    read_timeout=30
-)
-
-# Thread-local storage for boto3 clients
-_local = threading.local()
-
-def get_optimized_rds_client(region='ap-south-1'):
-    """Get thread-local optimized RDS client with connection pooling."""
-    client_key = f'rds_client_{region}'
-    if not hasattr(_local, client_key):
-        session = boto3.Session()
-        setattr(_local, client_key, session.client('rds', 
-                                                  region_name=region,
-                                                  config=OPTIMIZED_CONFIG))
-    return getattr(_local, client_key)
+from accounts import get_registered_account_id
+from clients import get_client, set_pool_size
+
+# Region used when none is configured for the AWS session
+DEFAULT_REGION = 'ap-south-1'
+
+# Upper bound on regions fetched concurrently
+MAX_REGION_WORKERS = 8
+
+# The instance, Reserved Instance and backup/maintenance stages call the same RDS clients at once
+set_pool_size('rds', MAX_REGION_WORKERS)
+
+# Error codes returned by regions that are not enabled for the account
+REGION_DISABLED_ERRORS = {'InvalidClientTokenId', 'UnrecognizedClientException', 'AuthFailure', 'OptInRequired'}
+
+def get_optimized_rds_client(region=DEFAULT_REGION, account=None):
+    """Get the shared RDS client for a region and account."""
+    return get_client('rds', region, account)
+
+# Caller identities keyed by account name, looked up at most once per run
+_identities = {}
+_identity_lock = threading.Lock()
+
+def get_caller_identity(account=None):
+    """Get the STS caller identity for an account, calling STS only the first time."""
+    # Held across the call so concurrent callers share a single lookup
+    with _identity_lock:
+        if account not in _identities:
+            sts = get_client('sts', get_default_region(), account)
+            _identities[account] = sts.get_caller_identity()
+        return _identities[account]
+
+def get_account_id(account=None):
+    """Get the AWS account ID for an account, or None if it cannot be determined."""
+    if account is not None and get_registered_account_id(account):
+        return get_registered_account_id(account)
+    try:
+        return get_caller_identity(account)['Account']
+    except (BotoCoreError, ClientError):
+        return None
 
 def validate_aws_credentials():
     """Validate AWS credentials by making a simple API call."""
     try:
-        sts = boto3.client('sts')
-        sts.get_caller_identity()
+        get_caller_identity()
         return True
     except (BotoCoreError, ClientError) as e:
         print(f"\nError: Invalid AWS credentials - {str(e)}")
@@ -45,9 +63,91 @@ def is_aurora_instance(engine):
     aurora_engines = ['aurora-mysql', 'aurora-postgresql', 'aurora']
     return engine.lower() in aurora_engines if engine else False
 
-def fetch_rds_instances():
-    """Fetch all RDS instances and their key metadata."""
-    rds = get_optimized_rds_client('ap-south-1')
+def get_default_region():
+    """Get the region configured for the AWS session, falling back to DEFAULT_REGION."""
+    return boto3.Session().region_name or DEFAULT_REGION
+
+def resolve_regions(regions=None):
+    """
+    Resolve a --regions value into a list of region names.
+
+    Accepts None (configured region), 'all' (every region RDS is available in),
+    a comma-separated string or a list of region names.
+    """
+    if not regions:
+        return [get_default_region()]
+    if isinstance(regions, str):
+        if regions.strip().lower() == 'all':
+            return sorted(boto3.Session().get_available_regions('rds'))
+        regions = regions.split(',')
+    resolved = []
+    for region in regions:
+        region = region.strip()
+        if region and region not in resolved:
+            resolved.append(region)
+    return resolved or [get_default_region()]
+
+def get_instance_key(inst):
+    """
+    Get the key used for an instance in the metrics, pricing and backup dictionaries.
+
+    Instance identifiers are only unique within an account and region, so the
+    instance ARN is used when available.
+    """
+    return inst.get('DBInstanceArn') or inst['DBInstanceIdentifier']
+
+def group_by_region(rds_instances):
+    """Group instances by their (Account, Region) fields."""
+    groups = {}
+    for inst in rds_instances:
+        groups.setdefault((inst.get('Account'), inst.get('Region') or DEFAULT_REGION), []).append(inst)
+    return groups
+
+def fetch_across_regions(fetch_func, regions, accounts=None, max_workers=MAX_REGION_WORKERS):
+    """
+    Run fetch_func(region, account) for each account and region concurrently and concatenate the resulting lists.
+
+    accounts defaults to [None] (the default credential chain). Results are merged
+    in the order accounts and regions were given so output is stable between runs.
+    """
+    targets = [(account, region) for account in (accounts or [None]) for region in regions]
+    if len(targets) == 1:
+        account, region = targets[0]
+        return fetch_func(region, account)
+
+    results_by_target = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as executor:
+        future_to_target = {executor.submit(fetch_func, region, account): (account, region)
+                            for account, region in targets}
+        for future in as_completed(future_to_target):
+            account, region = future_to_target[future]
+            try:
+                results_by_target[(account, region)] = future.result()
+            except Exception as e:
+                label = f"{account}/{region}" if account else region
+                print(f"Error fetching data for region {label}: {e}")
+                results_by_target[(account, region)] = []
+
+    merged = []
+    for target in targets:
+        merged.extend(results_by_target.get(target, []))
+    return merged
+
+def fetch_rds_instances(regions=None, accounts=None):
+    """Fetch all RDS instances and their key metadata across one or more accounts and regions."""
+    regions = resolve_regions(regions)
+    instances = fetch_across_regions(fetch_rds_instances_for_region, regions, accounts)
+    if accounts and len(accounts) > 1:
+        active_accounts = len(set(inst['Account'] for inst in instances))
+        print(f"[INFO] Found {len(instances)} RDS instances in {active_accounts}/{len(accounts)} accounts")
+    elif len(regions) > 1:
+        active_regions = len(set(inst['Region'] for inst in instances))
+        print(f"[INFO] Found {len(instances)} RDS instances in {active_regions}/{len(regions)} regions")
+    return instances
+
+def fetch_rds_instances_for_region(region, account=None):
+    """Fetch all RDS instances in a single region, optionally for a named account."""
+    rds = get_optimized_rds_client(region, account)
     instances = []
     try:
         paginator = rds.get_paginator('describe_db_instances')
@@ -58,6 +158,7 @@ def fetch_rds_instances():
                 
                 instances.append({
                     'DBInstanceIdentifier': db.get('DBInstanceIdentifier'),
+                    'DBInstanceArn': db.get('DBInstanceArn'),
                     'DBInstanceClass': db.get('DBInstanceClass'),
                     'AllocatedStorage': db.get('AllocatedStorage'),
                     'Iops': db.get('Iops'),
@@ -66,9 +167,15 @@ def fetch_rds_instances():
                     'Endpoint': db.get('Endpoint', {}).get('Address'),
                     'Engine': engine,
                     'Region': rds.meta.region_name,
+                    'Account': account,
                     'IsAurora': is_aurora,
                     'DBClusterIdentifier': db.get('DBClusterIdentifier') if is_aurora else None,
                     'MultiAZ': db.get('MultiAZ', False),
+                    # Picks the price among a catalog's license models (pricing.get_pricing_edition)
+                    'LicenseModel': db.get('LicenseModel'),
+                    # Performance Insights is addressed by the resource id, not the identifier
+                    'DbiResourceId': db.get('DbiResourceId'),
+                    'PerformanceInsightsEnabled': db.get('PerformanceInsightsEnabled', False),
                     # Add backup and maintenance fields
                     'PreferredBackupWindow': db.get('PreferredBackupWindow'),
                     'BackupRetentionPeriod': db.get('BackupRetentionPeriod'),
@@ -76,6 +183,10 @@ def fetch_rds_instances():
                     'PreferredMaintenanceWindow': db.get('PreferredMaintenanceWindow'),
                     'AutoMinorVersionUpgrade': db.get('AutoMinorVersionUpgrade'),
                 })
-    except (BotoCoreError, ClientError) as e:
-        print(f"Error fetching RDS instances: {e}")
+    except ClientError as e:
+        # Regions that are not enabled for the account reject the credentials; skip them quietly
+        if e.response.get('Error', {}).get('Code') not in REGION_DISABLED_ERRORS:
+            print(f"Error fetching RDS instances in {f'{account}/' if account else ''}{region}: {e}")
+    except BotoCoreError as e:
+        print(f"Error fetching RDS instances in {f'{account}/' if account else ''}{region}: {e}")
     return instances
\ No newline at end of file
@@ -0,0 +1,66 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from options import FORECAST_DAYS, FORECAST_MAX_DAYS, FORECAST_MIN_DAYS
+
+# One datapoint every 6 hours: 28 points for 7 days, 120 for 30
+FORECAST_PERIOD = 21600
+
+# Fewer datapoints than this give no forecast
+FORECAST_MIN_POINTS = 4
+
+# Performance key the forecast is stored under, next to the per-instance metrics
+FORECAST_KEY = 'days_until_full'
+
+SECONDS_PER_DAY = 86400
+
+
+def forecast_days_until_full(histories: Dict[str, Tuple[array, array]]) -> Dict[str, Optional[float]]:
+    """
+    Fit a least-squares line to each FreeStorageSpace history and extrapolate it to zero.
+
+    All series are fitted at once: their datapoints are flattened into one array and
+    the per-series sums of the normal equations are taken with bincount, so the cost
+    is a handful of array passes over the whole fleet.
+
+    Args:
+        histories: {key: (timestamps in epoch seconds as array('q'), free bytes as array('d'))},
+                   in any order, as metrics.fetch_metric_history() and MetricCache.get() return them
+
+    Returns:
+        {key: days until free space reaches zero, or None if it is not shrinking}.
+        Series with fewer than FORECAST_MIN_POINTS datapoints are left out.
+    """
+    keys = [key for key, (timestamps, _) in histories.items() if len(timestamps) >= FORECAST_MIN_POINTS]
+    if not keys:
+        return {}
+    # Imported on first use, so runs without a forecast never load numpy
+    import numpy as np
+
+    counts = np.fromiter((len(histories[key][0]) for key in keys), dtype=np.int64, count=len(keys))
+    rows = np.repeat(np.arange(len(keys)), counts)
+    # One join over the series' int64 / float64 buffers builds each flat array in a single copy
+    timestamps = np.frombuffer(b''.join(histories[key][0] for key in keys), dtype=np.int64).astype(np.float64)
+    free = np.frombuffer(b''.join(histories[key][1] for key in keys), dtype=np.float64)
+
+    # Time in days since each series' newest datapoint keeps the sums well conditioned
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    newest = np.maximum.reduceat(timestamps, starts)
+    x = (timestamps - newest[rows]) / SECONDS_PER_DAY
+
+    n = counts.astype(np.float64)
+    sum_x = np.bincount(rows, weights=x, minlength=len(keys))
+    sum_y = np.bincount(rows, weights=free, minlength=len(keys))
+    sum_xx = np.bincount(rows, weights=x * x, minlength=len(keys))
+    sum_xy = np.bincount(rows, weights=x * free, minlength=len(keys))
+    denominator = n * sum_xx - sum_x * sum_x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sum_xy - sum_x * sum_y) / denominator
+        # Fitted free space at the newest datapoint (x = 0)
+        intercept = (sum_y - slope * sum_x) / n
+        days = np.maximum(intercept, 0) / -slope
+
+    shrinking = (denominator > 0) & (slope < 0)
+    return {key: value if is_shrinking else None
+            for key, value, is_shrinking in zip(keys, days.tolist(), shrinking.tolist())}
+
@@ -0,0 +1,181 @@
+import calendar
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pricing_cache import get_cache_dir
+
+# File layout: one JSON header line listing every series as (key, fetched_until, count),
+# followed by all timestamps as one int64 array and all values as one float64 array,
+# in header order. Loading is two array.frombytes() calls, however many series there are.
+METRIC_CACHE_FILE = None  # Default: metrics.bin in pricing_cache.get_cache_dir()
+METRIC_CACHE_FORMAT = 'smart-rds-viewer-metrics'
+METRIC_CACHE_VERSION = 1
+
+# Datapoints older than this are dropped, and so are series not fetched for as long
+METRIC_CACHE_RETENTION_DAYS = 30
+
+# Upper bound per series (30 days at a 1-hour period), whatever the period
+METRIC_CACHE_MAX_POINTS = 720
+
+# Series fetched this recently are served from the cache without calling CloudWatch
+METRIC_CACHE_FRESH_SECONDS = 60
+
+
+def get_metric_cache_path() -> str:
+    return METRIC_CACHE_FILE or os.path.join(get_cache_dir(), "metrics.bin")
+
+
+def to_epoch(value) -> int:
+    """Epoch seconds of a datetime; naive datetimes are taken as UTC (like datetime.utcnow())."""
+    if isinstance(value, datetime):
+        return calendar.timegm(value.utctimetuple())
+    return int(value)
+
+
+def get_series_key(scope: Tuple, query: Dict) -> str:
+    """Cache key of a MetricStat query: account, region, metric, dimensions, statistic and period."""
+    metric_stat = query['MetricStat']
+    metric = metric_stat['Metric']
+    dimensions = ','.join(f"{d['Name']}={d['Value']}" for d in metric['Dimensions'])
+    account, region = scope
+    return '|'.join([account or '', region, metric['Namespace'], metric['MetricName'], dimensions,
+                     metric_stat['Stat'], str(metric_stat['Period'])])
+
+
+class MetricCache:
+    """
+    Time series per (account, region, metric, dimensions, statistic, period), each
+    stored as parallel int64 timestamp / float64 value arrays in ascending time order,
+    with the time up to which it has been fetched.
+
+    Thread-safe, so the per-region metric fetches can share one cache.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_metric_cache_path()
+        self.series = {}  # key -> [fetched_until, timestamps array('q'), values array('d')]
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'MetricCache':
+        """Open the cache file; a missing, outdated or unreadable file gives an empty cache."""
+        cache = cls(path)
+        try:
+            with open(cache.path, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('format') != METRIC_CACHE_FORMAT or header.get('version') != METRIC_CACHE_VERSION:
+                    print("[INFO] Metric cache format changed, starting a new one...")
+                    return cache
+                total = sum(count for _, _, count in header['series'])
+                timestamps = array('q')
+                values = array('d')
+                timestamps.frombytes(f.read(total * timestamps.itemsize))
+                values.frombytes(f.read(total * values.itemsize))
+        except FileNotFoundError:
+            return cache
+        except Exception as e:
+            print(f"[WARN] Error loading metric cache: {e}")
+            return cache
+        if len(timestamps) != total or len(values) != total:
+            print("[WARN] Metric cache file is truncated, starting a new one...")
+            return cache
+        if header.get('byteorder') != sys.byteorder:
+            timestamps.byteswap()
+            values.byteswap()
+
+        offset = 0
+        for key, fetched_until, count in header['series']:
+            cache.series[key] = [fetched_until, timestamps[offset:offset + count], values[offset:offset + count]]
+            offset += count
+        return cache
+
+    def save(self) -> None:
+        """Drop expired data and write the cache atomically (temp file + rename)."""
+        cutoff = int(time.time()) - METRIC_CACHE_RETENTION_DAYS * 86400
+        header_series = []
+        timestamps = array('q')
+        values = array('d')
+        with self.lock:
+            for key, (fetched_until, series_timestamps, series_values) in list(self.series.items()):
+                if fetched_until < cutoff:
+                    del self.series[key]
+                    continue
+                first = bisect_left(series_timestamps, cutoff)
+                header_series.append([key, fetched_until, len(series_timestamps) - first])
+                timestamps.extend(series_timestamps[first:])
+                values.extend(series_values[first:])
+
+        header = {
+            'format': METRIC_CACHE_FORMAT,
+            'version': METRIC_CACHE_VERSION,
+            'byteorder': sys.byteorder,
+            'saved_at': int(time.time()),
+            'series': header_series,
+        }
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(json.dumps(header, separators=(',', ':')).encode() + b'\n')
+                timestamps.tofile(f)
+                values.tofile(f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"[WARN] Error saving metric cache: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def fetched_until(self, key: str) -> Optional[int]:
+        """Epoch seconds up to which a series has been fetched, or None if it is not cached."""
+        entry = self.series.get(key)
+        return entry[0] if entry else None
+
+    def update(self, key: str, fetched_until: int, timestamps: List, values: List) -> None:
+        """
+        Merge freshly fetched datapoints (any order) into a series. Cached datapoints
+        at or after the oldest new one are replaced, since the newest period of the
+        previous fetch may have been incomplete.
+        """
+        points = sorted(zip((to_epoch(ts) for ts in timestamps), values))
+        with self.lock:
+            entry = self.series.get(key)
+            if entry is None:
+                entry = self.series[key] = [fetched_until, array('q'), array('d')]
+            entry[0] = max(entry[0], fetched_until)
+            if points:
+                keep = bisect_left(entry[1], points[0][0])
+                del entry[1][keep:]
+                del entry[2][keep:]
+                entry[1].extend(ts for ts, _ in points)
+                entry[2].extend(value for _, value in points)
+                if len(entry[1]) > METRIC_CACHE_MAX_POINTS:
+                    del entry[1][:-METRIC_CACHE_MAX_POINTS]
+                    del entry[2][:-METRIC_CACHE_MAX_POINTS]
+
+    def get(self, key: str, start: int) -> Tuple[array, array]:
+        """Datapoints of a series at or after start (epoch seconds), newest first, as int64 / float64 arrays."""
+        entry = self.series.get(key)
+        if entry is None:
+            return array('q'), array('d')
+        first = bisect_left(entry[1], start)
+        return entry[1][first:][::-1], entry[2][first:][::-1]
+
+
+def clear_metric_cache(path: Optional[str] = None) -> None:
+    """Delete the metric cache file if it exists."""
+    path = path or get_metric_cache_path()
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+            print("[INFO] Metric cache cleared.")
+    except Exception as e:
+        print(f"[WARN] Error clearing metric cache: {e}")
@@ -1,54 +1,39 @@
-import boto3
-import threading
 from datetime import datetime, timedelta
-from fetch import is_aurora_instance
+from fetch import is_aurora_instance, get_instance_key, group_by_region, DEFAULT_REGION, MAX_REGION_WORKERS
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from botocore.config import Config
-
-# Optimized boto3 configuration
-OPTIMIZED_CONFIG = Config(
-    max_pool_connections=30,
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=10,
-    read_timeout=30
-)
-
-# Thread-local storage for boto3 clients
-_local = threading.local()
-
-def get_optimized_cloudwatch_client(region='ap-south-1'):
-    """Get thread-local optimized CloudWatch client with connection pooling."""
-    client_key = f'cloudwatch_client_{region}'
-    if not hasattr(_local, client_key):
-        session = boto3.Session()
-        setattr(_local, client_key, session.client('cloudwatch', 
-                                                  region_name=region,
-                                                  config=OPTIMIZED_CONFIG))
-    return getattr(_local, client_key)
+from clients import get_client, set_pool_size
+from forecast import FORECAST_DAYS, FORECAST_KEY, FORECAST_PERIOD, forecast_days_until_full
+from rightsizing import PEAK_STATISTICS, RIGHTSIZING_KEY, RIGHTSIZING_CLASS_KEY, compute_rightsizing
+from options import METRICS_MODES, PERFORMANCE_METRICS, parse_performance_metrics
+
+# Upper bound on individual metric requests in flight when the batch API fails
+MAX_METRIC_WORKERS = 10
+
+# GetMetricData accepts up to 500 queries per request
+MAX_QUERIES_PER_REQUEST = 500
+
+# Upper bound on GetMetricData requests in flight per account and region
+MAX_BATCH_WORKERS = 4
+
+set_pool_size('cloudwatch', max(MAX_METRIC_WORKERS, MAX_BATCH_WORKERS))
+
+# A Metrics Insights query returns at most this many time series
+INSIGHTS_MAX_SERIES = 500
+
+# Aurora storage is a cluster-level volume; its VolumeBytesUsed is fetched once per
+# cluster and attached to every member under this performance key
+AURORA_VOLUME_KEY = 'volume_used'
+
+
+def get_optimized_cloudwatch_client(region=DEFAULT_REGION, account=None):
+    """Get the shared CloudWatch client for a region and account."""
+    return get_client('cloudwatch', region, account)
 
 def fetch_aurora_cluster_storage(cloudwatch, cluster_id, start_time, end_time):
-    """Fetch cluster-level storage metrics for Aurora clusters."""
+    """Fetch the latest VolumeBytesUsed of an Aurora cluster, or None."""
     try:
-        # Try to get VolumeReadIOPs as a proxy for Aurora cluster activity
-        # Aurora doesn't have FreeStorageSpace at cluster level, so we'll return None
-        # for Aurora instances and handle it in the UI logic
-        response = cloudwatch.get_metric_statistics(
-            Namespace='AWS/RDS',
-            MetricName='VolumeReadIOPs',
-            Dimensions=[{'Name': 'DBClusterIdentifier', 'Value': cluster_id}],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=3600,
-            Statistics=['Average'],
-            Unit='Count/Second',
-        )
-        datapoints = response.get('Datapoints', [])
-        if datapoints:
-            # Aurora has dynamic storage, so we can't calculate used percentage
-            # Return None to indicate no storage metrics available
-            return None
-        else:
-            return None
+        query = build_metric_query('volume', 'VolumeBytesUsed', 'DBClusterIdentifier', cluster_id, unit='Bytes')
+        return latest_value(fetch_query_individually(cloudwatch, query, start_time, end_time))
     except Exception as e:
         print(f"Error fetching Aurora cluster metrics for {cluster_id}: {e}")
         return None
@@ -56,21 +41,16 @@ def fetch_aurora_cluster_storage(cloudwatch, cluster_id, start_time, end_time):
 def fetch_instance_metric(cloudwatch_unused, inst, start_time, end_time):
     """Fetch metric for a single RDS instance."""
     db_id = inst['DBInstanceIdentifier']
+    instance_key = get_instance_key(inst)
     is_aurora = inst.get('IsAurora', False)
     
-    # Use optimized client instead of passed client
-    cloudwatch = get_optimized_cloudwatch_client('ap-south-1')
+    # Use optimized client for the instance's account and region instead of passed client
+    cloudwatch = get_optimized_cloudwatch_client(inst.get('Region') or DEFAULT_REGION, inst.get('Account'))
     
     try:
         if is_aurora:
-            # For Aurora instances, storage is managed at cluster level
-            # Aurora uses dynamic storage allocation, so traditional storage metrics don't apply
-            cluster_id = inst.get('DBClusterIdentifier')
-            if cluster_id:
-                print(f"Aurora instance {db_id} - using cluster-level storage (dynamic)")
-                return db_id, None  # No traditional storage metrics for Aurora
-            else:
-                return db_id, None
+            # Aurora storage is managed at cluster level (see fetch_aurora_cluster_storage)
+            return instance_key, None
         else:
             # Traditional RDS instance - fetch FreeStorageSpace
             response = cloudwatch.get_metric_statistics(
@@ -87,17 +67,242 @@ def fetch_instance_metric(cloudwatch_unused, inst, start_time, end_time):
             if datapoints:
                 # Use the latest datapoint
                 metric_value = sorted(datapoints, key=lambda x: x['Timestamp'])[-1]['Average']
-                return db_id, metric_value
+                return instance_key, metric_value
             else:
-                return db_id, None
+                return instance_key, None
     except Exception as e:
         print(f"Error fetching metrics for {db_id}: {e}")
-        return db_id, None
+        return instance_key, None
+
+
+def fetch_metrics_batch(rds_instances, mode='batch', performance_metrics=None, cache=None, forecast_days=None,
+                        trends=None, rightsizing_days=None):
+    """
+    Fetch FreeStorageSpace and performance metrics using CloudWatch batch API (get_metric_data),
+    one account and region at a time in parallel, sharing an optional MetricCache.
+    FreeStorageSpace histories of every region are collected and the storage forecast
+    is fitted once over the whole fleet.
+
+    Returns:
+        (metrics, performance) tuple, see fetch_instance_metrics()
+    """
+    fetch_region = fetch_metrics_insights_for_region if mode == 'insights' else fetch_metrics_batch_for_region
+    region_groups = group_by_region(rds_instances)
+    metrics = {}
+    performance = {}
+    storage_histories = {} if forecast_days else None
+    if len(region_groups) <= 1:
+        for (account, region), instances in region_groups.items():
+            region_metrics, region_performance = fetch_region(region, instances, account, performance_metrics,
+                                                              cache=cache, forecast_days=forecast_days, trends=trends,
+                                                              rightsizing_days=rightsizing_days,
+                                                              storage_histories=storage_histories)
+            metrics.update(region_metrics)
+            performance.update(region_performance)
+        add_storage_forecast(performance, storage_histories)
+        return metrics, performance
+
+    with ThreadPoolExecutor(max_workers=min(MAX_REGION_WORKERS, len(region_groups))) as executor:
+        futures = [
+            executor.submit(fetch_region, region, instances, account, performance_metrics, cache=cache,
+                            forecast_days=forecast_days, trends=trends, rightsizing_days=rightsizing_days,
+                            storage_histories=storage_histories)
+            for (account, region), instances in region_groups.items()
+        ]
+        for future in as_completed(futures):
+            region_metrics, region_performance = future.result()
+            metrics.update(region_metrics)
+            performance.update(region_performance)
+    add_storage_forecast(performance, storage_histories)
+    return metrics, performance
+
+
+def add_storage_forecast(performance, storage_histories):
+    """Fit every collected FreeStorageSpace history in one pass and store FORECAST_KEY in performance."""
+    if not storage_histories:
+        return
+    for instance_key, days in forecast_days_until_full(storage_histories).items():
+        performance.setdefault(instance_key, {})[FORECAST_KEY] = days
+
+
+def build_metric_query(query_id, metric_name, dimension_name, dimension_value, stat='Average', period=3600, unit=None):
+    """Build a GetMetricData MetricStat query for one AWS/RDS metric."""
+    metric_stat = {
+        'Metric': {
+            'Namespace': 'AWS/RDS',
+            'MetricName': metric_name,
+            'Dimensions': [{'Name': dimension_name, 'Value': dimension_value}]
+        },
+        'Period': period,
+        'Stat': stat,
+    }
+    if unit:
+        metric_stat['Unit'] = unit
+    return {'Id': query_id, 'MetricStat': metric_stat, 'ReturnData': True}
+
+
+def fetch_query_individually(cloudwatch, query, start_time, end_time):
+    """Run a single MetricStat query with get_metric_statistics. Returns (timestamps, values), newest first."""
+    metric_stat = query['MetricStat']
+    metric = metric_stat['Metric']
+    stat = metric_stat['Stat']
+    params = {
+        'Namespace': metric['Namespace'],
+        'MetricName': metric['MetricName'],
+        'Dimensions': metric['Dimensions'],
+        'StartTime': start_time,
+        'EndTime': end_time,
+        'Period': metric_stat['Period'],
+    }
+    # Percentiles (p95, p99, ...) are extended statistics in this API
+    if stat.startswith('p'):
+        params['ExtendedStatistics'] = [stat]
+    else:
+        params['Statistics'] = [stat]
+    if metric_stat.get('Unit'):
+        params['Unit'] = metric_stat['Unit']
+
+    response = cloudwatch.get_metric_statistics(**params)
+    datapoints = sorted(response.get('Datapoints', []), key=lambda x: x['Timestamp'], reverse=True)
+    values = [dp['ExtendedStatistics'][stat] if stat.startswith('p') else dp[stat] for dp in datapoints]
+    return [dp['Timestamp'] for dp in datapoints], values
+
+
+def _run_metric_batch(cloudwatch, batch, start_time, end_time):
+    """Run one GetMetricData request of up to MAX_QUERIES_PER_REQUEST queries, following NextToken."""
+    series = {}
+    params = {
+        'MetricDataQueries': batch,
+        'StartTime': start_time,
+        'EndTime': end_time,
+        'ScanBy': 'TimestampDescending',
+    }
+    while True:
+        response = cloudwatch.get_metric_data(**params)
+        for result in response.get('MetricDataResults', []):
+            # A query's datapoints can be split across pages
+            timestamps, values = series.setdefault(result['Id'], ([], []))
+            timestamps.extend(result.get('Timestamps', []))
+            values.extend(result.get('Values', []))
+        next_token = response.get('NextToken')
+        if not next_token:
+            return series
+        params['NextToken'] = next_token
 
 
-def fetch_storage_metrics_batch(rds_instances):
-    """Fetch FreeStorageSpace metrics using CloudWatch batch API (get_metric_data)."""
-    cloudwatch = get_optimized_cloudwatch_client('ap-south-1')
+def run_metric_queries(cloudwatch, queries, start_time, end_time, batch_size=MAX_QUERIES_PER_REQUEST,
+                       max_workers=MAX_BATCH_WORKERS):
+    """
+    Run MetricDataQueries with get_metric_data.
+
+    Queries are packed into requests of up to batch_size, which run concurrently on
+    up to max_workers threads. Each request follows NextToken until its results are
+    complete. A request that fails falls back to one get_metric_statistics call per query.
+
+    Returns:
+        {query_id: (timestamps, values)}, newest datapoint first. Queries without data
+        are missing or have empty lists.
+    """
+    batches = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+    if not batches:
+        return {}
+
+    def run_batch(batch):
+        try:
+            return _run_metric_batch(cloudwatch, batch, start_time, end_time)
+        except Exception as e:
+            print(f"Error fetching batch metrics: {e}")
+            series = {}
+            for query in batch:
+                try:
+                    series[query['Id']] = fetch_query_individually(cloudwatch, query, start_time, end_time)
+                except Exception as individual_e:
+                    dimension = query['MetricStat']['Metric']['Dimensions'][0]['Value']
+                    print(f"Error fetching metrics for {dimension}: {individual_e}")
+            return series
+
+    series = {}
+    if len(batches) == 1:
+        series.update(run_batch(batches[0]))
+        return series
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+        for batch_series in executor.map(run_batch, batches):
+            series.update(batch_series)
+    return series
+
+
+def run_cached_metric_queries(cloudwatch, queries, start_time, end_time, cache, scope):
+    """
+    Run MetricDataQueries through a MetricCache: each query only asks CloudWatch for the
+    window after what the cache already holds, and queries fetched within
+    METRIC_CACHE_FRESH_SECONDS are not sent at all.
+
+    Args:
+        cache: MetricCache shared by the run
+        scope: (account, region) the queries belong to, part of every series key
+
+    Returns:
+        {query_id: (timestamps, values)} like run_metric_queries(), newest first, as
+        int64 epoch-second / float64 arrays
+    """
+    from metric_cache import METRIC_CACHE_FRESH_SECONDS, get_series_key, to_epoch
+
+    start = to_epoch(start_time)
+    end = to_epoch(end_time)
+    keys = {}
+    windows = {}
+    for query in queries:
+        key = keys[query['Id']] = get_series_key(scope, query)
+        fetched_until = cache.fetched_until(key)
+        if fetched_until is not None and end - fetched_until < METRIC_CACHE_FRESH_SECONDS:
+            continue
+        # Refetch from the start of the newest cached period, which may have been incomplete
+        period = query['MetricStat']['Period']
+        window_start = start if fetched_until is None else max(start, fetched_until - fetched_until % period)
+        windows.setdefault(window_start, []).append(query)
+
+    if windows:
+        fetched = sum(len(group) for group in windows.values())
+        print(f"[INFO] Metric cache: {len(queries) - fetched} of {len(queries)} series fresh, "
+              f"fetching {fetched} in {len(windows)} windows...")
+    for window_start, group in windows.items():
+        series = run_metric_queries(cloudwatch, group, datetime.utcfromtimestamp(window_start), end_time)
+        for query in group:
+            if query['Id'] in series:
+                cache.update(keys[query['Id']], end, *series[query['Id']])
+
+    # Include the period the window starts in, as CloudWatch does
+    return {query['Id']: cache.get(keys[query['Id']], start - start % query['MetricStat']['Period'])
+            for query in queries}
+
+
+def latest_value(series):
+    """Newest value of a (timestamps, values) series from run_metric_queries, or None."""
+    if not series or not series[1]:
+        return None
+    return series[1][0]
+
+
+def fetch_metrics_batch_for_region(region, rds_instances, account=None, performance_metrics=None, storage_instances=None,
+                                   cache=None, forecast_days=None, trends=None, rightsizing_days=None,
+                                   storage_histories=None):
+    """
+    Fetch FreeStorageSpace and performance metrics for the instances of a single account and region
+    in one batched get_metric_data pass.
+
+    Args:
+        storage_instances: Instances that still need FreeStorageSpace (default: every non-Aurora instance)
+        cache: MetricCache to serve recent datapoints from (default: always query CloudWatch)
+        forecast_days: Days of FreeStorageSpace history to forecast storage exhaustion from (default: no forecast)
+        trends: TrendBuffers by trends.TREND_COLUMNS key to fill with recent history (default: none)
+        rightsizing_days: Days of peak CPU / memory statistics behind the right-sizing signal (default: none)
+        storage_histories: Dict to add the FreeStorageSpace histories to when forecasting, for the
+                           caller to fit once across regions (default: fit this region's here)
+
+    Returns:
+        (metrics, performance) tuple, see fetch_instance_metrics()
+    """
+    cloudwatch = get_optimized_cloudwatch_client(region, account)
     metrics = {}
     end_time = datetime.utcnow()
     start_time = end_time - timedelta(hours=1)
@@ -111,112 +316,297 @@ def fetch_storage_metrics_batch(rds_instances):
             aurora_instances.append(inst)
         else:
             traditional_instances.append(inst)
+    # Aurora volumes grow on demand, so only traditional instances get a forecast or storage trend
+    trends = trends or {}
+    history_days = forecast_days or (FORECAST_DAYS if 'storage' in trends else None)
+    history_instances = traditional_instances if history_days else []
+    if storage_instances is not None:
+        traditional_instances = storage_instances
     
-    # Handle Aurora instances (no storage metrics)
+    # Aurora instances have no FreeStorageSpace; their cluster volume is fetched once per cluster
+    cluster_members = {}
     for inst in aurora_instances:
-        db_id = inst['DBInstanceIdentifier']
-        cluster_id = inst.get('DBClusterIdentifier')
-        if cluster_id:
-            print(f"Aurora instance {db_id} - using cluster-level storage (dynamic)")
-        metrics[db_id] = None
-    
-    if not traditional_instances:
-        return metrics
+        metrics[get_instance_key(inst)] = None
+        if inst.get('DBClusterIdentifier'):
+            cluster_members.setdefault(inst['DBClusterIdentifier'], []).append(get_instance_key(inst))
     
-    print(f"[INFO] Fetching metrics for {len(traditional_instances)} traditional RDS instances using batch API...")
+    if not traditional_instances and not cluster_members and not performance_metrics and not history_instances \
+            and not trends and not rightsizing_days:
+        return metrics, {}
     
-    # CloudWatch get_metric_data can handle up to 500 metrics per request
-    # We'll batch in groups of 100 to be safe
-    batch_size = 100
+    if traditional_instances:
+        print(f"[INFO] Fetching metrics for {len(traditional_instances)} traditional RDS instances in {region} using batch API...")
+    if cluster_members:
+        print(f"[INFO] Fetching cluster storage for {len(cluster_members)} Aurora clusters "
+              f"({len(aurora_instances)} instances) in {region} using batch API...")
     
-    for i in range(0, len(traditional_instances), batch_size):
-        batch = traditional_instances[i:i + batch_size]
-        
-        # Prepare metric data queries for this batch
-        metric_data_queries = []
-        for idx, inst in enumerate(batch):
-            db_id = inst['DBInstanceIdentifier']
-            metric_data_queries.append({
-                'Id': f'metric_{idx}',
-                'MetricStat': {
-                    'Metric': {
-                        'Namespace': 'AWS/RDS',
-                        'MetricName': 'FreeStorageSpace',
-                        'Dimensions': [
-                            {'Name': 'DBInstanceIdentifier', 'Value': db_id}
-                        ]
-                    },
-                    'Period': 3600,
-                    'Stat': 'Average',
-                    'Unit': 'Bytes'
-                },
-                'ReturnData': True
-            })
-        
-        try:
-            # Make batch request
-            response = cloudwatch.get_metric_data(
-                MetricDataQueries=metric_data_queries,
-                StartTime=start_time,
-                EndTime=end_time
-            )
-            
-            # Process results
-            for idx, inst in enumerate(batch):
-                db_id = inst['DBInstanceIdentifier']
-                metric_id = f'metric_{idx}'
-                
-                # Find the corresponding metric result
-                metric_result = None
-                for result in response.get('MetricDataResults', []):
-                    if result['Id'] == metric_id:
-                        metric_result = result
-                        break
-                
-                if metric_result and metric_result.get('Values'):
-                    # Use the latest value
-                    metrics[db_id] = metric_result['Values'][-1]
-                else:
-                    metrics[db_id] = None
-                    
-        except Exception as e:
-            print(f"Error fetching batch metrics: {e}")
-            # Fall back to individual metrics for this batch
-            for inst in batch:
-                db_id = inst['DBInstanceIdentifier']
-                try:
-                    response = cloudwatch.get_metric_statistics(
-                        Namespace='AWS/RDS',
-                        MetricName='FreeStorageSpace',
-                        Dimensions=[{'Name': 'DBInstanceIdentifier', 'Value': db_id}],
-                        StartTime=start_time,
-                        EndTime=end_time,
-                        Period=3600,
-                        Statistics=['Average'],
-                        Unit='Bytes',
-                    )
-                    datapoints = response.get('Datapoints', [])
-                    if datapoints:
-                        metrics[db_id] = sorted(datapoints, key=lambda x: x['Timestamp'])[-1]['Average']
-                    else:
-                        metrics[db_id] = None
-                except Exception as individual_e:
-                    print(f"Error fetching metrics for {db_id}: {individual_e}")
-                    metrics[db_id] = None
+    # One query per instance and metric, and one per Aurora cluster; query ids map
+    # results back to instances without scanning
+    query_keys = {}
+    queries = []
+    for idx, inst in enumerate(traditional_instances):
+        query_id = f'metric_{idx}'
+        query_keys[query_id] = ([get_instance_key(inst)], None)
+        queries.append(build_metric_query(query_id, 'FreeStorageSpace', 'DBInstanceIdentifier',
+                                          inst['DBInstanceIdentifier'], unit='Bytes'))
+    for idx, (cluster_id, member_keys) in enumerate(cluster_members.items()):
+        query_id = f'cluster_{idx}'
+        query_keys[query_id] = (member_keys, AURORA_VOLUME_KEY)
+        queries.append(build_metric_query(query_id, 'VolumeBytesUsed', 'DBClusterIdentifier', cluster_id, unit='Bytes'))
+    for idx, inst in enumerate(rds_instances if performance_metrics else []):
+        for metric_idx, metric_key in enumerate(performance_metrics):
+            query_id = f'perf_{idx}_{metric_idx}'
+            query_keys[query_id] = ([get_instance_key(inst)], metric_key)
+            queries.append(build_metric_query(query_id, PERFORMANCE_METRICS[metric_key], 'DBInstanceIdentifier',
+                                              inst['DBInstanceIdentifier']))
+
+    if cache is None:
+        series = run_metric_queries(cloudwatch, queries, start_time, end_time)
+    else:
+        series = run_cached_metric_queries(cloudwatch, queries, start_time, end_time, cache, (account, region))
+    performance = {}
+    for query_id, (instance_keys, metric_key) in query_keys.items():
+        value = latest_value(series.get(query_id))
+        for instance_key in instance_keys:
+            if metric_key is None:
+                metrics[instance_key] = value
+            else:
+                performance.setdefault(instance_key, {})[metric_key] = value
+
+    if history_instances:
+        histories = fetch_storage_history(cloudwatch, history_instances, end_time, history_days, cache, (account, region))
+        if forecast_days:
+            if storage_histories is None:
+                add_storage_forecast(performance, histories)
+            else:
+                storage_histories.update(histories)
+        if 'storage' in trends:
+            # Used rather than free space, so a rising line means the volume is filling up
+            allocated = {get_instance_key(inst): (inst.get('AllocatedStorage') or 0) * 1024**3
+                         for inst in history_instances}
+            for instance_key, (_, values) in histories.items():
+                trends['storage'].replace(instance_key, [allocated[instance_key] - value for value in reversed(values)])
+    if 'cpu' in trends:
+        cpu_histories = fetch_metric_history(cloudwatch, rds_instances, 'CPUUtilization',
+                                             end_time - timedelta(hours=trends['cpu'].points), end_time,
+                                             period=3600, cache=cache, scope=(account, region))
+        for instance_key, (_, values) in cpu_histories.items():
+            trends['cpu'].replace(instance_key, reversed(values))
+    if rightsizing_days:
+        peaks = fetch_peak_statistics(cloudwatch, rds_instances, end_time, rightsizing_days)
+        for inst in rds_instances:
+            instance_key = get_instance_key(inst)
+            instance_peaks = peaks.get(instance_key, {})
+            signal, suggested_class = compute_rightsizing(inst.get('DBInstanceClass'), instance_peaks)
+            performance.setdefault(instance_key, {}).update(instance_peaks)
+            performance[instance_key][RIGHTSIZING_KEY] = signal
+            performance[instance_key][RIGHTSIZING_CLASS_KEY] = suggested_class
     
-    return metrics
+    return metrics, performance
+
+
+def fetch_peak_statistics(cloudwatch, rds_instances, end_time, days):
+    """
+    Fetch the PEAK_STATISTICS of the instances of one account and region over the last `days`.
+
+    Each statistic is one query whose period spans the whole window, so it comes back as
+    a single datapoint; the queries are packed into GetMetricData requests like any other.
+
+    Returns:
+        {instance_key: {PEAK_STATISTICS key: value or None}}
+    """
+    # Windows aligned to the hour are the cheapest for CloudWatch to aggregate
+    end_time = end_time.replace(minute=0, second=0, microsecond=0)
+    start_time = end_time - timedelta(days=days)
+    print(f"[INFO] Fetching {days}-day peak statistics for {len(rds_instances)} instances "
+          f"({len(rds_instances) * len(PEAK_STATISTICS)} queries)...")
+    queries = []
+    query_keys = {}
+    for idx, inst in enumerate(rds_instances):
+        for stat_idx, (peak_key, (metric_name, stat)) in enumerate(PEAK_STATISTICS.items()):
+            query_id = f'peak_{idx}_{stat_idx}'
+            query_keys[query_id] = (get_instance_key(inst), peak_key)
+            queries.append(build_metric_query(query_id, metric_name, 'DBInstanceIdentifier', inst['DBInstanceIdentifier'],
+                                              stat=stat, period=days * 86400))
+    series = run_metric_queries(cloudwatch, queries, start_time, end_time)
+    peaks = {}
+    for query_id, (instance_key, peak_key) in query_keys.items():
+        peaks.setdefault(instance_key, {})[peak_key] = latest_value(series.get(query_id))
+    return peaks
+
+
+def fetch_storage_history(cloudwatch, rds_instances, end_time, days, cache=None, scope=None):
+    """
+    Fetch FreeStorageSpace history at FORECAST_PERIOD resolution for the instances of one account and region.
+
+    Returns:
+        {instance_key: (timestamps in epoch seconds, values)}, see fetch_metric_history()
+    """
+    return fetch_metric_history(cloudwatch, rds_instances, 'FreeStorageSpace', start_time=end_time - timedelta(days=days),
+                                end_time=end_time, period=FORECAST_PERIOD, unit='Bytes', cache=cache, scope=scope)
+
+
+def fetch_metric_history(cloudwatch, rds_instances, metric_name, start_time, end_time, period, unit=None,
+                         cache=None, scope=None):
+    """
+    Fetch the history of one AWS/RDS metric for the instances of one account and region.
 
+    Returns:
+        {instance_key: (timestamps in epoch seconds, values)}, newest first, as int64 / float64
+        arrays like MetricCache.get() returns them
+    """
+    from array import array
+    from metric_cache import to_epoch
 
-def fetch_storage_metrics(rds_instances):
+    queries = [build_metric_query(f'history_{idx}', metric_name, 'DBInstanceIdentifier',
+                                  inst['DBInstanceIdentifier'], period=period, unit=unit)
+               for idx, inst in enumerate(rds_instances)]
+    if cache is None:
+        series = run_metric_queries(cloudwatch, queries, start_time, end_time)
+        series = {query_id: (array('q', [to_epoch(ts) for ts in timestamps]), array('d', values))
+                  for query_id, (timestamps, values) in series.items()}
+    else:
+        series = run_cached_metric_queries(cloudwatch, queries, start_time, end_time, cache, scope)
+    return {get_instance_key(inst): series[f'history_{idx}']
+            for idx, inst in enumerate(rds_instances) if f'history_{idx}' in series}
+
+
+def run_insights_query(cloudwatch, expression, start_time, end_time, period=3600):
+    """
+    Run a Metrics Insights query with get_metric_data, following NextToken.
+
+    Returns:
+        {label: (timestamps, values)}, newest datapoint first. With a single GROUP BY
+        dimension, the label of each time series is that dimension's value.
+    """
+    series = {}
+    params = {
+        'MetricDataQueries': [{'Id': 'insights', 'Expression': expression, 'Period': period, 'ReturnData': True}],
+        'StartTime': start_time,
+        'EndTime': end_time,
+        'ScanBy': 'TimestampDescending',
+    }
+    while True:
+        response = cloudwatch.get_metric_data(**params)
+        # Every time series of the query comes back as its own result with the query's Id
+        for result in response.get('MetricDataResults', []):
+            timestamps, values = series.setdefault(result.get('Label', ''), ([], []))
+            timestamps.extend(result.get('Timestamps', []))
+            values.extend(result.get('Values', []))
+        next_token = response.get('NextToken')
+        if not next_token:
+            return series
+        params['NextToken'] = next_token
+
+
+def fetch_metrics_insights_for_region(region, rds_instances, account=None, performance_metrics=None, cache=None,
+                                      forecast_days=None, trends=None, rightsizing_days=None, storage_histories=None):
+    """
+    Fetch FreeStorageSpace for a single account and region with one Metrics Insights query.
+
+    Instances the query does not cover (Aurora, regions with more instances than the
+    Insights series limit, or series cut off by it) go through the per-instance batch
+    path, together with the performance metrics.
+    """
+    traditional_instances = [inst for inst in rds_instances if not inst.get('IsAurora', False)]
+    if len(traditional_instances) > INSIGHTS_MAX_SERIES:
+        print(f"[INFO] {len(traditional_instances)} instances in {region} exceed the Metrics Insights limit "
+              f"of {INSIGHTS_MAX_SERIES} series, using batch API...")
+        return fetch_metrics_batch_for_region(region, rds_instances, account, performance_metrics, cache=cache,
+                                              forecast_days=forecast_days, trends=trends,
+                                              rightsizing_days=rightsizing_days, storage_histories=storage_histories)
+    if not traditional_instances:
+        return fetch_metrics_batch_for_region(region, rds_instances, account, performance_metrics, cache=cache,
+                                              forecast_days=forecast_days, trends=trends,
+                                              rightsizing_days=rightsizing_days, storage_histories=storage_histories)
+
+    cloudwatch = get_optimized_cloudwatch_client(region, account)
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(hours=1)
+    expression = ('SELECT AVG(FreeStorageSpace) FROM SCHEMA("AWS/RDS", DBInstanceIdentifier) '
+                  f'GROUP BY DBInstanceIdentifier LIMIT {INSIGHTS_MAX_SERIES}')
+
+    print(f"[INFO] Fetching metrics for {len(traditional_instances)} traditional RDS instances in {region} using Metrics Insights...")
+    try:
+        series = run_insights_query(cloudwatch, expression, start_time, end_time)
+    except Exception as e:
+        print(f"[WARN] Metrics Insights query failed in {region}, using batch API: {e}")
+        return fetch_metrics_batch_for_region(region, rds_instances, account, performance_metrics, cache=cache,
+                                              forecast_days=forecast_days, trends=trends,
+                                              rightsizing_days=rightsizing_days, storage_histories=storage_histories)
+
+    if len(series) >= INSIGHTS_MAX_SERIES:
+        print(f"[WARN] Metrics Insights hit its {INSIGHTS_MAX_SERIES} series limit in {region}, "
+              f"fetching the remaining instances with the batch API")
+
+    metrics = {}
+    remaining = []
+    for inst in traditional_instances:
+        value = latest_value(series.get(inst['DBInstanceIdentifier']))
+        if value is None:
+            remaining.append(inst)
+        else:
+            metrics[get_instance_key(inst)] = value
+    batch_metrics, performance = fetch_metrics_batch_for_region(region, rds_instances, account, performance_metrics,
+                                                                storage_instances=remaining, cache=cache,
+                                                                forecast_days=forecast_days, trends=trends,
+                                                                rightsizing_days=rightsizing_days,
+                                                                storage_histories=storage_histories)
+    metrics.update(batch_metrics)
+    return metrics, performance
+
+
+def fetch_storage_metrics(rds_instances, mode='batch'):
     """Fetch FreeStorageSpace metric for each RDS instance from CloudWatch using optimized batch requests."""
+    return fetch_instance_metrics(rds_instances, mode)[0]
+
+
+def fetch_instance_metrics(rds_instances, mode='batch', performance_metrics=None, use_cache=True, nocache=False,
+                           forecast_days=None, trends=None, rightsizing_days=None):
+    """
+    Fetch FreeStorageSpace and optional performance metrics for each RDS instance in one batched pass.
+
+    Args:
+        rds_instances: Instances to fetch metrics for
+        mode: 'batch' for one query per instance, 'insights' for one Metrics Insights
+              query per account and region (see METRICS_MODES)
+        performance_metrics: PERFORMANCE_METRICS keys to fetch as well
+        use_cache: Serve recent datapoints from the on-disk MetricCache and only ask
+                   CloudWatch for what is missing
+        nocache: Clear the metric cache first
+        forecast_days: Days of FreeStorageSpace history (FORECAST_MIN_DAYS to FORECAST_MAX_DAYS)
+                       to forecast storage exhaustion from, or None for no forecast
+        trends: TrendBuffers by trends.TREND_COLUMNS key (see trends.create_trend_buffers())
+                to fill with recent storage and CPU history for sparklines
+        rightsizing_days: Days (RIGHTSIZING_MIN_DAYS to RIGHTSIZING_MAX_DAYS) of p95 / p99 / peak
+                          CPU and memory statistics to derive a right-sizing signal from, or None
+
+    Returns:
+        (metrics, performance) tuple:
+        - metrics: {instance_key: free storage bytes or None}
+        - performance: {instance_key: {metric_key: latest average or None}}, plus
+          AURORA_VOLUME_KEY (cluster VolumeBytesUsed) for Aurora cluster members and
+          FORECAST_KEY (days until full, None if not filling up) when forecasting, and the
+          PEAK_STATISTICS keys plus RIGHTSIZING_KEY / RIGHTSIZING_CLASS_KEY with rightsizing_days
+    """
+    cache = None
+    if use_cache:
+        from metric_cache import MetricCache, clear_metric_cache
+        if nocache:
+            clear_metric_cache()
+        cache = MetricCache.load()
     try:
         # Try the optimized batch approach first
-        return fetch_storage_metrics_batch(rds_instances)
+        result = fetch_metrics_batch(rds_instances, mode, performance_metrics, cache, forecast_days, trends,
+                                     rightsizing_days)
+        if cache is not None:
+            cache.save()
+        return result
     except Exception as e:
         print(f"[WARN] Batch metrics failed, falling back to parallel individual requests: {e}")
         
-        # Fallback to the parallel individual approach
-        cloudwatch = get_optimized_cloudwatch_client('ap-south-1')
+        # Fallback to the parallel individual approach (clients are resolved per instance region)
+        cloudwatch = None
         metrics = {}
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(hours=1)
@@ -224,7 +614,7 @@ def fetch_storage_metrics(rds_instances):
         print(f"[INFO] Fetching metrics for {len(rds_instances)} instances in parallel...")
         
         # Use ThreadPoolExecutor to parallelize CloudWatch API calls
-        with ThreadPoolExecutor(max_workers=min(10, len(rds_instances))) as executor:
+        with ThreadPoolExecutor(max_workers=min(MAX_METRIC_WORKERS, len(rds_instances))) as executor:
             # Submit all metric requests simultaneously
             future_to_instance = {
                 executor.submit(fetch_instance_metric, cloudwatch, inst, start_time, end_time): inst
@@ -235,11 +625,24 @@ def fetch_storage_metrics(rds_instances):
             for future in as_completed(future_to_instance):
                 inst = future_to_instance[future]
                 try:
-                    db_id, metric_value = future.result()
-                    metrics[db_id] = metric_value
+                    instance_key, metric_value = future.result()
+                    metrics[instance_key] = metric_value
                 except Exception as e:
                     db_id = inst['DBInstanceIdentifier']
                     print(f"Error processing metrics for {db_id}: {e}")
-                    metrics[db_id] = None
+                    metrics[get_instance_key(inst)] = None
+        
+        # One cluster-level request per Aurora cluster, shared by its members
+        clusters = {}
+        for inst in rds_instances:
+            if inst.get('IsAurora', False) and inst.get('DBClusterIdentifier'):
+                cluster = (inst.get('Account'), inst.get('Region') or DEFAULT_REGION, inst['DBClusterIdentifier'])
+                clusters.setdefault(cluster, []).append(get_instance_key(inst))
+        performance = {}
+        for (account, region, cluster_id), member_keys in clusters.items():
+            cloudwatch = get_optimized_cloudwatch_client(region, account)
+            volume_used = fetch_aurora_cluster_storage(cloudwatch, cluster_id, start_time, end_time)
+            for instance_key in member_keys:
+                performance[instance_key] = {AURORA_VOLUME_KEY: volume_used}
         
-        return metrics
\ No newline at end of file
+        return metrics, performance
\ No newline at end of file
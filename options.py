@@ -0,0 +1,46 @@
+from typing import List, Optional
+
+# Command-line option values and bounds, kept free of boto3 and the subsystem modules so
+# rds_viewer can validate arguments (and fail on bad ones) without loading them. The
+# subsystem modules re-export these under their usual names.
+
+# Metric fetch modes (--metrics-mode): one query per instance, or one Metrics Insights
+# query per account and region
+METRICS_MODES = ['batch', 'insights']
+
+# Optional per-instance performance metrics (--perf-metrics), fetched in the same
+# GetMetricData requests as FreeStorageSpace; each adds one query per instance
+PERFORMANCE_METRICS = {
+    'cpu': 'CPUUtilization',
+    'memory': 'FreeableMemory',
+    'connections': 'DatabaseConnections',
+    'read_iops': 'ReadIOPS',
+    'write_iops': 'WriteIOPS',
+    'read_throughput': 'ReadThroughput',
+    'write_throughput': 'WriteThroughput',
+    'replica_lag': 'ReplicaLag',
+}
+
+# FreeStorageSpace history used for the forecast (--forecast-days, 0 turns it off)
+FORECAST_DAYS = 14
+FORECAST_MIN_DAYS = 7
+FORECAST_MAX_DAYS = 30
+
+# Look-back window of the peak statistics (--rightsizing DAYS)
+RIGHTSIZING_DAYS = 14
+RIGHTSIZING_MIN_DAYS = 1
+RIGHTSIZING_MAX_DAYS = 63  # CloudWatch keeps 5-minute data for 63 days
+
+
+def parse_performance_metrics(value: Optional[str]) -> List[str]:
+    """Parse a --perf-metrics value ('all' or comma-separated PERFORMANCE_METRICS keys) into a list of keys."""
+    if not value:
+        return []
+    if value.strip().lower() == 'all':
+        return list(PERFORMANCE_METRICS)
+    keys = [key.strip().lower() for key in value.split(',') if key.strip()]
+    unknown = [key for key in keys if key not in PERFORMANCE_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown performance metric(s): {', '.join(unknown)} "
+                         f"(choose from {', '.join(PERFORMANCE_METRICS)} or 'all')")
+    return keys
@@ -0,0 +1,160 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from clients import get_client, set_pool_size
+from fetch import DEFAULT_REGION, get_instance_key
+
+# Performance Insights window shown in the detail pane
+PI_WINDOW_MINUTES = 60
+
+# One load datapoint per 5 minutes: 12 points, one sparkline
+PI_PERIOD_SECONDS = 300
+
+# Wait events and SQL statements listed
+PI_TOP_ITEMS = 10
+
+# Fetched data is shown without refetching for this long, so flipping between rows is instant
+PI_CACHE_TTL_SECONDS = 60
+
+# The selected row must stay put this long before its data is fetched, so holding an
+# arrow key through the list does not fetch every row it passes
+PI_DEBOUNCE_SECONDS = 0.3
+
+# One fetch at a time: only the selected row is ever fetched
+set_pool_size('pi', 1)
+
+
+def is_performance_insights_enabled(inst: Dict) -> bool:
+    return bool(inst.get('PerformanceInsightsEnabled') and inst.get('DbiResourceId'))
+
+
+def fetch_performance_insights(inst: Dict) -> Dict:
+    """
+    Fetch DB load over the last PI_WINDOW_MINUTES, split by wait event, and the top SQL of one instance.
+
+    Returns:
+        {'load': [average active sessions per PI_PERIOD_SECONDS, oldest first],
+         'wait_events': [(name, type, average active sessions)],
+         'top_sql': [(statement, average active sessions)]}, highest load first
+    """
+    pi = get_client('pi', inst.get('Region') or DEFAULT_REGION, inst.get('Account'))
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(minutes=PI_WINDOW_MINUTES)
+    window = {
+        'ServiceType': 'RDS',
+        'Identifier': inst['DbiResourceId'],
+        'StartTime': start_time,
+        'EndTime': end_time,
+    }
+
+    response = pi.get_resource_metrics(MetricQueries=[{'Metric': 'db.load.avg'}], PeriodInSeconds=PI_PERIOD_SECONDS,
+                                       **window)
+    datapoints = []
+    for metric in response.get('MetricList', []):
+        datapoints.extend(metric.get('DataPoints', []))
+    load = [dp.get('Value') or 0.0 for dp in sorted(datapoints, key=lambda dp: dp['Timestamp'])]
+
+    response = pi.describe_dimension_keys(Metric='db.load.avg',
+                                          GroupBy={'Group': 'db.wait_event', 'Limit': PI_TOP_ITEMS}, **window)
+    wait_events = [(key['Dimensions'].get('db.wait_event.name', '?'), key['Dimensions'].get('db.wait_event.type', ''),
+                    key.get('Total', 0.0))
+                   for key in response.get('Keys', [])]
+
+    response = pi.describe_dimension_keys(Metric='db.load.avg',
+                                          GroupBy={'Group': 'db.sql_tokenized', 'Limit': PI_TOP_ITEMS,
+                                                   'Dimensions': ['db.sql_tokenized.statement']}, **window)
+    top_sql = [(key['Dimensions'].get('db.sql_tokenized.statement', '?'), key.get('Total', 0.0))
+               for key in response.get('Keys', [])]
+
+    return {
+        'load': load,
+        'wait_events': sorted(wait_events, key=lambda item: item[2], reverse=True),
+        'top_sql': sorted(top_sql, key=lambda item: item[1], reverse=True),
+    }
+
+
+class PerformanceInsightsLoader:
+    """
+    Lazy, cached Performance Insights data for the detail pane.
+
+    get() never waits on the API: it returns what is cached and, when that is missing
+    or older than the TTL, asks a single background worker for the instance. Only the
+    latest request is kept (rows the cursor has already left are dropped), and it is
+    fetched once the selection has settled for PI_DEBOUNCE_SECONDS. on_update(instance_key)
+    is called from the worker once the data (or the error) is in.
+    """
+
+    def __init__(self, on_update: Optional[Callable[[str], None]] = None, ttl: float = PI_CACHE_TTL_SECONDS,
+                 debounce: float = PI_DEBOUNCE_SECONDS):
+        self.on_update = on_update
+        self.ttl = ttl
+        self.debounce = debounce
+        self.cache = {}  # instance_key -> (fetched_at, data)
+        self.wanted = None  # (instance_key, instance) to fetch next, last request wins
+        self.wanted_since = 0.0  # When the wanted key last changed
+        self.fetching = None  # instance_key being fetched
+        self.condition = threading.Condition()
+        self.worker = None
+
+    def get(self, inst: Dict) -> Tuple[str, Optional[Dict]]:
+        """
+        Cached data of an instance, fetching it in the background if needed.
+
+        Returns:
+            (state, data): state is 'disabled' (Performance Insights is off), 'loading'
+            (data is None or stale) or 'ready'. Failed fetches are cached as {'error': message}.
+        """
+        if not is_performance_insights_enabled(inst):
+            self.cancel()
+            return 'disabled', None
+        key = get_instance_key(inst)
+        with self.condition:
+            fetched_at, data = self.cache.get(key, (None, None))
+            if fetched_at is not None and time.monotonic() - fetched_at < self.ttl:
+                self.wanted = None
+                return 'ready', data
+            if key != self.fetching:
+                if self.wanted is None or self.wanted[0] != key:
+                    self.wanted_since = time.monotonic()
+                self.wanted = (key, inst)
+                if self.worker is None:
+                    # Daemon thread, so quitting never waits on a fetch
+                    self.worker = threading.Thread(target=self._run, daemon=True)
+                    self.worker.start()
+                self.condition.notify()
+            else:
+                self.wanted = None
+        return 'loading', data
+
+    def cancel(self) -> None:
+        """Drop the queued request, e.g. when the detail pane closes. A fetch under way still completes."""
+        with self.condition:
+            self.wanted = None
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while self.wanted is None:
+                    self.condition.wait()
+                # Debounce: wait until the selection has stayed on one row long enough
+                while self.wanted is not None:
+                    remaining = self.wanted_since + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.wanted is None:
+                    continue
+                key, inst = self.wanted
+                self.wanted = None
+                self.fetching = key
+            try:
+                data = fetch_performance_insights(inst)
+            except Exception as e:
+                data = {'error': str(e)}
+            with self.condition:
+                self.cache[key] = (time.monotonic(), data)
+                self.fetching = None
+            if self.on_update is not None:
+                self.on_update(key)
@@ -1,192 +1,72 @@
-import boto3
 import json
-import os
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List
+from collections import Counter
+from typing import Dict, Iterator, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
-from botocore.config import Config
-
-# Cache configuration
-CACHE_FILE = "/tmp/rds_pricing_cache.json"
-CACHE_DURATION_HOURS = 24  # Cache for 24 hours
-
-# Optimized boto3 configuration
-OPTIMIZED_CONFIG = Config(
-    # Connection pooling - reuse connections
-    max_pool_connections=50,
-    # Retry configuration  
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    # HTTP configuration
-    connect_timeout=10,
-    read_timeout=30
-)
-
-# Thread-local storage for boto3 sessions
-_local = threading.local()
+from accounts import get_registered_accounts
+from clients import get_client, set_pool_size
+from concurrency import SingleFlight
+from fetch import get_instance_key
+from pricing_cache import clear_pricing_cache, open_pricing_cache
+
+# The Pricing API is only served from a few regions
+PRICING_REGION = 'us-east-1'
+
+# Pricing API volumeType of each RDS StorageType
+STORAGE_TYPE_PRICING_NAMES = {
+    "gp3": "General Purpose-GP3",
+    "gp2": "General Purpose",
+    "io1": "Provisioned IOPS",
+    "io2": "Provisioned IOPS-IO2",
+    "magnetic": "Magnetic"
+}
+
+# Region/engine groups fetched concurrently, each paging through its catalog once
+MAX_PRICING_WORKERS = 8
+set_pool_size('pricing', MAX_PRICING_WORKERS)
+
+# Pricing API databaseEdition of engines whose catalog covers several editions
+PRICING_EDITIONS = {
+    'oracle-ee': 'Enterprise',
+    'oracle-se2': 'Standard Two',
+    'sqlserver-ee': 'Enterprise',
+    'sqlserver-se': 'Standard',
+    'sqlserver-web': 'Web',
+    'sqlserver-ex': 'Express',
+}
+
+# Pricing API licenseModel of each RDS LicenseModel
+PRICING_LICENSE_MODELS = {
+    'license-included': 'License included',
+    'bring-your-own-license': 'Bring your own license',
+    'general-public-license': 'No license required',
+    'postgresql-license': 'No license required',
+}
+
+# Partial fetches query instance classes one by one; beyond this many, one pass over the catalog is cheaper
+PARTIAL_FETCH_MAX_INSTANCE_TYPES = 5
+
+# productFamily of the storage and IOPS records; throughput records are recognized by usage type
+STORAGE_PRODUCT_FAMILY = "Database Storage"
+IOPS_PRODUCT_FAMILY = "Provisioned IOPS"
+
+def get_pricing_account():
+    """Account whose credentials are used for the Pricing API (None for the default credentials)."""
+    # Prices are the same for every account, so any registered account will do
+    accounts = get_registered_accounts()
+    return accounts[0] if accounts else None
 
 def get_optimized_pricing_client():
-    """Get thread-local optimized pricing client with connection pooling."""
-    if not hasattr(_local, 'pricing_client'):
-        # Create a new session with optimized configuration
-        session = boto3.Session()
-        _local.pricing_client = session.client('pricing', 
-                                             region_name='us-east-1',
-                                             config=OPTIMIZED_CONFIG)
-    return _local.pricing_client
+    """Get the shared Pricing API client."""
+    return get_client('pricing', PRICING_REGION, get_pricing_account())
 
 
-def tuple_to_key(tuple_key):
-    """Convert tuple key to string for JSON serialization."""
-    return f"{tuple_key[0]}|{tuple_key[1]}|{tuple_key[2]}"
-
-
-def key_to_tuple(string_key):
-    """Convert string key back to tuple for internal use."""
-    parts = string_key.split("|")
-    return (parts[0], parts[1], parts[2])
-
-
-def clear_pricing_cache():
-    """Delete the pricing cache file if it exists."""
-    try:
-        if os.path.exists(CACHE_FILE):
-            os.remove(CACHE_FILE)
-            print("[INFO] Pricing cache cleared.")
-            return True
-        else:
-            print("[INFO] No pricing cache file found.")
-            return False
-    except Exception as e:
-        print(f"[WARN] Error clearing cache: {e}")
-        return False
-
-
-def load_cached_pricing(nocache=False):
-    """Load pricing data from cache if it exists and is valid."""
-    if nocache:
-        clear_pricing_cache()
-        return None
-        
-    try:
-        if not os.path.exists(CACHE_FILE):
-            return None
-
-        with open(CACHE_FILE, "r") as f:
-            cache_data = json.load(f)
-
-        # Check if cache is still valid
-        cache_time = datetime.fromisoformat(cache_data["timestamp"])
-        if datetime.now() - cache_time > timedelta(hours=CACHE_DURATION_HOURS):
-            print("[INFO] Pricing cache expired, fetching fresh data...")
-            return None
-
-        # Convert string keys back to tuples
-        prices = {}
-        for string_key, price in cache_data["prices"].items():
-            tuple_key = key_to_tuple(string_key)
-            prices[tuple_key] = price
-
-        print("[INFO] Using cached pricing data...")
-        return prices
-    except Exception as e:
-        print(f"[WARN] Error loading cache: {e}")
-        return None
-
-
-def save_cached_pricing(prices):
-    """Save pricing data to cache."""
-    try:
-        # Convert tuple keys to strings for JSON serialization
-        serializable_prices = {}
-        for tuple_key, price in prices.items():
-            string_key = tuple_to_key(tuple_key)
-            serializable_prices[string_key] = price
-
-        cache_data = {
-            "timestamp": datetime.now().isoformat(),
-            "prices": serializable_prices,
-        }
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache_data, f, indent=2)
-        print("[INFO] Pricing data cached successfully.")
-    except Exception as e:
-        print(f"[WARN] Error saving cache: {e}")
-
-
-def get_rds_pricing_data_optimized(region: str, engine: str, instance_types: set, data_type: str) -> List[Dict]:
+def iter_rds_pricing_data(region: str = "ap-south-1", engine: str = "MySQL", filters: List[Dict] = None) -> Iterator[Dict]:
     """
-    Optimized pricing data fetch with aggressive filtering and smaller result sets.
-    """
-    client = get_optimized_pricing_client()
-    
-    # Base filters for instance data
-    base_filters = [
-        {"Type": "TERM_MATCH", "Field": "regionCode", "Value": region},
-        {"Type": "TERM_MATCH", "Field": "databaseEngine", "Value": engine},
-    ]
-    
-    pricing_data = []
-    next_token = None
-    max_results = 50  # Smaller result sets for faster processing
-    
-    while True:
-        # Build request parameters
-        params = {
-            "ServiceCode": "AmazonRDS",
-            "Filters": base_filters,
-            "MaxResults": max_results
-        }
-        if next_token:
-            params["NextToken"] = next_token
+    Stream RDS pricing records page by page, one record per on-demand price dimension.
+    Records include all components (instance, storage, IOPS, throughput, etc.) unless
+    filters narrow the query down.
 
-        # Make API call
-        response = client.get_products(**params)
-        
-        # Process current page with early filtering
-        for product_json in response["PriceList"]:
-            product = json.loads(product_json)
-            attributes = product.get("product", {}).get("attributes", {})
-            
-            # Early filtering by instance type to reduce processing
-            instance_type = attributes.get("instanceType", "")
-            if instance_type and instance_type not in instance_types:
-                continue
-            
-            usage_type = attributes.get("usagetype", "").lower()
-            
-            # Get all pricing terms
-            terms = product.get("terms", {}).get("OnDemand", {})
-            for term_data in terms.values():
-                for price_dim in term_data.get("priceDimensions", {}).values():
-                    price_info = {
-                        "Description": price_dim.get("description"),
-                        "UsageType": usage_type,
-                        "Price (USD)": price_dim["pricePerUnit"].get("USD", "N/A"),
-                        "Unit": price_dim.get("unit", ""),
-                        "StorageType": attributes.get("volumeType", ""),
-                        "DeploymentOption": attributes.get("deploymentOption", ""),
-                        "Engine": attributes.get("databaseEngine", ""),
-                        "Region": attributes.get("regionCode", ""),
-                        "InstanceType": instance_type,
-                    }
-                    pricing_data.append(price_info)
-        
-        # Check for more pages - but limit to reasonable amount
-        next_token = response.get("NextToken")
-        if not next_token or len(pricing_data) > 1000:  # Safety limit
-            break
-
-    return pricing_data
-
-
-def get_rds_pricing_data(region: str = "ap-south-1", engine: str = "MySQL", filters: List[Dict] = None) -> List[Dict]:
-    """
-    Fetch RDS pricing information based on provided filters.
-    Returns raw pricing data that includes all components (storage, IOPS, throughput, etc.)
-    for different storage types (gp3, io1, io2, etc.) and deployment modes.
-    
     Args:
         region: AWS region code (e.g., ap-south-1)
         engine: Database engine (e.g., MySQL, PostgreSQL)
@@ -205,7 +85,6 @@ def get_rds_pricing_data(region: str = "ap-south-1", engine: str = "MySQL", filt
     if filters:
         base_filters.extend(filters)
 
-    pricing_data = []
     next_token = None
 
     while True:
@@ -231,109 +110,70 @@ def get_rds_pricing_data(region: str = "ap-south-1", engine: str = "MySQL", filt
             terms = product.get("terms", {}).get("OnDemand", {})
             for term_data in terms.values():
                 for price_dim in term_data.get("priceDimensions", {}).values():
-                    price_info = {
+                    yield {
                         "Description": price_dim.get("description"),
                         "UsageType": usage_type,
                         "Price (USD)": price_dim["pricePerUnit"].get("USD", "N/A"),
                         "Unit": price_dim.get("unit", ""),
                         # Include additional attributes that might be useful
+                        "ProductFamily": product.get("product", {}).get("productFamily", ""),
+                        "DatabaseEdition": attributes.get("databaseEdition", ""),
+                        "LicenseModel": attributes.get("licenseModel", ""),
                         "StorageType": attributes.get("volumeType", ""),
                         "DeploymentOption": attributes.get("deploymentOption", ""),
                         "Engine": attributes.get("databaseEngine", ""),
                         "Region": attributes.get("regionCode", ""),
                         "InstanceType": attributes.get("instanceType", ""),
                     }
-                    pricing_data.append(price_info)
 
         # Check for more pages
         next_token = response.get("NextToken")
         if not next_token:
             break
 
-    return pricing_data
 
+def get_rds_pricing_data(region: str = "ap-south-1", engine: str = "MySQL", filters: List[Dict] = None) -> List[Dict]:
+    """
+    Fetch RDS pricing information based on provided filters.
+    Returns raw pricing data that includes all components (storage, IOPS, throughput, etc.)
+    for different storage types (gp3, io1, io2, etc.) and deployment modes.
+    """
+    return list(iter_rds_pricing_data(region, engine, filters))
 
-def parse_pricing_components(pricing_data, instance_class, storage_type, allocated_storage, iops):
-    """Parse pricing data to extract instance, storage, and IOPS costs."""
-    instance_price = 0
-    storage_price_per_gb = 0
-    iops_price_per_iop = 0
-    storage_cost_monthly = 0
-    iops_cost_monthly = 0
-    
-    print(f"[DEBUG] Parsing pricing for {instance_class}, storage: {storage_type}, allocated: {allocated_storage}GB, IOPS: {iops}")
-    print(f"[DEBUG] Total pricing items to examine: {len(pricing_data)}")
-    
-    for i, item in enumerate(pricing_data):
-        description = item.get("Description", "").lower()
-        usage_type = item.get("UsageType", "").lower()
-        price_str = item.get("Price (USD)", "0")
-        unit = item.get("Unit", "").lower()
-        item_instance_type = item.get("InstanceType", "")
-        item_storage_type = item.get("StorageType", "")
-        
-        # Debug: Print first few items to understand the data structure
-        if i < 5:
-            print(f"[DEBUG] Item {i}: Description='{item.get('Description', '')}', "
-                  f"UsageType='{item.get('UsageType', '')}', "
-                  f"Price='{price_str}', Unit='{item.get('Unit', '')}', "
-                  f"InstanceType='{item_instance_type}', "
-                  f"StorageType='{item_storage_type}'")
-        
-        # Skip if price is not available
-        if price_str == "N/A" or not price_str:
-            continue
-            
-        try:
-            price = float(price_str)
-        except ValueError:
-            continue
-        
-        if price <= 0:
-            continue
-        
-        # Instance pricing (hourly) - be more flexible with matching
-        if (item_instance_type == instance_class and 
-            ("hour" in unit or "hrs" in unit)):
-            instance_price = price
-            print(f"[DEBUG] Found instance price: ${price}/hr for {instance_class}")
-        
-        # Storage pricing (monthly per GB) - be more flexible
-        elif (("storage" in description or storage_type.lower() in description) and
-              "gb" in unit and "month" in unit and
-              (not item_storage_type or item_storage_type.lower() == storage_type.lower())):
-            storage_price_per_gb = price
-            storage_cost_monthly = storage_price_per_gb * allocated_storage
-            print(f"[DEBUG] Found storage price: ${price}/GB-month for {storage_type}")
-        
-        # IOPS pricing (monthly per IOPS) - be more flexible
-        elif (("iops" in description or "piops" in usage_type or "provisioned" in description) and
-              ("iops" in unit or "provisioned" in unit) and "month" in unit):
-            iops_price_per_iop = price
-            if iops and iops > 0:
-                # For gp3 volumes, the first 3,000 IOPS are included for free
-                if storage_type.lower() == "gp3" and iops > 3000:
-                    billable_iops = iops - 3000  # Only charge for IOPS above the free baseline
-                    iops_cost_monthly = iops_price_per_iop * billable_iops
-                elif storage_type.lower() == "gp3" and iops <= 3000:
-                    iops_cost_monthly = 0  # All IOPS are within the free baseline
-                else:
-                    # For io1, io2, and other storage types, charge for all IOPS
-                    iops_cost_monthly = iops_price_per_iop * iops
-            print(f"[DEBUG] Found IOPS price: ${price}/IOPS-month")
-    
-    print(f"[DEBUG] Final prices - Instance: ${instance_price}, Storage: ${storage_cost_monthly/730:.4f}/hr, IOPS: ${iops_cost_monthly/730:.4f}/hr")
-    
-    return {
-        "instance": instance_price,  # Already hourly
-        "storage": storage_cost_monthly / 730 if storage_cost_monthly > 0 else 0,  # Convert monthly to hourly
-        "iops": iops_cost_monthly / 730 if iops_cost_monthly > 0 else 0,  # Convert monthly to hourly
-        "total": instance_price + (storage_cost_monthly / 730) + (iops_cost_monthly / 730)
-    }
 
+def classify_pricing_records(records, instance_types: set):
+    """
+    Sort pricing records into the datasets PriceIndex takes, in one pass.
+
+    Instance records are kept only for the given instance types; storage and IOPS records
+    are recognized by productFamily and throughput records by usage type.
+
+    Returns:
+        (instance_data, storage_data, iops_data, throughput_data)
+    """
+    instance_data, storage_data, iops_data, throughput_data = [], [], [], []
+    for item in records:
+        if item["InstanceType"]:
+            if item["InstanceType"] in instance_types:
+                instance_data.append(item)
+        elif item["ProductFamily"] == STORAGE_PRODUCT_FAMILY:
+            storage_data.append(item)
+        elif item["ProductFamily"] == IOPS_PRODUCT_FAMILY:
+            iops_data.append(item)
+        elif "throughput" in item["UsageType"]:
+            throughput_data.append(item)
+    return instance_data, storage_data, iops_data, throughput_data
+
+
+def parse_pricing_components_v2(instance_data, storage_data, iops_data, throughput_data, instance_class, storage_type, allocated_storage, iops, storage_throughput, is_multi_az=False, edition=None, license_model=None):
+    """
+    Parse pricing data from separate datasets for instance, storage, IOPS, and throughput costs.
+    Instance records are limited to the given databaseEdition and licenseModel (see
+    get_pricing_edition); None matches any.
 
-def parse_pricing_components_v2(instance_data, storage_data, iops_data, throughput_data, instance_class, storage_type, allocated_storage, iops, storage_throughput, is_multi_az=False):
-    """Parse pricing data from separate datasets for instance, storage, IOPS, and throughput costs."""
+    Scans every dataset for each call; to price many instances from the same datasets,
+    build a PriceIndex once instead (same results, see benchmarks/pricing_benchmark.py).
+    """
     instance_price = 0
     storage_cost_monthly = 0
     iops_cost_monthly = 0
@@ -354,6 +194,7 @@ def parse_pricing_components_v2(instance_data, storage_data, iops_data, throughp
         if (item_instance_type == instance_class and 
             ("hour" in unit or "hrs" in unit) and
             deployment_matches and
+            _matches_edition(item, edition, license_model) and
             price_str != "N/A" and price_str):
             try:
                 price = float(price_str)
@@ -364,16 +205,7 @@ def parse_pricing_components_v2(instance_data, storage_data, iops_data, throughp
                 continue
     
     # Parse storage pricing
-    # Map our storage types to AWS storage type names
-    storage_type_map = {
-        "gp3": "General Purpose-GP3",
-        "gp2": "General Purpose",
-        "io1": "Provisioned IOPS",
-        "io2": "Provisioned IOPS-IO2",
-        "magnetic": "Magnetic"
-    }
-    
-    target_storage_type = storage_type_map.get(storage_type.lower(), storage_type)
+    target_storage_type = STORAGE_TYPE_PRICING_NAMES.get(storage_type.lower(), storage_type)
     
     for item in storage_data:
         description = item.get("Description", "").lower()
@@ -477,6 +309,213 @@ def parse_pricing_components_v2(instance_data, storage_data, iops_data, throughp
     }
 
 
+def _parse_price(item):
+    """USD price of a pricing record as a float, or None if it is missing, malformed or not positive."""
+    price_str = item.get("Price (USD)", "0")
+    if price_str == "N/A" or not price_str:
+        return None
+    try:
+        price = float(price_str)
+    except ValueError:
+        return None
+    return price if price > 0 else None
+
+
+def _matches_edition(item, edition=None, license_model=None):
+    """Whether a pricing record is for the given databaseEdition and licenseModel (None matches any)."""
+    return ((edition is None or item.get("DatabaseEdition", "") == edition) and
+            (license_model is None or item.get("LicenseModel", "") == license_model))
+
+
+def get_pricing_edition(inst):
+    """
+    (databaseEdition, licenseModel) to pick an instance's price by, or None for either
+    when the engine has a single edition or the license model is not known.
+    """
+    return (PRICING_EDITIONS.get((inst.get("Engine") or "").lower()),
+            PRICING_LICENSE_MODELS.get((inst.get("LicenseModel") or "").lower()))
+
+
+def _is_single_az(usage_type):
+    return "multi-az" not in usage_type.lower()
+
+
+class PriceIndex:
+    """
+    Pricing datasets of one region/engine, ingested once for O(1) lookups per instance.
+
+    Gives the same results as parse_pricing_components_v2(): for every component the
+    first matching record in dataset order wins. Instance prices are keyed by
+    (instance type, Multi-AZ) and picked by edition and license model among the few
+    records of each key; storage, IOPS and throughput use Single-AZ rates.
+    """
+
+    def __init__(self, instance_data, storage_data, iops_data, throughput_data):
+        self.instance_prices = {}  # (instance type, is Multi-AZ) -> [(edition, license model, hourly price)]
+        for item in instance_data:
+            unit = item.get("Unit", "").lower()
+            if "hour" not in unit and "hrs" not in unit:
+                continue
+            price = _parse_price(item)
+            if price is not None:
+                key = (item.get("InstanceType", ""), not _is_single_az(item.get("UsageType", "")))
+                self.instance_prices.setdefault(key, []).append(
+                    (item.get("DatabaseEdition", ""), item.get("LicenseModel", ""), price))
+        self.resolved_instance_prices = {}  # (instance type, is Multi-AZ, edition, license model) -> hourly price
+
+        # Storage matches on volume type or on the storage type appearing in the description,
+        # so records are kept in order and each storage type is resolved on first use
+        self.storage_records = []  # (volume type, lowercased description, GB-month price)
+        for item in storage_data:
+            if item.get("Unit", "") == "GB-Mo" and _is_single_az(item.get("UsageType", "")):
+                price = _parse_price(item)
+                if price is not None:
+                    self.storage_records.append((item.get("StorageType", ""), item.get("Description", "").lower(), price))
+        self.storage_prices = {}  # storage type -> GB-month price or None
+
+        self.iops_prices = {}  # 'gp3' or 'io' (io1 and io2) -> IOPS-month price
+        for item in iops_data:
+            usage_type = item.get("UsageType", "").lower()
+            if item.get("Unit", "") != "IOPS-Mo" or not _is_single_az(usage_type):
+                continue
+            price = _parse_price(item)
+            if price is None:
+                continue
+            if "gp3" in usage_type:
+                self.iops_prices.setdefault("gp3", price)
+            if "piops" in usage_type or "io1" in usage_type or "io2" in usage_type:
+                self.iops_prices.setdefault("io", price)
+
+        self.throughput_price = None  # gp3 MiBps-month price
+        for item in throughput_data:
+            usage_type = item.get("UsageType", "").lower()
+            if "gp3-throughput" in usage_type and _is_single_az(usage_type):
+                price = _parse_price(item)
+                if price is not None:
+                    self.throughput_price = price
+                    break
+
+    def storage_price(self, storage_type):
+        """GB-month price of a storage type, or None."""
+        if storage_type not in self.storage_prices:
+            target_storage_type = STORAGE_TYPE_PRICING_NAMES.get(storage_type.lower(), storage_type)
+            needle = storage_type.lower()
+            self.storage_prices[storage_type] = next(
+                (price for volume_type, description, price in self.storage_records
+                 if volume_type == target_storage_type or needle in description), None)
+        return self.storage_prices[storage_type]
+
+    def instance_price(self, instance_class, is_multi_az=False, edition=None, license_model=None):
+        """Hourly price of an instance class for the given edition and license model (None matches any), or 0."""
+        key = (instance_class, bool(is_multi_az), edition, license_model)
+        if key not in self.resolved_instance_prices:
+            self.resolved_instance_prices[key] = next(
+                (price for item_edition, item_license_model, price in self.instance_prices.get(key[:2], [])
+                 if (edition is None or item_edition == edition) and
+                 (license_model is None or item_license_model == license_model)), 0)
+        return self.resolved_instance_prices[key]
+
+    def rate(self, rate_key):
+        """Rate of a key from get_rate_keys(): 0 for instances and None for other products without a price."""
+        product = rate_key[0]
+        if product == "instance":
+            return self.instance_price(*rate_key[1:])
+        if product == "storage":
+            return self.storage_price(rate_key[1])
+        if product == "iops":
+            return self.iops_prices.get(rate_key[1])
+        return self.throughput_price
+
+    def price(self, instance_class, storage_type, allocated_storage, iops, storage_throughput, is_multi_az=False,
+              edition=None, license_model=None):
+        """Hourly cost breakdown of one instance, like parse_pricing_components_v2()."""
+        return calculate_price_breakdown(
+            self.instance_price(instance_class, is_multi_az, edition, license_model), self.storage_price(storage_type),
+            self.iops_prices.get(get_iops_class(storage_type)), self.throughput_price,
+            storage_type, allocated_storage, iops, storage_throughput)
+
+
+def get_iops_class(storage_type):
+    """IOPS rate a storage type is billed at: 'gp3', 'io' (io1 and io2), or None."""
+    storage_type_lower = storage_type.lower()
+    if storage_type_lower == "gp3":
+        return "gp3"
+    if storage_type_lower in ["io1", "io2"]:
+        return "io"
+    return None
+
+
+def get_rate_keys(inst):
+    """
+    Rates an instance's price is calculated from, by product, each keyed by the pricing inputs
+    it depends on: ('instance', class, Multi-AZ, edition, license model), ('storage', storage
+    type), and ('iops', IOPS class) and ('throughput',) when provisioned IOPS or throughput are billed.
+    """
+    storage_type = inst.get("StorageType", "gp3")
+    edition, license_model = get_pricing_edition(inst)
+    rate_keys = {
+        "instance": ("instance", inst["DBInstanceClass"], bool(inst.get("MultiAZ", False)), edition, license_model),
+        "storage": ("storage", storage_type),
+    }
+    iops = inst.get("Iops", 0)
+    iops_class = get_iops_class(storage_type)
+    if iops and iops_class and (iops_class == "io" or iops > 3000):
+        rate_keys["iops"] = ("iops", iops_class)
+    storage_throughput = inst.get("StorageThroughput", 0)
+    if storage_throughput and storage_throughput > 125 and storage_type.lower() == "gp3":
+        rate_keys["throughput"] = ("throughput",)
+    return rate_keys
+
+
+# Rates resolved whenever a whole catalog is read, so instances added later rarely miss one
+COMMON_RATE_KEYS = ([("storage", storage_type) for storage_type in STORAGE_TYPE_PRICING_NAMES] +
+                    [("iops", "gp3"), ("iops", "io"), ("throughput",)])
+
+
+def calculate_price_breakdown(instance_price, storage_price, iops_price, throughput_price, storage_type,
+                              allocated_storage, iops, storage_throughput):
+    """Hourly cost breakdown of one instance from its rates (None for products without a price)."""
+    storage_cost_monthly = 0
+    iops_cost_monthly = 0
+    throughput_cost_monthly = 0
+
+    if storage_price is not None:
+        storage_cost_monthly = storage_price * allocated_storage
+
+    storage_type_lower = storage_type.lower()
+    if iops and iops > 0 and iops_price is not None:
+        if storage_type_lower == "gp3":
+            # The first 3,000 gp3 IOPS are included for free
+            if iops > 3000:
+                iops_cost_monthly = iops_price * (iops - 3000)
+        elif storage_type_lower in ["io1", "io2"]:
+            iops_cost_monthly = iops_price * iops
+
+    # gp3 throughput above the 125 MB/s baseline is billed
+    if (storage_throughput and storage_throughput > 125 and storage_type_lower == "gp3"
+            and throughput_price is not None):
+        throughput_cost_monthly = throughput_price * (storage_throughput - 125)
+
+    return {
+        "instance": instance_price,  # Already hourly
+        "storage": storage_cost_monthly / 730 if storage_cost_monthly > 0 else 0,  # Convert monthly to hourly
+        "iops": iops_cost_monthly / 730 if iops_cost_monthly > 0 else 0,
+        "throughput": throughput_cost_monthly / 730 if throughput_cost_monthly > 0 else 0,
+        "total": instance_price + (storage_cost_monthly / 730) + (iops_cost_monthly / 730) + (throughput_cost_monthly / 730)
+    }
+
+
+def price_instance_from_rates(inst, rates, rate_keys=None):
+    """Hourly cost breakdown of one instance from a {rate key: rate} dict holding its get_rate_keys()."""
+    rate_keys = rate_keys or get_rate_keys(inst)
+    return calculate_price_breakdown(
+        rates[rate_keys["instance"]], rates[rate_keys["storage"]],
+        rates[rate_keys["iops"]] if "iops" in rate_keys else None,
+        rates[rate_keys["throughput"]] if "throughput" in rate_keys else None,
+        inst.get("StorageType", "gp3"), inst.get("AllocatedStorage", 0), inst.get("Iops", 0),
+        inst.get("StorageThroughput", 0))
+
+
 def map_engine_name_for_pricing(engine):
     """
     Map RDS engine names to AWS Pricing API engine names.
@@ -498,99 +537,122 @@ def map_engine_name_for_pricing(engine):
     }
     return engine_mapping.get(engine.lower(), engine)
 
-def fetch_pricing_for_region_engine(region, engine, instances):
-    """Fetch pricing data for a specific region/engine combination."""
+def price_instances(instances, region, engine, instance_pricing_data, storage_pricing_data, iops_pricing_data, throughput_pricing_data):
+    """Price each instance of a region/engine group from the fetched pricing datasets."""
+    index = PriceIndex(instance_pricing_data, storage_pricing_data, iops_pricing_data, throughput_pricing_data)
+    instance_rate_keys = [get_rate_keys(inst) for inst in instances]
+    rates = {key: index.rate(key) for key in {key for rate_keys in instance_rate_keys for key in rate_keys.values()}}
+    return price_instances_from_rates(instances, region, engine, rates, instance_rate_keys)
+
+
+def price_instances_from_rates(instances, region, engine, rates, instance_rate_keys=None):
+    """
+    Price each instance of a region/engine group from a {rate key: rate} dict holding all of
+    their rates; instance_rate_keys optionally gives each instance's get_rate_keys().
+    """
+    result_prices = {}
+    for i, inst in enumerate(instances):
+        price_breakdown = price_instance_from_rates(inst, rates, instance_rate_keys[i] if instance_rate_keys else None)
+        result_prices[(get_instance_key(inst), region, engine)] = price_breakdown
+        if price_breakdown["total"] == 0:
+            print(f"[WARN] No price found for {inst['DBInstanceIdentifier']} ({inst['DBInstanceClass']}) in {region} "
+                  f"(engine: {engine})")
+    return result_prices
+
+
+def fetch_pricing_catalog(region, pricing_engine, filters=None, catalogs=None):
+    """
+    Pricing records of a region and Pricing API engine.
+
+    Callers passing the same catalogs (a SingleFlight) share one download and one record
+    list per (region, pricing engine, filters); without it, the records are streamed.
+    """
+    if catalogs is None:
+        return iter_rds_pricing_data(region, pricing_engine, filters)
+    key = (region, pricing_engine, tuple(tuple(sorted(f.items())) for f in filters or []))
+    return catalogs.do(key, get_rds_pricing_data, region, pricing_engine, filters)
+
+
+def fetch_rates(region, pricing_engine, rate_keys, full=True, catalogs=None):
+    """
+    Look up rates (see get_rate_keys) of one region and Pricing API engine.
+
+    With full, the whole catalog is read in one pass and COMMON_RATE_KEYS are resolved too.
+    Otherwise only the products the keys need are queried: one instanceType query per
+    missing instance class, plus the storage or IOPS product family. Beyond
+    PARTIAL_FETCH_MAX_INSTANCE_TYPES classes, or for throughput, the catalog pass is cheaper.
+
+    Returns:
+        {rate key: rate}, or None when the catalog has no instance prices
+    """
+    instance_types = {key[1] for key in rate_keys if key[0] == "instance"}
+    products = {key[0] for key in rate_keys}
+    if full or "throughput" in products or len(instance_types) > PARTIAL_FETCH_MAX_INSTANCE_TYPES:
+        records = fetch_pricing_catalog(region, pricing_engine, catalogs=catalogs)
+        rate_keys = set(rate_keys).union(COMMON_RATE_KEYS)
+    else:
+        queries = [[{"Type": "TERM_MATCH", "Field": "instanceType", "Value": instance_type}]
+                   for instance_type in sorted(instance_types)]
+        if "storage" in products:
+            queries.append([{"Type": "TERM_MATCH", "Field": "productFamily", "Value": STORAGE_PRODUCT_FAMILY}])
+        if "iops" in products:
+            queries.append([{"Type": "TERM_MATCH", "Field": "productFamily", "Value": IOPS_PRODUCT_FAMILY}])
+        records = [record for filters in queries
+                   for record in fetch_pricing_catalog(region, pricing_engine, filters, catalogs)]
+
+    datasets = classify_pricing_records(records, instance_types)
+    if full and not datasets[0]:
+        return None
+    index = PriceIndex(*datasets)
+    return {key: index.rate(key) for key in rate_keys}
+
+
+def fetch_pricing_for_region_engine(region, engine, instances, catalogs=None, cached_rates=None):
+    """
+    Price a region/engine group from cached rates, fetching only the missing ones.
+
+    Without cached rates for its Pricing API engine, the whole catalog is read (see
+    fetch_rates). Engines that map to the same Pricing API engine (e.g. the sqlserver-*
+    editions) pass the same catalogs to share downloads; see fetch_pricing_catalog.
+
+    Returns:
+        (prices keyed by (instance key, region, engine), {rate key: rate} fetched)
+    """
     pricing_engine = map_engine_name_for_pricing(engine)
-    
-    # Get unique instance types to filter pricing data
-    instance_types = set(inst["DBInstanceClass"] for inst in instances)
-    print(f"[INFO] Fetching pricing for {engine} ({pricing_engine}) in {region}, {len(instance_types)} instance types...")
-    
-    def fetch_data_type(data_type, filters=None):
-        """Helper to fetch specific data type with error handling."""
-        try:
-            if filters is None:
-                filters = []
-            return get_rds_pricing_data(region=region, engine=pricing_engine, filters=filters)
-        except Exception as e:
-            print(f"[WARN] Failed to fetch {data_type} for {engine} in {region}: {e}")
-            return []
+    cached_rates = cached_rates or {}
+    missing = {key for inst in instances for key in get_rate_keys(inst).values() if key not in cached_rates}
+    if not missing:
+        return price_instances_from_rates(instances, region, engine, cached_rates), {}
+
+    if cached_rates:
+        print(f"[INFO] Fetching {len(missing)} missing pricing rates for {engine} ({pricing_engine}) in {region}...")
+    else:
+        instance_types = set(inst["DBInstanceClass"] for inst in instances)
+        print(f"[INFO] Fetching pricing for {engine} ({pricing_engine}) in {region}, {len(instance_types)} instance types...")
     
     try:
-        # Revert to simple parallel approach but with connection pooling
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # Submit all 4 API calls simultaneously
-            future_instance = executor.submit(fetch_data_type, "instance")
-            future_storage = executor.submit(fetch_data_type, "storage", 
-                                           [{"Type": "TERM_MATCH", "Field": "productFamily", "Value": "Database Storage"}])
-            future_iops = executor.submit(fetch_data_type, "iops",
-                                        [{"Type": "TERM_MATCH", "Field": "productFamily", "Value": "Provisioned IOPS"}])
-            future_throughput = executor.submit(fetch_data_type, "throughput", [])
-            
-            # Collect results
-            instance_pricing_data = future_instance.result()
-            storage_pricing_data = future_storage.result()
-            iops_pricing_data = future_iops.result()
-            throughput_pricing_data = future_throughput.result()
-        
-        # Filter results to only relevant instance types to reduce processing time
-        if instance_pricing_data:
-            original_count = len(instance_pricing_data)
-            instance_pricing_data = [
-                item for item in instance_pricing_data 
-                if item.get("InstanceType", "") in instance_types or not item.get("InstanceType")
-            ]
-            print(f"[INFO] Filtered instance records: {len(instance_pricing_data)}/{original_count}")
-        
-        # Filter throughput data
-        throughput_pricing_data = [
-            item for item in throughput_pricing_data 
-            if 'throughput' in item.get('UsageType', '').lower()
-        ]
-        
-        if not instance_pricing_data:
-            print(f"[WARN] No instance pricing data found for {engine} ({pricing_engine}) in {region}")
-            return {(inst["DBInstanceIdentifier"], region, engine): None for inst in instances}
-        
-        # Process each instance in this group
-        result_prices = {}
-        for inst in instances:
-            instance_class = inst["DBInstanceClass"]
-            instance_id = inst["DBInstanceIdentifier"]  # Add instance identifier
-            storage_type = inst.get("StorageType", "gp3")
-            allocated_storage = inst.get("AllocatedStorage", 0)
-            iops = inst.get("Iops", 0)
-            storage_throughput = inst.get("StorageThroughput", 0)
-            is_multi_az = inst.get("MultiAZ", False)
-            
-            # Parse pricing components using separate datasets
-            price_breakdown = parse_pricing_components_v2(
-                instance_pricing_data, storage_pricing_data, iops_pricing_data, throughput_pricing_data,
-                instance_class, storage_type, allocated_storage, iops, storage_throughput, is_multi_az
-            )
-            
-            # Use instance identifier as key to prevent overwriting instances with same class
-            result_prices[(instance_id, region, engine)] = price_breakdown
-            
-            if price_breakdown["total"] == 0:
-                print(f"[WARN] No price found for {instance_id} ({instance_class}) in {region} (engine: {engine})")
-        
-        return result_prices
-                
+        fetched_rates = fetch_rates(region, pricing_engine, missing, full=not cached_rates, catalogs=catalogs)
     except Exception as e:
         print(f"[ERROR] Pricing API failed for {engine} in {region}: {e}")
-        return {(inst["DBInstanceIdentifier"], region, engine): None for inst in instances}
+        return {(get_instance_key(inst), region, engine): None for inst in instances}, {}
+
+    if fetched_rates is None:
+        print(f"[WARN] No instance pricing data found for {engine} ({pricing_engine}) in {region}")
+        return {(get_instance_key(inst), region, engine): None for inst in instances}, {}
+
+    return price_instances_from_rates(instances, region, engine, {**cached_rates, **fetched_rates}), fetched_rates
 
 
 def fetch_rds_pricing(rds_instances, nocache=False):
-    """Fetch live on-demand hourly pricing for each RDS instance type with caching and parallel execution."""
-    # Try to load from cache first (unless nocache is specified)
-    cached_prices = load_cached_pricing(nocache=nocache)
-    if cached_prices is not None:
-        return cached_prices
-
-    # Fetch fresh data from AWS
-    print("[INFO] Fetching fresh pricing data from AWS...")
+    """
+    Price each RDS instance from on-demand rates, with caching and parallel execution.
+
+    Rates are cached per region and Pricing API engine, keyed by the pricing inputs (see
+    get_rate_keys), so new or changed instances only fetch the rates that are missing.
+    """
+    if nocache:
+        clear_pricing_cache()
+    cache = open_pricing_cache()
     prices = {}
     
     # Group instances by region and engine to minimize API calls
@@ -602,30 +664,65 @@ def fetch_rds_pricing(rds_instances, nocache=False):
         if key not in region_engine_groups:
             region_engine_groups[key] = []
         region_engine_groups[key].append(inst)
+    if not region_engine_groups:
+        return prices
     
     print(f"[INFO] Processing {len(region_engine_groups)} unique region/engine combinations in parallel...")
+
+    # Engines sharing a Pricing API engine in a region (aurora and aurora-mysql, the sqlserver-*
+    # and oracle-* editions) share its queries; the others stream theirs
+    pricing_engine_groups = Counter((region, map_engine_name_for_pricing(engine))
+                                    for region, engine in region_engine_groups)
+    catalogs = SingleFlight(remember=True)
     
     # Use ThreadPoolExecutor to parallelize region/engine combinations
-    with ThreadPoolExecutor(max_workers=min(8, len(region_engine_groups))) as executor:
-        # Submit all region/engine combinations for parallel processing
-        future_to_key = {
-            executor.submit(fetch_pricing_for_region_engine, region, engine, instances): (region, engine)
-            for (region, engine), instances in region_engine_groups.items()
-        }
+    with ThreadPoolExecutor(max_workers=min(MAX_PRICING_WORKERS, len(region_engine_groups))) as executor:
+        # Submit all region/engine combinations for parallel processing; the cache is only
+        # used from this thread
+        future_to_key = {}
+        for (region, engine), instances in region_engine_groups.items():
+            slice_key = (region, map_engine_name_for_pricing(engine))
+            cached_rates = {}
+            if cache is not None:
+                try:
+                    cached_rates = cache.get_rates(*slice_key, {key for inst in instances
+                                                                for key in get_rate_keys(inst).values()})
+                except Exception as e:
+                    print(f"[WARN] Error loading cache: {e}")
+            future = executor.submit(fetch_pricing_for_region_engine, region, engine, instances,
+                                     catalogs if pricing_engine_groups[slice_key] > 1 else None, cached_rates)
+            future_to_key[future] = (region, engine)
         
         # Collect results as they complete
+        fetched_slices = {}
         for future in as_completed(future_to_key):
             region, engine = future_to_key[future]
             try:
-                region_prices = future.result()
+                region_prices, fetched_rates = future.result()
                 prices.update(region_prices)
             except Exception as e:
                 print(f"[ERROR] Failed to process {engine} in {region}: {e}")
                 # Add None entries for failed instances
                 instances = region_engine_groups[(region, engine)]
                 for inst in instances:
-                    prices[(inst["DBInstanceIdentifier"], region, engine)] = None
-
-    # Save to cache
-    save_cached_pricing(prices)
+                    prices[(get_instance_key(inst), region, engine)] = None
+                continue
+            if fetched_rates:
+                fetched_slices.setdefault((region, map_engine_name_for_pricing(engine)), {}).update(fetched_rates)
+    if catalogs.shared:
+        print(f"[INFO] Shared Pricing API queries: {catalogs.calls} sent for {catalogs.calls + catalogs.shared} requests")
+
+    if fetched_slices:
+        print(f"[INFO] Fetched {sum(len(rates) for rates in fetched_slices.values())} pricing rates")
+        if cache is not None:
+            try:
+                for (region, pricing_engine), rates in fetched_slices.items():
+                    cache.put_rates(region, pricing_engine, rates)
+                print("[INFO] Pricing data cached successfully.")
+            except Exception as e:
+                print(f"[WARN] Error saving cache: {e}")
+    else:
+        print("[INFO] Using cached pricing data...")
+    if cache is not None:
+        cache.close()
     return prices
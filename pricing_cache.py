@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# Pricing rates live in a SQLite database in WAL mode: every write is one transaction, so
+# a crash never leaves a half-written cache, concurrent runs are serialized by SQLite's
+# own file locks (readers never wait on a writer), and rates are read by primary key
+# without loading the rest of the file.
+PRICING_CACHE_FILE = None  # Default: pricing.sqlite3 in get_cache_dir()
+
+# Bump when the tables change; a database with another version is rebuilt
+PRICING_CACHE_SCHEMA_VERSION = 2
+
+# Rates of a region/engine are refetched this long after its catalog was read
+PRICING_CACHE_HOURS = 24
+
+# Misses (rate 0 or None: no price in the catalog) are looked up again this long after they
+# were stored, so a product that gets a price soon stops being priced at 0
+PRICING_MISS_CACHE_HOURS = 1
+
+# Seconds a write waits for another process holding the database lock
+PRICING_CACHE_LOCK_TIMEOUT = 10
+
+# Rate keys looked up per query, below SQLite's limit on bound parameters
+LOOKUP_BATCH_SIZE = 400
+
+SCHEMA = [
+    "CREATE TABLE slices (region TEXT NOT NULL, engine TEXT NOT NULL, fetched_at REAL NOT NULL,"
+    " PRIMARY KEY (region, engine)) WITHOUT ROWID",
+    "CREATE TABLE rates (region TEXT NOT NULL, engine TEXT NOT NULL, rate_key TEXT NOT NULL, rate REAL,"
+    " stored_at REAL NOT NULL, PRIMARY KEY (region, engine, rate_key)) WITHOUT ROWID",
+]
+
+
+def get_cache_dir() -> str:
+    """Per-user cache directory: $XDG_CACHE_HOME/smart-rds-viewer, ~/.cache/smart-rds-viewer by default."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "smart-rds-viewer")
+
+
+def get_pricing_cache_path() -> str:
+    return PRICING_CACHE_FILE or os.path.join(get_cache_dir(), "pricing.sqlite3")
+
+
+def encode_rate_key(rate_key: Tuple) -> str:
+    """
+    Column value of a rate key (see pricing.get_rate_keys). repr() keeps its str, bool and
+    None parts apart, and is never parsed back: lookups map rows to the keys they asked for.
+    """
+    return repr(rate_key)
+
+
+class PricingCache:
+    """
+    Pricing rates per (region, Pricing API engine) slice, keyed by pricing.get_rate_keys().
+
+    Each slice remembers when its catalog was read; rates of slices older than
+    PRICING_CACHE_HOURS are not returned, nor misses older than PRICING_MISS_CACHE_HOURS.
+    Not thread-safe: use it from one thread.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_pricing_cache_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=PRICING_CACHE_LOCK_TIMEOUT, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # BEGIN IMMEDIATE takes the write lock up front, so two runs creating the schema
+            # at once wait for each other instead of failing halfway
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if version != PRICING_CACHE_SCHEMA_VERSION:
+                    if version:
+                        print("[INFO] Pricing cache format changed, fetching fresh data...")
+                    for (table,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                        connection.execute(f'DROP TABLE "{table}"')
+                    for statement in SCHEMA:
+                        connection.execute(statement)
+                    connection.execute(f"PRAGMA user_version = {PRICING_CACHE_SCHEMA_VERSION}")
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def is_fresh(self, region: str, engine: str) -> bool:
+        """Whether the slice's catalog was read within PRICING_CACHE_HOURS."""
+        row = self.connection.execute("SELECT fetched_at FROM slices WHERE region = ? AND engine = ?",
+                                      (region, engine)).fetchone()
+        return row is not None and time.time() - row[0] <= PRICING_CACHE_HOURS * 3600
+
+    def get_rates(self, region: str, engine: str, rate_keys: Iterable[Tuple]) -> Dict[Tuple, Optional[float]]:
+        """Cached rates of the given keys in a fresh slice; missing and expired keys are left out."""
+        encoded = {encode_rate_key(rate_key): rate_key for rate_key in rate_keys}
+        names = list(encoded)
+        rates = {}
+        # One read transaction: a put_rates() that starts the slice over in between cannot
+        # mix its rows into a freshness check made before it
+        self.connection.execute("BEGIN")
+        try:
+            if not self.is_fresh(region, engine):
+                return {}
+            misses_since = time.time() - PRICING_MISS_CACHE_HOURS * 3600
+            for start in range(0, len(names), LOOKUP_BATCH_SIZE):
+                batch = names[start:start + LOOKUP_BATCH_SIZE]
+                rows = self.connection.execute(
+                    f"SELECT rate_key, rate FROM rates WHERE region = ? AND engine = ? AND rate_key IN "
+                    f"({','.join('?' * len(batch))}) AND (rate != 0 OR stored_at >= ?)",
+                    [region, engine] + batch + [misses_since])
+                for name, rate in rows:
+                    rates[encoded[name]] = rate
+        finally:
+            self.connection.execute("COMMIT")
+        return rates
+
+    def put_rates(self, region: str, engine: str, rates: Dict[Tuple, Optional[float]]) -> None:
+        """
+        Store rates of a slice in one transaction. Rates added to a fresh slice keep its
+        age; otherwise the slice starts over (its old rates are dropped) as of now.
+        """
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            if not self.is_fresh(region, engine):
+                self.connection.execute("DELETE FROM rates WHERE region = ? AND engine = ?", (region, engine))
+                self.connection.execute("INSERT OR REPLACE INTO slices VALUES (?, ?, ?)", (region, engine, now))
+            self.connection.executemany("INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?, ?)",
+                                        [(region, engine, encode_rate_key(rate_key), rate, now)
+                                         for rate_key, rate in rates.items()])
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+
+
+def is_corrupt_database_error(error: sqlite3.DatabaseError) -> bool:
+    """Whether an error means the file is damaged, not merely busy or out of reach."""
+    message = str(error).lower()
+    return "file is not a database" in message or "malformed" in message
+
+
+def open_pricing_cache(path: Optional[str] = None) -> Optional[PricingCache]:
+    """
+    Open the pricing cache, starting a new one if the file is corrupt; None if that fails
+    too, or if another run holds the lock past PRICING_CACHE_LOCK_TIMEOUT.
+    """
+    try:
+        return PricingCache(path)
+    except sqlite3.OperationalError as e:
+        # "database is locked" and the like: another run is using the file, leave it be
+        print(f"[WARN] Pricing cache is unavailable ({e}), continuing without it...")
+        return None
+    except sqlite3.DatabaseError as e:
+        if not is_corrupt_database_error(e):
+            print(f"[WARN] Error opening pricing cache: {e}")
+            return None
+        print(f"[WARN] Pricing cache is unreadable ({e}), starting a new one...")
+        clear_pricing_cache(path)
+    except Exception as e:
+        print(f"[WARN] Error opening pricing cache: {e}")
+        return None
+    try:
+        return PricingCache(path)
+    except Exception as e:
+        print(f"[WARN] Error opening pricing cache: {e}")
+        return None
+
+
+def clear_pricing_cache(path: Optional[str] = None) -> bool:
+    """Delete the pricing cache database if it exists."""
+    path = path or get_pricing_cache_path()
+    try:
+        if os.path.exists(path):
+            # WAL mode keeps recent writes in side files until they are checkpointed
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            print("[INFO] Pricing cache cleared.")
+            return True
+        else:
+            print("[INFO] No pricing cache file found.")
+            return False
+    except Exception as e:
+        print(f"[WARN] Error clearing cache: {e}")
+        return False
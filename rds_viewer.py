@@ -1,50 +1,217 @@
 import sys
 import argparse
-from fetch import fetch_rds_instances, validate_aws_credentials
-from metrics import fetch_storage_metrics
-from pricing import fetch_rds_pricing
-from reserved_instances import fetch_reserved_instances, match_reserved_instances, calculate_effective_pricing
-from backup_maintenance import fetch_backup_maintenance_data
-from ui import display_rds_table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-# Import for version handling
-from importlib.metadata import version
+from options import (FORECAST_DAYS, FORECAST_MAX_DAYS, FORECAST_MIN_DAYS, METRICS_MODES, PERFORMANCE_METRICS,
+                     RIGHTSIZING_DAYS, RIGHTSIZING_MAX_DAYS, RIGHTSIZING_MIN_DAYS, parse_performance_metrics)
+
+# Heavy dependencies (boto3, rich, readchar) and the subsystem modules are imported
+# inside the functions that need them, so --version, --help and argument errors
+# return without loading them. Option values and bounds come from the light options module.
 
 def get_version():
     """Get package version dynamically from metadata"""
+    # Import for version handling
+    from importlib.metadata import version
     try:
         return version("smart-rds-viewer")
     except Exception:
         # Fallback version if package metadata is not available (e.g., during development)
         return "development"
 
+class VersionAction(argparse.Action):
+    """Print the version and exit, looking it up only when --version is given."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=f"smart-rds-viewer {get_version()}\n")
+
+def build_stage_runner(regions, accounts=None, nocache=False, metrics_mode='batch', performance_metrics=None,
+                       forecast_days=None, trends=None, rightsizing_days=None):
+    """
+    Build the data-gathering dependency graph.
+
+    Metrics, pricing, Reserved Instances and backup/maintenance data only depend on
+    the instance list (RIs on nothing at all), so they run in parallel. RI matching
+    waits for instances and RIs, and effective pricing waits for pricing and RI matches.
+    Instances and RIs are fetched for every account, while pricing and RI matching
+    run once over the merged fleet. With the default credentials, validation runs
+    as its own stage alongside the first describe call instead of before it.
+    """
+    from fetch import fetch_rds_instances, validate_aws_credentials
+    from metrics import fetch_instance_metrics
+    from pricing import fetch_rds_pricing
+    from reserved_instances import fetch_reserved_instances, match_reserved_instances, calculate_effective_pricing
+    from backup_maintenance import fetch_backup_maintenance_data
+    from stages import StageRunner
+
+    runner = StageRunner(max_workers=6)
+    if not accounts:
+        runner.add_stage('credentials', validate_aws_credentials, default=False)
+    runner.add_stage('instances', lambda: fetch_rds_instances(regions, accounts), default=[])
+    runner.add_stage('reserved_instances', lambda: fetch_reserved_instances(regions, accounts), default=[])
+    # Storage and performance metrics come from the same batched CloudWatch requests
+    runner.add_stage('metric_data',
+                     lambda instances: fetch_instance_metrics(instances, metrics_mode, performance_metrics, nocache=nocache,
+                                                              forecast_days=forecast_days, trends=trends,
+                                                              rightsizing_days=rightsizing_days),
+                     deps=['instances'], default=({}, {}))
+    runner.add_stage('metrics', lambda metric_data: metric_data[0], deps=['metric_data'], default={})
+    runner.add_stage('performance', lambda metric_data: metric_data[1], deps=['metric_data'], default={})
+    runner.add_stage('pricing', lambda instances: fetch_rds_pricing(instances, nocache=nocache),
+                     deps=['instances'], default={})
+    runner.add_stage('backup_maintenance', lambda instances: fetch_backup_maintenance_data(instances),
+                     deps=['instances'], default=({}, {}))
+    runner.add_stage('ri_matches',
+                     lambda instances, reserved_instances: match_reserved_instances(instances, reserved_instances),
+                     deps=['instances', 'reserved_instances'], default=None)
+    # Without RI matches, fall back to plain on-demand pricing
+    runner.add_stage('effective_pricing',
+                     lambda pricing, ri_matches: calculate_effective_pricing(pricing, ri_matches) if ri_matches else pricing,
+                     deps=['pricing', 'ri_matches'], default={})
+    return runner
+
+def get_prewarm_targets(regions, accounts=None):
+    """Endpoints every run talks to: RDS and CloudWatch per account and region, plus the Pricing API."""
+    from pricing import PRICING_REGION, get_pricing_account
+    targets = [(service, region, account)
+               for account in (accounts or [None])
+               for region in regions
+               for service in ('rds', 'cloudwatch')]
+    targets.append(('pricing', PRICING_REGION, get_pricing_account()))
+    return targets
+
 def main():
     parser = argparse.ArgumentParser(description="RDS Viewer - Display RDS instances with metrics and pricing")
     parser.add_argument("--nocache", action="store_true", 
-                      help="Force fresh data by clearing pricing cache")
-    parser.add_argument("--version", action="version", 
-                      version=f"smart-rds-viewer {get_version()}")
+                      help="Force fresh data by clearing the pricing and metric caches")
+    parser.add_argument("--regions", metavar="REGIONS",
+                      help="Comma-separated AWS regions to scan, or 'all' for every RDS region (default: configured region)")
+    parser.add_argument("--profiles", metavar="PROFILES",
+                      help="Comma-separated AWS profiles to scan, one account per profile")
+    parser.add_argument("--role-arn-file", metavar="FILE",
+                      help="File of IAM role ARNs to assume, one per line with an optional alias")
+    parser.add_argument("--snapshot-out", metavar="FILE",
+                      help="Save everything gathered in this run to a snapshot file")
+    parser.add_argument("--from-snapshot", metavar="FILE",
+                      help="Open a saved snapshot instead of calling AWS")
+    parser.add_argument("--metrics-mode", choices=METRICS_MODES, default=METRICS_MODES[0],
+                      help="CloudWatch fetch: one query per instance (batch) or one Metrics Insights query "
+                           "per account and region (insights, falls back to batch beyond 500 instances)")
+    parser.add_argument("--perf-metrics", metavar="METRICS",
+                      help=f"Comma-separated performance columns to add: {', '.join(PERFORMANCE_METRICS)}, "
+                           "or 'all' (one extra CloudWatch query per instance and metric)")
+    parser.add_argument("--forecast-days", type=int, metavar="DAYS",
+                      help=f"Days of FreeStorageSpace history ({FORECAST_MIN_DAYS}-{FORECAST_MAX_DAYS}) behind the "
+                           f"'Full In' storage forecast, or 0 to hide it (default: {FORECAST_DAYS})")
+    parser.add_argument("--sparklines", action="store_true",
+                      help="Add storage (last 3 days) and CPU (last 12 hours) sparkline columns")
+    parser.add_argument("--rightsizing", type=int, nargs="?", const=RIGHTSIZING_DAYS, metavar="DAYS",
+                      help="Add p95 CPU and a right-sizing suggestion from p95/p99/peak CPU and memory over the "
+                           f"last DAYS days ({RIGHTSIZING_MIN_DAYS}-{RIGHTSIZING_MAX_DAYS}, "
+                           f"default: {RIGHTSIZING_DAYS})")
+    parser.add_argument("--no-prewarm", action="store_true",
+                      help="Do not pre-open connections to AWS endpoints at startup")
+    parser.add_argument("--version", action=VersionAction,
+                      help="show program's version number and exit")
     args = parser.parse_args()
 
-    if not validate_aws_credentials():
-        sys.exit(1)
+    # Validated before anything loads boto3, so bad values fail as fast as unknown flags
+    try:
+        performance_metrics = parse_performance_metrics(args.perf_metrics)
+    except ValueError as e:
+        parser.error(str(e))
+    forecast_days = FORECAST_DAYS if args.forecast_days is None else args.forecast_days
+    if forecast_days and not FORECAST_MIN_DAYS <= forecast_days <= FORECAST_MAX_DAYS:
+        parser.error(f"--forecast-days must be between {FORECAST_MIN_DAYS} and {FORECAST_MAX_DAYS}, or 0")
+    if args.rightsizing is not None and not RIGHTSIZING_MIN_DAYS <= args.rightsizing <= RIGHTSIZING_MAX_DAYS:
+        parser.error(f"--rightsizing must be between {RIGHTSIZING_MIN_DAYS} and {RIGHTSIZING_MAX_DAYS} days")
 
+    if args.from_snapshot:
+        show_snapshot(args.from_snapshot)
+        return
+
+    from accounts import build_account_sessions
+    from fetch import resolve_regions
+    from clients import prewarm_in_background
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    accounts = None
+    if args.profiles or args.role_arn_file:
+        # Resolving each account validates its credentials (STS identity or AssumeRole)
+        try:
+            accounts = build_account_sessions(args.profiles, args.role_arn_file)
+        except OSError as e:
+            print(f"\nError: Could not read role ARN file - {e}")
+            sys.exit(1)
+        if not accounts:
+            print("\nError: None of the requested AWS accounts could be accessed.")
+            sys.exit(1)
+
+    regions = resolve_regions(args.regions)
+    trends = None
+    if args.sparklines:
+        from trends import create_trend_buffers
+        trends = create_trend_buffers()
+    if not args.no_prewarm:
+        # TLS handshakes overlap with the first describe call instead of delaying every stage
+        prewarm_in_background(get_prewarm_targets(regions, accounts))
+    runner = build_stage_runner(regions, accounts=accounts, nocache=args.nocache, metrics_mode=args.metrics_mode,
+                                performance_metrics=performance_metrics, forecast_days=forecast_days or None,
+                                trends=trends, rightsizing_days=args.rightsizing)
     with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
         progress.add_task(description="Fetching RDS metadata...", total=None)
-        rds_instances = fetch_rds_instances()
-        progress.add_task(description="Fetching CloudWatch metrics...", total=None)
-        metrics = fetch_storage_metrics(rds_instances)
-        progress.add_task(description="Fetching pricing info...", total=None)
-        pricing = fetch_rds_pricing(rds_instances, nocache=args.nocache)
-        progress.add_task(description="Fetching Reserved Instances...", total=None)
-        reserved_instances = fetch_reserved_instances()
-        progress.add_task(description="Calculating RI matches and effective pricing...", total=None)
-        ri_matches = match_reserved_instances(rds_instances, reserved_instances)
-        effective_pricing = calculate_effective_pricing(pricing, ri_matches)
-        progress.add_task(description="Fetching backup and maintenance data...", total=None)
-        backup_data, maintenance_data = fetch_backup_maintenance_data(rds_instances)
-    display_rds_table(rds_instances, metrics, effective_pricing, ri_matches, backup_data, maintenance_data)
+        runner.start()
+        # Load the UI modules while the instance list is being fetched
+        from ui import display_rds_table
+        # STS runs concurrently with describe_db_instances; stop early if it rejects the credentials
+        if 'credentials' in runner.stages and not runner.wait_for('credentials'):
+            sys.exit(1)
+        rds_instances = runner.wait_for('instances')
+
+    # Show the table right away; the remaining stages fill in columns as they complete
+    from performance_insights import PerformanceInsightsLoader
+    display_rds_table(rds_instances, stage_runner=runner, performance_columns=performance_metrics,
+                      show_forecast=bool(forecast_days), trends=trends,
+                      show_rightsizing=args.rightsizing is not None, pi_loader=PerformanceInsightsLoader())
+
+    if runner.wait(timeout=0):
+        from clients import format_concurrency_stats
+        print(f"[INFO] Stage timings: {runner.format_timings()}")
+        print(f"[INFO] API concurrency: {format_concurrency_stats()}")
+    elif args.snapshot_out:
+        print(f"[INFO] Waiting for remaining stages before saving snapshot: {', '.join(runner.pending())}")
+        runner.wait()
+    else:
+        from clients import cancel_calls
+        print(f"[INFO] Exited before all stages finished (still running: {', '.join(runner.pending())})")
+        # Stage threads are daemons; failing the remaining API calls lets their worker pools drain
+        runner.cancel()
+        cancel_calls()
+
+    if args.snapshot_out:
+        from snapshot import save_snapshot
+        save_snapshot(args.snapshot_out, runner.results, regions=regions, accounts=accounts,
+                      performance_metrics=performance_metrics, forecast_days=forecast_days or None,
+                      rightsizing_days=args.rightsizing)
+
+def show_snapshot(path):
+    """Open a saved snapshot in the table view without calling AWS."""
+    from snapshot import build_snapshot_runner
+    from ui import display_rds_table
+
+    try:
+        runner, header = build_snapshot_runner(path)
+    except (OSError, ValueError) as e:
+        print(f"\nError: Could not open snapshot - {e}")
+        sys.exit(1)
+    print(f"[INFO] Opening snapshot from {header['created_at']} ({header['instance_count']} instances)")
+    runner.start()
+    display_rds_table(runner.wait_for('instances'), stage_runner=runner,
+                      performance_columns=header.get('performance_metrics'),
+                      show_forecast=bool(header.get('forecast_days')),
+                      show_rightsizing=header.get('rightsizing_days') is not None)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
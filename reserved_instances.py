@@ -1,34 +1,22 @@
-import boto3
-import threading
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
-from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
+from fetch import (get_optimized_rds_client, get_instance_key, resolve_regions, fetch_across_regions,
+                   DEFAULT_REGION, REGION_DISABLED_ERRORS)
 
-# Optimized boto3 configuration
-OPTIMIZED_CONFIG = Config(
-    max_pool_connections=30,
-    retries={'max_attempts': 3, 'mode': 'adaptive'},
-    connect_timeout=10,
-    read_timeout=30
-)
-
-# Thread-local storage for boto3 clients
-_local = threading.local()
-
-def get_optimized_rds_client(region='ap-south-1'):
-    """Get thread-local optimized RDS client with connection pooling."""
-    client_key = f'rds_client_{region}'
-    if not hasattr(_local, client_key):
-        session = boto3.Session()
-        setattr(_local, client_key, session.client('rds', 
-                                                  region_name=region,
-                                                  config=OPTIMIZED_CONFIG))
-    return getattr(_local, client_key)
+def fetch_reserved_instances(regions=None, accounts=None) -> List[Dict]:
+    """
+    Fetch all active Reserved DB Instances across one or more accounts and regions in parallel.
+    
+    Args:
+        regions: Region list, comma-separated string or 'all' (see fetch.resolve_regions)
+        accounts: Account names registered in accounts.py (None for the default credentials)
+    """
+    return fetch_across_regions(fetch_reserved_instances_for_region, resolve_regions(regions), accounts)
 
-def fetch_reserved_instances(region='ap-south-1') -> List[Dict]:
+def fetch_reserved_instances_for_region(region=DEFAULT_REGION, account=None) -> List[Dict]:
     """
-    Fetch all Reserved DB Instances from AWS RDS.
+    Fetch all Reserved DB Instances from AWS RDS for a single account and region.
     
     Returns:
         List of reserved instance dictionaries with details like:
@@ -44,7 +32,7 @@ def fetch_reserved_instances(region='ap-south-1') -> List[Dict]:
         - StartTime
         - Duration
     """
-    rds = get_optimized_rds_client(region)
+    rds = get_optimized_rds_client(region, account)
     reserved_instances = []
     
     try:
@@ -71,15 +59,20 @@ def fetch_reserved_instances(region='ap-south-1') -> List[Dict]:
                         'Duration': ri.get('Duration', 0),
                         'MultiAZ': ri.get('MultiAZ', False),
                         'Region': region,
+                        'Account': account,
                         # Calculate expiry date
                         'ExpiryDate': ri.get('StartTime') + timedelta(seconds=ri.get('Duration', 0)) if ri.get('StartTime') and ri.get('Duration') else None
                     })
         
-        print(f"[INFO] Found {len(reserved_instances)} active Reserved Instances")
+        print(f"[INFO] Found {len(reserved_instances)} active Reserved Instances in {region}")
         return reserved_instances
         
-    except (BotoCoreError, ClientError) as e:
-        print(f"[ERROR] Failed to fetch Reserved Instances: {e}")
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in REGION_DISABLED_ERRORS:
+            print(f"[ERROR] Failed to fetch Reserved Instances in {region}: {e}")
+        return []
+    except BotoCoreError as e:
+        print(f"[ERROR] Failed to fetch Reserved Instances in {region}: {e}")
         return []
 
 def normalize_engine_name(engine: str) -> str:
@@ -360,10 +353,9 @@ def calculate_effective_pricing(pricing_data: Dict, ri_matches: Dict) -> Dict:
     
     # Process each instance with its matched RIs
     for instance, matched_ris, coverage_percent in ri_matches['matches']:
-        instance_id = instance.get('DBInstanceIdentifier')
         region = instance.get('Region')
         engine = instance.get('Engine')
-        pricing_key = (instance_id, region, engine)
+        pricing_key = (get_instance_key(instance), region, engine)
         
         # Get original pricing
         original_pricing = pricing_data.get(pricing_key)
@@ -430,10 +422,9 @@ def calculate_effective_pricing(pricing_data: Dict, ri_matches: Dict) -> Dict:
     
     # Add uncovered instances with original pricing
     for instance in ri_matches['uncovered']:
-        instance_id = instance.get('DBInstanceIdentifier')
         region = instance.get('Region')
         engine = instance.get('Engine')
-        pricing_key = (instance_id, region, engine)
+        pricing_key = (get_instance_key(instance), region, engine)
         
         original_pricing = pricing_data.get(pricing_key)
         if original_pricing:
@@ -0,0 +1,91 @@
+from typing import Dict, Optional, Tuple
+
+from options import RIGHTSIZING_DAYS, RIGHTSIZING_MAX_DAYS, RIGHTSIZING_MIN_DAYS
+from reserved_instances import get_instance_family, get_instance_size_weight
+
+# Statistics fetched per metric over the whole window, one datapoint each: performance key -> (metric, stat).
+# Free memory peaks at its low end, so its p5 / Minimum are the p95 / Maximum of memory in use.
+PEAK_STATISTICS = {
+    'cpu_p95': ('CPUUtilization', 'p95'),
+    'cpu_p99': ('CPUUtilization', 'p99'),
+    'cpu_max': ('CPUUtilization', 'Maximum'),
+    'memory_free_p5': ('FreeableMemory', 'p5'),
+    'memory_free_min': ('FreeableMemory', 'Minimum'),
+}
+
+# Performance keys of the signal: 'down', 'up' or 'ok', and the suggested instance class
+RIGHTSIZING_KEY = 'rightsizing'
+RIGHTSIZING_CLASS_KEY = 'rightsizing_class'
+
+# p95 utilization a resized instance should land at. Databases keep most memory busy as
+# buffer cache, so memory gets a higher target than CPU.
+RIGHTSIZING_CPU_TARGET = 0.6
+RIGHTSIZING_MEMORY_TARGET = 0.9
+
+# At or above any of these, the instance needs a larger size
+UPSIZE_CPU_P95 = 0.8
+UPSIZE_CPU_P99 = 0.95
+UPSIZE_MEMORY_P95 = 0.95
+
+# Memory per unit of get_instance_size_weight() (large = 4 units) by family prefix; longest prefix wins.
+# Families not listed get a CPU-only signal.
+GIB_PER_SIZE_UNIT = {
+    'x2i': 16.0,
+    'x': 8.0,
+    'z': 4.0,
+    'r': 4.0,
+    'm': 2.0,
+    't': 2.0,
+}
+
+# Sizes a suggestion can pick from, smallest first; burstable (t) families also go below large
+RIGHTSIZING_SIZES = ['large', 'xlarge', '2xlarge', '4xlarge', '8xlarge', '12xlarge', '16xlarge', '24xlarge']
+BURSTABLE_SIZES = ['micro', 'small', 'medium', 'large', 'xlarge', '2xlarge']
+
+
+def get_memory_gib(instance_class: str) -> Optional[float]:
+    """Memory of an instance class in GiB, from its size weight, or None for unknown families."""
+    family = get_instance_family(instance_class)
+    for prefix in sorted(GIB_PER_SIZE_UNIT, key=len, reverse=True):
+        if family.startswith(prefix):
+            return GIB_PER_SIZE_UNIT[prefix] * get_instance_size_weight(instance_class)
+    return None
+
+
+def compute_rightsizing(instance_class: str, peaks: Dict) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Right-sizing signal of one instance from its peak statistics (PEAK_STATISTICS keys).
+
+    Demand is measured in size units: p95 CPU (and p95 memory in use, when the family's
+    memory is known) times the class's size weight. The suggestion is the smallest size
+    of the same family that keeps that demand within RIGHTSIZING_CPU_TARGET and
+    RIGHTSIZING_MEMORY_TARGET.
+
+    Returns:
+        (signal, suggested class): signal is 'down', 'up' or 'ok', or None when the class
+        has no size (e.g. db.serverless) or there is no CPU data
+    """
+    parts = (instance_class or '').split('.')
+    cpu_p95 = peaks.get('cpu_p95')
+    if len(parts) != 3 or cpu_p95 is None:
+        return None, None
+    weight = get_instance_size_weight(instance_class)
+    cpu_p95 /= 100
+    cpu_p99 = (peaks.get('cpu_p99') or 0) / 100
+
+    memory_p95 = None
+    memory_gib = get_memory_gib(instance_class)
+    if memory_gib and peaks.get('memory_free_p5') is not None:
+        memory_p95 = max(0.0, 1 - peaks['memory_free_p5'] / (memory_gib * 1024**3))
+    needed = weight * max(cpu_p95 / RIGHTSIZING_CPU_TARGET, (memory_p95 or 0) / RIGHTSIZING_MEMORY_TARGET)
+
+    sizes = BURSTABLE_SIZES if parts[1].startswith('t') else RIGHTSIZING_SIZES
+    candidates = [f'{parts[0]}.{parts[1]}.{size}' for size in sizes]
+    if cpu_p95 >= UPSIZE_CPU_P95 or cpu_p99 >= UPSIZE_CPU_P99 or (memory_p95 or 0) >= UPSIZE_MEMORY_P95:
+        larger = [c for c in candidates if get_instance_size_weight(c) > weight]
+        fits = [c for c in larger if get_instance_size_weight(c) >= needed]
+        return 'up', (fits or larger or [None])[0]
+    fits = [c for c in candidates if get_instance_size_weight(c) >= needed]
+    if fits and get_instance_size_weight(fits[0]) < weight:
+        return 'down', fits[0]
+    return 'ok', None
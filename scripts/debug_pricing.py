@@ -10,7 +10,7 @@ import argparse
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fetch import fetch_rds_instances, validate_aws_credentials
+from fetch import fetch_rds_instances, validate_aws_credentials, get_instance_key
 from pricing import fetch_rds_pricing
 
 def main():
@@ -46,7 +46,7 @@ def main():
     print("\n📊 PRICING RESULTS:")
     
     for inst in rds_instances:
-        key = (inst['DBInstanceIdentifier'], inst['Region'], inst['Engine'])
+        key = (get_instance_key(inst), inst['Region'], inst['Engine'])
         price_info = pricing.get(key)
         
         print(f"\n🏷️  {inst['DBInstanceIdentifier']}:")
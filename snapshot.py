@@ -0,0 +1,228 @@
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# File layout: one JSON header line followed by zlib-compressed JSON sections.
+# The header records each section's (offset, length) so sections are read and
+# decoded independently, only when the stage that needs them runs. A section is
+# decoded whole when its stage runs: the table shows every record of it anyway.
+SNAPSHOT_FORMAT = 'smart-rds-viewer-snapshot'
+SNAPSHOT_VERSION = 2
+
+# Version 1 stored every performance field as 'performance_metrics' and had no
+# forecast / right-sizing settings; its header is translated on load
+SUPPORTED_VERSIONS = (1, SNAPSHOT_VERSION)
+
+
+def _encode_value(value):
+    """JSON fallback for values the json module cannot encode (datetimes from boto3)."""
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__} in snapshot")
+
+
+def _decode_object(obj):
+    """json object_hook restoring datetimes written by _encode_value."""
+    if len(obj) == 1 and '$dt' in obj:
+        return datetime.fromisoformat(obj['$dt'])
+    return obj
+
+
+def encode_records(records: List[Optional[Dict]]) -> Dict:
+    """Encode a list of dicts (or None) as a field list plus one row per record, without repeating keys."""
+    fields = []
+    seen = set()
+    for record in records:
+        if record:
+            for field in record:
+                if field not in seen:
+                    seen.add(field)
+                    fields.append(field)
+    rows = [None if record is None else [record.get(field) for field in fields] for record in records]
+    return {'fields': fields, 'rows': rows}
+
+
+def decode_records(encoded: Dict) -> List[Optional[Dict]]:
+    """Inverse of encode_records."""
+    fields = encoded['fields']
+    return [None if row is None else dict(zip(fields, row)) for row in encoded['rows']]
+
+
+def save_snapshot(path: str, results: Dict, regions: Optional[List[str]] = None,
+                  accounts: Optional[List[str]] = None, performance_metrics: Optional[List[str]] = None,
+                  forecast_days: Optional[int] = None, rightsizing_days: Optional[int] = None) -> None:
+    """
+    Write the results of a run to a snapshot file.
+
+    Args:
+        path: Output file, replaced atomically
+        results: Stage results keyed by stage name: instances, metrics, performance, pricing,
+                 reserved_instances and backup_maintenance. RI matches and effective pricing
+                 are rebuilt from these on load, as the live stage graph derives them.
+        regions: Regions that were scanned, recorded in the header
+        accounts: Accounts that were scanned, recorded in the header
+        performance_metrics: Performance columns the run was configured with (--perf-metrics)
+        forecast_days: Days of history the storage forecast was fitted to, or None without one
+        rightsizing_days: Days behind the right-sizing signal (--rightsizing), or None without one
+    """
+    from fetch import get_instance_key
+
+    instances = results.get('instances') or []
+    metrics = results.get('metrics') or {}
+    performance = results.get('performance') or {}
+    pricing = results.get('pricing') or {}
+    backup_data, maintenance_data = results.get('backup_maintenance') or ({}, {})
+    keys = [get_instance_key(inst) for inst in instances]
+
+    sections = {
+        'instances': encode_records(instances),
+        'metrics': [metrics.get(key) for key in keys],
+        'performance': encode_records([performance.get(key) for key in keys]),
+        'pricing': encode_records([pricing.get((key, inst.get('Region'), inst.get('Engine')))
+                                   for key, inst in zip(keys, instances)]),
+        'reserved_instances': encode_records(results.get('reserved_instances') or []),
+        'backup': encode_records([backup_data.get(key) for key in keys]),
+        'maintenance': encode_records([maintenance_data.get(key) for key in keys]),
+    }
+
+    payloads = []
+    offsets = {}
+    offset = 0
+    for name, section in sections.items():
+        data = zlib.compress(json.dumps(section, separators=(',', ':'), default=_encode_value).encode(), 1)
+        offsets[name] = [offset, len(data)]
+        payloads.append(data)
+        offset += len(data)
+
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.now().astimezone().isoformat(timespec='seconds'),
+        'regions': regions,
+        'accounts': accounts,
+        'instance_count': len(instances),
+        # Columns the run was configured with, so a replay shows the same table
+        'performance_metrics': list(performance_metrics or []),
+        'forecast_days': forecast_days,
+        'rightsizing_days': rightsizing_days,
+        'sections': offsets,
+    }
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header, separators=(',', ':')).encode() + b'\n')
+        for data in payloads:
+            f.write(data)
+    os.replace(tmp_path, path)
+    print(f"[INFO] Saved snapshot of {len(instances)} instances to {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
+
+
+def upgrade_v1_header(header: Dict) -> Dict:
+    """Column settings of a version 1 header, inferred from the performance fields it recorded."""
+    from forecast import FORECAST_DAYS, FORECAST_KEY
+    from options import PERFORMANCE_METRICS, RIGHTSIZING_DAYS
+    from rightsizing import RIGHTSIZING_KEY
+
+    fields = header.get('performance_metrics') or []
+    return {
+        'performance_metrics': [field for field in fields if field in PERFORMANCE_METRICS],
+        'forecast_days': FORECAST_DAYS if FORECAST_KEY in fields else None,
+        'rightsizing_days': RIGHTSIZING_DAYS if RIGHTSIZING_KEY in fields else None,
+    }
+
+
+class SnapshotReader:
+    """Read sections of a snapshot file on demand."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            header_line = f.readline()
+            self.data_start = f.tell()
+        try:
+            self.header = json.loads(header_line)
+        except ValueError:
+            raise ValueError(f"{path} is not a smart-rds-viewer snapshot")
+        if self.header.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a smart-rds-viewer snapshot")
+        if self.header.get('version') not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported snapshot version {self.header.get('version')} (expected {SNAPSHOT_VERSION})")
+        if self.header['version'] == 1:
+            self.header.update(upgrade_v1_header(self.header))
+        self._instances = None
+
+    def read_section(self, name: str, object_hook=None):
+        """Read, decompress and parse a single section."""
+        offset, length = self.header['sections'][name]
+        with open(self.path, 'rb') as f:
+            f.seek(self.data_start + offset)
+            data = zlib.decompress(f.read(length))
+        return json.loads(data, object_hook=object_hook)
+
+    def instances(self) -> List[Dict]:
+        if self._instances is None:
+            self._instances = decode_records(self.read_section('instances'))
+        return self._instances
+
+    def _keys(self):
+        from fetch import get_instance_key
+        return [get_instance_key(inst) for inst in self.instances()]
+
+    def metrics(self) -> Dict:
+        return dict(zip(self._keys(), self.read_section('metrics')))
+
+    def performance(self) -> Dict:
+        # Version 1 snapshots written before performance columns existed have no such section
+        if 'performance' not in self.header['sections']:
+            return {}
+        records = decode_records(self.read_section('performance'))
+        return {key: record for key, record in zip(self._keys(), records) if record is not None}
+
+    def pricing(self) -> Dict:
+        records = decode_records(self.read_section('pricing'))
+        return {(key, inst.get('Region'), inst.get('Engine')): price
+                for key, inst, price in zip(self._keys(), self.instances(), records)}
+
+    def reserved_instances(self) -> List[Dict]:
+        return decode_records(self.read_section('reserved_instances', _decode_object))
+
+    def backup_maintenance(self):
+        keys = self._keys()
+        backup = decode_records(self.read_section('backup', _decode_object))
+        maintenance = decode_records(self.read_section('maintenance', _decode_object))
+        backup_data = {key: info for key, info in zip(keys, backup) if info is not None}
+        maintenance_data = {key: info for key, info in zip(keys, maintenance) if info is not None}
+        return backup_data, maintenance_data
+
+
+def build_snapshot_runner(path: str):
+    """
+    Build a stage graph that replays a snapshot instead of calling AWS.
+
+    The graph mirrors the live one, so the table opens as soon as the instances
+    section is decoded and the other sections fill in as they are read.
+
+    Returns:
+        (runner, header) tuple
+    """
+    from stages import StageRunner
+    from reserved_instances import match_reserved_instances, calculate_effective_pricing
+
+    reader = SnapshotReader(path)
+    runner = StageRunner(max_workers=4)
+    runner.add_stage('instances', reader.instances, default=[])
+    runner.add_stage('reserved_instances', reader.reserved_instances, default=[])
+    runner.add_stage('metrics', lambda instances: reader.metrics(), deps=['instances'], default={})
+    runner.add_stage('performance', lambda instances: reader.performance(), deps=['instances'], default={})
+    runner.add_stage('pricing', lambda instances: reader.pricing(), deps=['instances'], default={})
+    runner.add_stage('backup_maintenance', lambda instances: reader.backup_maintenance(),
+                     deps=['instances'], default=({}, {}))
+    runner.add_stage('ri_matches',
+                     lambda instances, reserved_instances: match_reserved_instances(instances, reserved_instances),
+                     deps=['instances', 'reserved_instances'], default=None)
+    runner.add_stage('effective_pricing',
+                     lambda pricing, ri_matches: calculate_effective_pricing(pricing, ri_matches) if ri_matches else pricing,
+                     deps=['pricing', 'ri_matches'], default={})
+    return runner, reader.header
@@ -0,0 +1,167 @@
+import threading
+import time
+
+
+class StageRunner:
+    """
+    Run data-gathering stages concurrently as a dependency graph.
+
+    Each stage is a callable that receives the results of its dependencies as
+    keyword arguments (named after the dependency stages). A stage starts as
+    soon as all of its dependencies have finished, so independent stages run
+    in parallel. A stage that raises degrades to its default value instead of
+    failing the whole run; its dependents still run with that default.
+
+    Stages run on daemon threads, at most max_workers at a time, so quitting
+    with stages still running does not wait for them (see cancel()).
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+        self.errors = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._stage_events = {}
+        self._started = set()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._cancelled = threading.Event()
+
+    def add_stage(self, name, func, deps=(), default=None):
+        """Register a stage. Dependencies must be registered before running."""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already registered")
+        self.stages[name] = {'func': func, 'deps': tuple(deps), 'default': default}
+        self._stage_events[name] = threading.Event()
+
+    def add_listener(self, callback):
+        """Register callback(name, result) invoked after each stage completes."""
+        self._listeners.append(callback)
+
+    def _validate(self):
+        """Check that every dependency exists and the graph has no cycles."""
+        for name, stage in self.stages.items():
+            for dep in stage['deps']:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle detected at '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name]['deps']:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _ready_stages(self):
+        """Return stages whose dependencies are all finished and that have not started. Caller holds the lock."""
+        ready = []
+        for name, stage in self.stages.items():
+            if name in self._started:
+                continue
+            if all(dep in self.results for dep in stage['deps']):
+                self._started.add(name)
+                ready.append(name)
+        return ready
+
+    def _submit(self, name):
+        threading.Thread(target=self._run_slot, args=(name,), name=f"stage-{name}", daemon=True).start()
+
+    def _run_slot(self, name):
+        with self._slots:
+            if not self._cancelled.is_set():
+                self._run_stage(name)
+
+    def _run_stage(self, name):
+        stage = self.stages[name]
+        kwargs = {dep: self.results[dep] for dep in stage['deps']}
+        start = time.perf_counter()
+        try:
+            result = stage['func'](**kwargs)
+        except Exception as e:
+            print(f"[WARN] Stage '{name}' failed, continuing with empty data: {e}")
+            self.errors[name] = e
+            result = stage['default']
+        duration = time.perf_counter() - start
+
+        with self._lock:
+            self.results[name] = result
+            self.timings[name] = duration
+            ready = self._ready_stages()
+            finished = len(self.results) == len(self.stages)
+        self._stage_events[name].set()
+        if self._cancelled.is_set():
+            return
+
+        for callback in self._listeners:
+            try:
+                callback(name, result)
+            except Exception as e:
+                print(f"[WARN] Stage listener failed for '{name}': {e}")
+
+        for next_name in ready:
+            self._submit(next_name)
+
+        if finished:
+            self._done.set()
+
+    def start(self):
+        """Start running stages in the background and return immediately."""
+        self._validate()
+        if not self.stages:
+            self._done.set()
+            return
+        with self._lock:
+            ready = self._ready_stages()
+        for name in ready:
+            self._submit(name)
+
+    def wait(self, timeout=None):
+        """Block until every stage has finished. Returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """
+        Stop scheduling stages: queued and not-yet-ready stages never start, and stages
+        that are running finish in the background without notifying listeners.
+        """
+        self._cancelled.set()
+
+    def wait_for(self, name, timeout=None):
+        """Block until a single stage has finished and return its result."""
+        self._stage_events[name].wait(timeout)
+        return self.results.get(name, self.stages[name]['default'])
+
+    def is_done(self, name):
+        """Check whether a stage has finished (successfully or not)."""
+        return name in self.results
+
+    def pending(self):
+        """Names of stages that have not finished yet, in registration order."""
+        return [name for name in self.stages if name not in self.results]
+
+    def run(self):
+        """Run all stages and block until they have finished. Returns the results dict."""
+        self.start()
+        self.wait()
+        return self.results
+
+    def format_timings(self):
+        """Format per-stage timings in the order stages were registered."""
+        parts = []
+        for name in self.stages:
+            if name in self.timings:
+                status = " (failed)" if name in self.errors else ""
+                parts.append(f"{name} {self.timings[name]:.2f}s{status}")
+        return ", ".join(parts)
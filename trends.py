@@ -0,0 +1,106 @@
+import threading
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+# Datapoints per sparkline: 12 hours of hourly CPU, 3 days of 6-hourly FreeStorageSpace
+SPARKLINE_POINTS = 12
+SPARKLINE_BLOCKS = '▁▂▃▄▅▆▇█'
+
+# Trends shown as sparkline columns: key -> (header, fixed scale or None to scale each series to its own range)
+TREND_COLUMNS = {
+    'storage': ('Storage\nTrend', None),
+    'cpu': ('CPU\nTrend', (0, 100)),
+}
+
+
+class TrendBuffers:
+    """
+    Fixed-size ring buffers for many series, packed into one float64 array.
+
+    Each series gets a slot of `points` values the first time it is written, so memory
+    grows by a fixed amount per instance however many datapoints pass through. The
+    sparkline of a series is rendered on first read after a write and cached until the
+    next write, so redrawing the table never re-renders unchanged sparklines.
+    """
+
+    def __init__(self, points: int = SPARKLINE_POINTS, scale: Optional[Tuple[float, float]] = None):
+        self.points = points
+        self.scale = scale
+        self.slots = {}  # key -> slot index
+        self.values = array('d')
+        self.heads = array('l')  # next write position per slot
+        self.counts = array('l')  # values held per slot, up to points
+        self.rendered = {}  # key -> cached sparkline
+        self.lock = threading.Lock()
+
+    def _slot(self, key: str) -> int:
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.heads)
+            self.values.extend([0.0] * self.points)
+            self.heads.append(0)
+            self.counts.append(0)
+        return slot
+
+    def push(self, key: str, value: float) -> None:
+        """Append one value, overwriting the oldest once the buffer is full."""
+        with self.lock:
+            slot = self._slot(key)
+            self.values[slot * self.points + self.heads[slot]] = value
+            self.heads[slot] = (self.heads[slot] + 1) % self.points
+            self.counts[slot] = min(self.counts[slot] + 1, self.points)
+            self.rendered.pop(key, None)
+
+    def replace(self, key: str, values: Iterable[float]) -> None:
+        """Replace a series with the newest `points` of values (oldest first)."""
+        values = list(values)[-self.points:]
+        with self.lock:
+            slot = self._slot(key)
+            start = slot * self.points
+            self.values[start:start + len(values)] = array('d', values)
+            self.heads[slot] = len(values) % self.points
+            self.counts[slot] = len(values)
+            self.rendered.pop(key, None)
+
+    def get(self, key: str) -> list:
+        """Values of a series, oldest first."""
+        slot = self.slots.get(key)
+        if slot is None:
+            return []
+        start = slot * self.points
+        count = self.counts[slot]
+        head = self.heads[slot]
+        if count < self.points:
+            return self.values[start:start + count].tolist()
+        return (self.values[start + head:start + self.points] + self.values[start:start + head]).tolist()
+
+    def change(self, key: str) -> Optional[float]:
+        """Newest minus oldest value, or None without at least two values."""
+        values = self.get(key)
+        return values[-1] - values[0] if len(values) >= 2 else None
+
+    def sparkline(self, key: str) -> Optional[str]:
+        """Sparkline of a series, or None if it has no values."""
+        cached = self.rendered.get(key)
+        if cached is None:
+            values = self.get(key)
+            if not values:
+                return None
+            cached = self.rendered[key] = render_sparkline(values, self.scale)
+        return cached
+
+
+def render_sparkline(values, scale: Optional[Tuple[float, float]] = None) -> str:
+    """Render values as block characters, scaled to scale=(low, high) or to their own range."""
+    low, high = scale if scale else (min(values), max(values))
+    span = high - low
+    # Flat (or nearly flat, relative to the values) series are drawn mid-height
+    if span <= abs(high) * 1e-4:
+        return SPARKLINE_BLOCKS[len(SPARKLINE_BLOCKS) // 2 - 1] * len(values)
+    top = len(SPARKLINE_BLOCKS) - 1
+    return ''.join(SPARKLINE_BLOCKS[min(top, max(0, int((value - low) / span * top + 0.5)))] for value in values)
+
+
+def create_trend_buffers() -> Dict[str, TrendBuffers]:
+    """One TrendBuffers per TREND_COLUMNS entry."""
+    return {name: TrendBuffers(scale=scale) for name, (_, scale) in TREND_COLUMNS.items()}
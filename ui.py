@@ -1,17 +1,22 @@
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.live import Live
 from rich import box
 from rich.layout import Layout
 from rich.panel import Panel
-import time
+from rich.text import Text
+import threading
 import readchar
 import os
 import shutil
 from datetime import datetime, timedelta
 import re
-from fetch import is_aurora_instance
+from fetch import is_aurora_instance, get_instance_key
+from metrics import AURORA_VOLUME_KEY
+from forecast import FORECAST_KEY
+from rightsizing import RIGHTSIZING_KEY, RIGHTSIZING_CLASS_KEY
+from performance_insights import PI_WINDOW_MINUTES
+from trends import SPARKLINE_POINTS, TREND_COLUMNS, render_sparkline
 from backup_maintenance import (
     format_backup_window_display, 
     format_maintenance_window_display, 
@@ -21,6 +26,54 @@ from backup_maintenance import (
 
 console = Console()
 
+# Shown in cells whose data is still being fetched by a background stage
+LOADING_PLACEHOLDER = "[dim]…[/dim]"
+
+# Backup view columns that come from the backup/maintenance stage
+BACKUP_LOADING_KEYS = ['backup_window', 'backup_retention', 'maintenance_window', 'next_maintenance', 'pending_actions']
+
+# Width spec for the Account column shown when instances come from several accounts
+ACCOUNT_COLUMN_SPEC = {'min': 8, 'weight': 1.5, 'max': 20}
+
+# Optional performance columns (metrics.PERFORMANCE_METRICS keys): header, divisor, format
+PERFORMANCE_COLUMNS = {
+    'cpu': ('CPU\n(%)', 1, '{:.1f}'),
+    'memory': ('Free Mem\n(GiB)', 1024**3, '{:.1f}'),
+    'connections': ('Conns', 1, '{:.0f}'),
+    'read_iops': ('Read\nIOPS', 1, '{:.0f}'),
+    'write_iops': ('Write\nIOPS', 1, '{:.0f}'),
+    'read_throughput': ('Read\n(MiB/s)', 1024**2, '{:.1f}'),
+    'write_throughput': ('Write\n(MiB/s)', 1024**2, '{:.1f}'),
+    'replica_lag': ('Replica\nLag (s)', 1, '{:.1f}'),
+}
+PERFORMANCE_COLUMN_SPEC = {'min': 4, 'weight': 0.8, 'max': 9}
+
+# Row keys of performance columns are prefixed to stay clear of the storage 'iops' column
+PERFORMANCE_KEY_PREFIX = 'perf_'
+
+# Row keys of sparkline columns (trends.TREND_COLUMNS keys)
+TREND_KEY_SUFFIX = '_trend'
+
+# "Full In (days)" storage forecast: red / yellow below these many days
+FORECAST_CRITICAL_DAYS = 7
+FORECAST_WARNING_DAYS = 30
+
+# Right-sizing columns (--rightsizing): p95 CPU over the window and the suggested class
+RIGHTSIZING_COLUMN_SPECS = {
+    'cpu_p95': {'min': 4, 'weight': 0.8, 'max': 7},
+    'rightsizing': {'min': 6, 'weight': 1.5, 'max': 14},  # ↓ r6g.xlarge fits
+}
+
+# Sort order of right-sizing signals, most urgent last
+RIGHTSIZING_SORT_ORDER = {'down': 0, 'ok': 1, 'up': 2}
+
+# Lines of the instances table that are not rows (title, headers, totals), for scrolling to the cursor
+TABLE_CHROME_LINES = 12
+
+# Characters of each top SQL statement shown in the Performance Insights pane
+PI_STATEMENT_WIDTH = 100
+
+
 def get_terminal_width():
     """Get current terminal width."""
     try:
@@ -28,6 +81,13 @@ def get_terminal_width():
     except:
         return 120  # Default fallback
 
+def get_terminal_height():
+    """Get current terminal height."""
+    try:
+        return shutil.get_terminal_size().lines
+    except:
+        return 40  # Default fallback
+
 def calculate_dynamic_spacing(terminal_width, num_columns):
     """Calculate dynamic spacing and column widths based on terminal width."""
     # Reserve space for borders, padding, and separators
@@ -45,10 +105,11 @@ def calculate_dynamic_spacing(terminal_width, num_columns):
     
     return padding, available_width
 
-def get_backup_column_widths():
+def get_backup_column_widths(has_account=False):
     """Get dynamic column widths for backup view based on terminal size."""
     terminal_width = get_terminal_width()
-    padding, available_width = calculate_dynamic_spacing(terminal_width, 9)  # 9 columns in backup view
+    num_columns = 10 if has_account else 9  # Include account column for multi-account fleets
+    padding, available_width = calculate_dynamic_spacing(terminal_width, num_columns)
     
     # Define relative importance and minimum widths for each column
     column_specs = {
@@ -63,12 +124,24 @@ def get_backup_column_widths():
         'pending_actions': {'min': 12, 'weight': 3, 'max': 35}
     }
     
+    if has_account:
+        column_specs['account'] = ACCOUNT_COLUMN_SPEC
+    
     return _calculate_column_widths(column_specs, available_width, padding)
 
-def get_pricing_column_widths(has_ri_savings=False):
+def get_pricing_column_widths(has_ri_savings=False, has_account=False, performance_columns=(), has_forecast=False,
+                              trend_columns=(), has_rightsizing=False):
     """Get dynamic column widths for pricing view based on terminal size."""
     terminal_width = get_terminal_width()
     num_columns = 12 if has_ri_savings else 11  # Include RI savings column if present
+    if has_account:
+        num_columns += 1
+    if has_forecast:
+        num_columns += 1
+    num_columns += len(trend_columns)
+    num_columns += len(performance_columns)
+    if has_rightsizing:
+        num_columns += len(RIGHTSIZING_COLUMN_SPECS)
     padding, available_width = calculate_dynamic_spacing(terminal_width, num_columns)
     
     # Define column specifications for pricing view - optimized for narrower terminals
@@ -90,6 +163,22 @@ def get_pricing_column_widths(has_ri_savings=False):
     if has_ri_savings:
         column_specs['ri_savings'] = {'min': 4, 'weight': 1.5, 'max': 12}
     
+    if has_account:
+        column_specs['account'] = ACCOUNT_COLUMN_SPEC
+    
+    if has_forecast:
+        column_specs['days_to_full'] = {'min': 4, 'weight': 0.8, 'max': 7}  # 999 / ∞ fits
+    
+    for key in performance_columns:
+        column_specs[PERFORMANCE_KEY_PREFIX + key] = PERFORMANCE_COLUMN_SPEC
+    
+    for key in trend_columns:
+        # One character per datapoint
+        column_specs[key + TREND_KEY_SUFFIX] = {'min': SPARKLINE_POINTS, 'weight': 0.1, 'max': SPARKLINE_POINTS}
+    
+    if has_rightsizing:
+        column_specs.update(RIGHTSIZING_COLUMN_SPECS)
+    
     return _calculate_column_widths(column_specs, available_width, padding)
 
 def get_ri_utilization_column_widths():
@@ -306,6 +395,63 @@ def parse_backup_retention_period(retention: str) -> int:
     # If we can't parse it, put it at the end
     return 9999
 
+def format_days_to_full(days, missing="[dim]-[/dim]"):
+    """Format a days-until-full forecast: red within a week, yellow within a month, ∞ if not filling up."""
+    if days == "N/A":
+        return "N/A"
+    if days is None:
+        return missing
+    if days == float('inf'):
+        return "[dim]∞[/dim]"
+    text = ">999" if days > 999 else f"{days:.0f}"
+    if days < FORECAST_CRITICAL_DAYS:
+        return f"[red]{text}[/red]"
+    if days < FORECAST_WARNING_DAYS:
+        return f"[yellow]{text}[/yellow]"
+    return text
+
+def format_rightsizing(signal, suggested_class, missing="[dim]-[/dim]"):
+    """Format a right-sizing signal: green arrow down to a smaller class, red arrow up to a larger one."""
+    if signal is None:
+        return missing
+    if signal == 'ok':
+        return "[dim]ok[/dim]"
+    # The db. prefix is the same for every class
+    target = (suggested_class or '').replace('db.', '', 1)
+    if signal == 'down':
+        return f"[green]↓ {target}[/green]"
+    # Already the largest size
+    return f"[red]↑ {target}[/red]" if target else "[red]↑[/red]"
+
+def format_performance_insights(data):
+    """Render Performance Insights data (see performance_insights.fetch_performance_insights()) for the detail pane."""
+    load = data.get('load') or []
+    if load:
+        summary = (f"DB load (average active sessions): {render_sparkline(load, (0, max(max(load), 1e-9)))}  "
+                   f"now [bold]{load[-1]:.2f}[/bold], average {sum(load) / len(load):.2f}, peak {max(load):.2f}")
+    else:
+        summary = "[dim]No DB load recorded in this window[/dim]"
+
+    wait_events = Table(box=box.SIMPLE, expand=True, padding=(0, 1))
+    wait_events.add_column("Wait Event")
+    wait_events.add_column("Type", style="dim")
+    wait_events.add_column("AAS", justify="right")
+    for name, event_type, total in data.get('wait_events') or []:
+        wait_events.add_row(name, event_type, f"{total:.2f}")
+
+    top_sql = Table(box=box.SIMPLE, expand=True, padding=(0, 1))
+    top_sql.add_column("Top SQL", no_wrap=True, overflow="ellipsis")
+    top_sql.add_column("AAS", justify="right")
+    for statement, total in data.get('top_sql') or []:
+        # SQL is shown as plain text, not Rich markup
+        top_sql.add_row(Text(' '.join(statement.split())[:PI_STATEMENT_WIDTH]), f"{total:.2f}")
+
+    grid = Table.grid(expand=True)
+    grid.add_column(ratio=2)
+    grid.add_column(ratio=3)
+    grid.add_row(wait_events, top_sql)
+    return Group(Text.from_markup(summary), grid)
+
 def _sort_iops_value(iops_value):
     """
     Sort IOPS values in logical order:
@@ -412,13 +558,48 @@ def get_column_shortcuts():
     # No longer needed - we'll use positional numbers instead
     return {}
 
-def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None, backup_data=None, maintenance_data=None):
+def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None, backup_data=None, maintenance_data=None,
+                      stage_runner=None, headless=False, performance=None, performance_columns=None,
+                      show_forecast=True, trends=None, show_rightsizing=False, pi_loader=None):
+    """
+    Display the interactive RDS table.
+
+    When a StageRunner is passed, the table is shown immediately and columns fill in
+    as the metrics, pricing, RI and backup stages complete in the background.
+
+    performance_columns lists the PERFORMANCE_COLUMNS to show, with values from
+    performance ({instance_key: {metric_key: value}}) or the 'performance' stage.
+    show_forecast adds the "Full In (days)" storage forecast, read from the same data.
+    trends (see trends.create_trend_buffers()) adds a sparkline column per buffer; the
+    metrics stage fills the buffers and each sparkline is rendered once per update.
+    show_rightsizing adds p95 CPU and the right-sizing suggestion (rightsizing.compute_rightsizing()).
+    pi_loader (a performance_insights.PerformanceInsightsLoader) backs the detail pane that
+    Enter opens for the highlighted row; its data is fetched in the background and the pane
+    re-renders when it arrives.
+
+    With headless=True nothing is displayed; the row, sort and render functions are
+    returned instead so they can be benchmarked (see benchmarks/offline_benchmark.py).
+    """
+    metrics = metrics or {}
+    pricing = pricing or {}
+    performance = performance or {}
+    performance_columns = [key for key in (performance_columns or []) if key in PERFORMANCE_COLUMNS]
+    trends = trends or {}
+    trend_columns = [key for key in TREND_COLUMNS if key in trends]
+    render_lock = threading.Lock()
+    live_ref = {}
     
     sort_state = {'key': 'name', 'ascending': True}
+    # Highlighted row of the instances view (index into the sorted rows) and the first row shown
+    cursor = {'index': 0, 'top': 0, 'rows': []}
+    show_details = False  # Performance Insights pane for the highlighted row
+    instances_by_key = {get_instance_key(inst): inst for inst in rds_instances}
     show_help = False
     show_monthly = False  # Toggle between hourly and monthly view
     show_utc_time = False  # Toggle between UTC and local timezone for backup/maintenance view
     current_view = 'instances'  # Three views: 'instances', 'ri_utilization', 'backup_maintenance'
+    # Only show the Account column when instances come from more than one account
+    show_account = len(set(inst.get('Account') for inst in rds_instances)) > 1
     
     def get_columns():
         """Get column definitions based on current view mode."""
@@ -434,6 +615,8 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 {'name': 'Next', 'key': 'next_maintenance', 'justify': 'left'},
                 {'name': 'Pending Actions', 'key': 'pending_actions', 'justify': 'left'},
             ]
+            if show_account:
+                columns.insert(1, {'name': 'Account', 'key': 'account', 'justify': 'left'})
         else:
             # Default pricing view (for both instances and RI views when showing instances)
             price_unit = "$/mo" if show_monthly else "$/hr"
@@ -445,6 +628,23 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 {'name': 'Free (GiB)', 'key': 'free_gb', 'justify': 'right'},
                 {'name': 'IOPS', 'key': 'iops', 'justify': 'right'},
                 {'name': 'EBS\nThroughput', 'key': 'storage_throughput', 'justify': 'right'},
+            ]
+            if show_forecast:
+                columns.insert(5, {'name': 'Full In\n(days)', 'key': 'days_to_full', 'justify': 'right'})
+            columns += [
+                {'name': TREND_COLUMNS[key][0], 'key': key + TREND_KEY_SUFFIX, 'justify': 'left'}
+                for key in trend_columns
+            ]
+            columns += [
+                {'name': PERFORMANCE_COLUMNS[key][0], 'key': PERFORMANCE_KEY_PREFIX + key, 'justify': 'right'}
+                for key in performance_columns
+            ]
+            if show_rightsizing:
+                columns += [
+                    {'name': 'CPU p95\n(%)', 'key': 'cpu_p95', 'justify': 'right'},
+                    {'name': 'Right\nSize', 'key': 'rightsizing', 'justify': 'left'},
+                ]
+            columns += [
                 {'name': f'Instance\n({price_unit})', 'key': 'instance_price', 'justify': 'right'},
                 {'name': f'Storage\n({price_unit})', 'key': 'storage_price', 'justify': 'right'},
                 {'name': f'IOPS\n({price_unit})', 'key': 'iops_price', 'justify': 'right'},
@@ -452,6 +652,9 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 {'name': f'Total\n({price_unit})', 'key': 'total_price', 'justify': 'right'},
             ]
             
+            if show_account:
+                columns.insert(1, {'name': 'Account', 'key': 'account', 'justify': 'left'})
+            
             # Add RI savings column if we have RI data
             if ri_matches:
                 columns.append({'name': f'RI Savings\n({price_unit})', 'key': 'ri_savings', 'justify': 'right'})
@@ -487,8 +690,24 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
         """Check if any instances are Multi-AZ"""
         return any(inst.get('MultiAZ', False) for inst in rds_instances)
 
+    def is_loading(*stage_names):
+        """Check whether any of the given background stages is still running."""
+        if stage_runner is None:
+            return False
+        return any(name in stage_runner.stages and not stage_runner.is_done(name) for name in stage_names)
+
+    def get_loading_info():
+        """Title suffix listing background stages that are still running."""
+        if stage_runner is None:
+            return ""
+        pending = stage_runner.pending()
+        if not pending:
+            return ""
+        return f" | ⏳ Loading: {', '.join(name.replace('_', ' ') for name in pending)}"
+
     def get_rows():
         rows = []
+        backup_loading = is_loading('backup_maintenance')
         for inst in rds_instances:
             name = inst['DBInstanceIdentifier']
             klass = inst['DBInstanceClass']
@@ -500,15 +719,16 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             
             if current_view == 'backup_maintenance':
                 # Backup and maintenance view
-                backup_info = backup_data.get(name, {}) if backup_data else {}
-                maintenance_info = maintenance_data.get(name, {}) if maintenance_data else {}
+                backup_info = backup_data.get(get_instance_key(inst), {}) if backup_data else {}
+                maintenance_info = maintenance_data.get(get_instance_key(inst), {}) if maintenance_data else {}
                 
                 # Add multi-AZ indicator for display
                 is_multi_az = inst.get('MultiAZ', False)
                 base_display_name = f"{name} 👥" if is_multi_az else name
                 
-                rows.append({
+                row = {
                     'name': base_display_name,
+                    'account': inst.get('Account') or '',
                     'class': klass,
                     'engine': engine,
                     'storage': storage if not is_aurora else "Aurora",
@@ -518,23 +738,29 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                     'next_maintenance': get_next_maintenance_status(maintenance_info.get('next_maintenance_time')),
                     'pending_actions': format_pending_actions_display(maintenance_info.get('pending_actions', [])),
                     'is_aurora': is_aurora,
-                })
+                }
+                if backup_loading:
+                    for key in BACKUP_LOADING_KEYS:
+                        row[key] = LOADING_PLACEHOLDER
+                rows.append(row)
                 continue
             
             # Add multi-AZ indicator for display (keep original name for lookups)
             is_multi_az = inst.get('MultiAZ', False)
             base_display_name = f"{name} 👥" if is_multi_az else name
             
-            price_info = pricing.get((name, inst['Region'], inst['Engine']))  # Use instance ID as key
-            free = metrics.get(name)  # Use original name for metrics lookup
+            instance_key = get_instance_key(inst)
+            price_info = pricing.get((instance_key, inst['Region'], inst['Engine']))
+            free = metrics.get(instance_key)
             
             # Get storage type for gp2 detection
             storage_type = inst.get('StorageType', '').lower()
             
             # Handle Aurora instances differently
             if is_aurora:
-                # For Aurora: show "Aurora" for storage, "N/A" for storage-related metrics
-                storage_display = "Aurora"
+                # For Aurora: show the cluster volume used (GB) once known, "N/A" for storage-related metrics
+                volume_used = (performance.get(instance_key) or {}).get(AURORA_VOLUME_KEY)
+                storage_display = volume_used / (1024**3) if volume_used is not None else "Aurora"
                 used_pct = "N/A"
                 free_gb = "N/A"
                 iops_display = "N/A"
@@ -640,7 +866,9 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 throughput_price = "N/A"
 
             rows.append({
+                'instance_key': instance_key,
                 'name': display_name,
+                'account': inst.get('Account') or '',
                 'class': klass,
                 'storage': storage_display,
                 'used_pct': used_pct,
@@ -655,6 +883,30 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 'ri_savings': ri_savings,
                 'is_aurora': is_aurora,
             })
+            if show_forecast:
+                # None = no forecast (yet), inf = free space is not shrinking
+                instance_performance = performance.get(instance_key) or {}
+                if is_aurora:
+                    rows[-1]['days_to_full'] = "N/A"
+                elif FORECAST_KEY in instance_performance:
+                    days = instance_performance[FORECAST_KEY]
+                    rows[-1]['days_to_full'] = float('inf') if days is None else days
+                else:
+                    rows[-1]['days_to_full'] = None
+            for key in trend_columns:
+                # Cached by the buffer until the metrics stage writes new data
+                rows[-1][key + TREND_KEY_SUFFIX] = trends[key].sparkline(instance_key)
+                rows[-1][key + TREND_KEY_SUFFIX + '_change'] = trends[key].change(instance_key)
+            if performance_columns:
+                instance_performance = performance.get(instance_key) or {}
+                for key in performance_columns:
+                    value = instance_performance.get(key)
+                    rows[-1][PERFORMANCE_KEY_PREFIX + key] = None if value is None else value / PERFORMANCE_COLUMNS[key][1]
+            if show_rightsizing:
+                instance_performance = performance.get(instance_key) or {}
+                rows[-1]['cpu_p95'] = instance_performance.get('cpu_p95')
+                rows[-1]['rightsizing'] = instance_performance.get(RIGHTSIZING_KEY)
+                rows[-1]['rightsizing_class'] = instance_performance.get(RIGHTSIZING_CLASS_KEY)
         return rows
 
     def sort_rows(rows):
@@ -664,13 +916,19 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
         # Define sort functions for each column type
         sort_funcs = {
             'name': lambda r: r['name'] or '',
+            'account': lambda r: r.get('account', '') or '',
             'class': lambda r: r['class'] or '',
             'engine': lambda r: r.get('engine', '') or '',
             'storage': lambda r: 0 if r['storage'] == "Aurora" else (r['storage'] or 0),
             'used_pct': lambda r: -1 if r.get('used_pct') == "N/A" else (r.get('used_pct') if r.get('used_pct') is not None else 0),
             'free_gb': lambda r: -1 if r.get('free_gb') == "N/A" else (r.get('free_gb') if r.get('free_gb') is not None else 0),
+            'days_to_full': lambda r: -1 if r.get('days_to_full') in ("N/A", None) else r['days_to_full'],
             'iops': lambda r: _sort_iops_value(r.get('iops')),
             'storage_throughput': lambda r: _sort_throughput_value(r.get('storage_throughput')),
+            'cpu_p95': lambda r: -1 if r.get('cpu_p95') is None else r['cpu_p95'],
+            # Signal first, then how busy the instance is within it
+            'rightsizing': lambda r: (RIGHTSIZING_SORT_ORDER.get(r.get('rightsizing'), -1),
+                                      -1 if r.get('cpu_p95') is None else r['cpu_p95']),
             
             # Backup view columns with time-aware sorting
             'backup_window': lambda r: parse_backup_window_time(r.get('backup_window', '') or ''),
@@ -687,6 +945,13 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             'total_price': lambda r: _sort_price_value(r.get('total_price')),
             'ri_savings': lambda r: _sort_price_value(r.get('ri_savings')),
         }
+        for key in performance_columns:
+            row_key = PERFORMANCE_KEY_PREFIX + key
+            sort_funcs[row_key] = lambda r, row_key=row_key: -1 if r.get(row_key) is None else r[row_key]
+        for key in trend_columns:
+            # Sparklines sort by how much the series changed over the window
+            change_key = key + TREND_KEY_SUFFIX + '_change'
+            sort_funcs[key + TREND_KEY_SUFFIX] = lambda r, change_key=change_key: -1 if r.get(change_key) is None else r[change_key]
         
         keyfunc = sort_funcs.get(k, lambda r: r['name'] or '')
         return sorted(rows, key=keyfunc, reverse=not ascending)
@@ -753,6 +1018,8 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
         
         # Other controls
         help_text += f"  [cyan]?[/cyan] → Help{'':<20}[cyan]m[/cyan] → Monthly/Hourly{'':<12}[cyan]q[/cyan] → Quit\n"
+        if current_view == 'instances':
+            help_text += f"  [cyan]↑/↓[/cyan] → Select Row{'':<14}[cyan]Enter[/cyan] → Performance Insights\n"
         
         # Timezone toggle (only show in backup view)
         if current_view == 'backup_maintenance':
@@ -760,27 +1027,44 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             help_text += f"  [cyan]t[/cyan] → Timezone Toggle (Currently: {current_tz})\n"
         
         # Visual indicators section
-        if ri_matches or has_multi_az:
+        has_aurora = any(row_inst.get('IsAurora') for row_inst in rds_instances)
+        if ri_matches or has_multi_az or has_aurora:
             help_text += "\n🎨 [bold white]Visual Indicators[/bold white]\n"
             if ri_matches:
                 help_text += "  Instance names: [green]Green=100% RI[/green] [yellow]Yellow=Partial RI[/yellow]\n"
             if has_multi_az:
                 help_text += "  👥 = Multi-AZ instances (2x pricing)\n"
+            if has_aurora:
+                help_text += "  Storage: [cyan]Cyan[/cyan] = Aurora cluster volume used (shared by cluster members)\n"
+        if show_forecast and current_view != 'backup_maintenance':
+            help_text += ("\n📉 [bold white]Full In (days)[/bold white]\n"
+                          "  Days until free storage runs out at its recent rate: "
+                          f"[red]<{FORECAST_CRITICAL_DAYS}[/red] [yellow]<{FORECAST_WARNING_DAYS}[/yellow], ∞ = not filling up\n")
+        if show_rightsizing and current_view != 'backup_maintenance':
+            help_text += ("\n📐 [bold white]Right Size[/bold white]\n"
+                          "  From p95 / p99 / peak CPU and memory over the look-back window: "
+                          "[green]↓ smaller class[/green] fits, [red]↑ larger class[/red] needed, ok = keep\n")
         
         help_text += "\n[dim]Press any letter to sort by that column, [cyan]?[/cyan] to close this help.[/dim]"
         
         return Panel(help_text, title="💡 Help & Shortcuts - Press [cyan]?[/cyan] to close", 
                     border_style="bright_blue", expand=True, padding=(1, 2))
 
+    def get_page_size():
+        """Table rows that fit on screen; the detail pane takes the bottom 2/5 of it."""
+        height = get_terminal_height() * 3 // 5 if show_details else get_terminal_height()
+        return max(1, height - TABLE_CHROME_LINES)
+
     def render_table(has_multi_az=False, blur=False):
         # Get dynamic spacing based on terminal width
         if current_view == 'backup_maintenance':
-            widths, dynamic_padding = get_backup_column_widths()
+            widths, dynamic_padding = get_backup_column_widths(show_account)
             padding = (0, dynamic_padding)
         else:
             # Pricing view - also use dynamic spacing
             has_ri_savings = ri_matches and any(ri_matches.values())
-            widths, dynamic_padding = get_pricing_column_widths(has_ri_savings)
+            widths, dynamic_padding = get_pricing_column_widths(has_ri_savings, show_account, performance_columns,
+                                                                show_forecast, trend_columns, show_rightsizing)
             padding = (0, dynamic_padding)
         
         table = Table(title="Amazon RDS Instances", box=box.SIMPLE_HEAVY, padding=padding)
@@ -800,6 +1084,7 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 # Backup & Maintenance view - dynamic column widths based on terminal size
                 width_key_map = {
                     'name': 'name',
+                    'account': 'account',
                     'class': 'class', 
                     'engine': 'engine',
                     'storage': 'storage',
@@ -823,10 +1108,14 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 # Pricing view - use dynamic column widths
                 pricing_width_key_map = {
                     'name': 'name',
+                    'account': 'account',
                     'class': 'class',
                     'storage': 'storage',
                     'used_pct': 'used_pct',
                     'free_gb': 'free_gb',
+                    'days_to_full': 'days_to_full',
+                    'cpu_p95': 'cpu_p95',
+                    'rightsizing': 'rightsizing',
                     'iops': 'iops',
                     'storage_throughput': 'storage_throughput',
                     'instance_price': 'instance_price',
@@ -837,19 +1126,31 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                     'ri_savings': 'ri_savings'
                 }
                 
-                width_key = pricing_width_key_map.get(col['key'])
+                is_performance = col['key'].startswith(PERFORMANCE_KEY_PREFIX) or col['key'].endswith(TREND_KEY_SUFFIX)
+                width_key = col['key'] if is_performance else pricing_width_key_map.get(col['key'])
                 if width_key and width_key in widths:
                     width = widths[width_key]
                     style = "bold" if col['key'] == 'name' else None
                     # Allow header wrapping for multi-line headers
-                    no_wrap = col['key'] not in ['storage', 'used_pct', 'free_gb', 'iops', 'storage_throughput', 'instance_price', 'storage_price', 'iops_price', 'throughput_price', 'total_price', 'ri_savings']
+                    no_wrap = not is_performance and col['key'] not in ['storage', 'used_pct', 'free_gb', 'days_to_full', 'cpu_p95', 'iops', 'storage_throughput', 'instance_price', 'storage_price', 'iops_price', 'throughput_price', 'total_price', 'ri_savings']
                     table.add_column(header_text, justify=col['justify'], style=style, 
                                    width=width, no_wrap=no_wrap)
                 else:
                     table.add_column(header_text, justify=col['justify'], style="bold" if col['key'] == 'name' else None)
         
         rows = sort_rows(get_rows())
-        for row in rows:
+        missing_metric = LOADING_PLACEHOLDER if is_loading('metrics') else "?"
+        missing_price = LOADING_PLACEHOLDER if is_loading('pricing') else "?"
+        missing_performance = LOADING_PLACEHOLDER if is_loading('performance') else "[dim]-[/dim]"
+        ri_loading = is_loading('ri_matches', 'effective_pricing')
+        show_cursor = current_view == 'instances'
+        first_row = 0
+        if show_cursor:
+            cursor['rows'] = rows
+            cursor['index'] = min(cursor['index'], max(len(rows) - 1, 0))
+            first_row = cursor['top']
+        # Only the rows on screen are built; the table is re-rendered on every key press and update
+        for row_index, row in enumerate(rows[first_row:first_row + get_page_size()], first_row):
             is_aurora = row.get('is_aurora', False)
             
             # Initialize display variables
@@ -874,13 +1175,13 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 elif row.get('used_pct') is not None and row['used_pct'] >= 80:
                     used_pct_display = f"[red]{row['used_pct']:.1f}%[/red]"
                 else:
-                    used_pct_display = f"{row['used_pct']:.1f}%" if row.get('used_pct') is not None else "?"
+                    used_pct_display = f"{row['used_pct']:.1f}%" if row.get('used_pct') is not None else missing_metric
                 
                 # Handle Free (GiB) column
                 if row.get('free_gb') == "N/A":
                     free_gb_display = "N/A"
                 else:
-                    free_gb_display = f"{row['free_gb']:.1f}" if row.get('free_gb') is not None else "?"
+                    free_gb_display = f"{row['free_gb']:.1f}" if row.get('free_gb') is not None else missing_metric
                 
                 # Handle IOPS and Storage Throughput
                 if row.get('iops') == "N/A":
@@ -916,7 +1217,7 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                             return "$0"
                         return f"${adjusted_price:.{price_precision}f}"
                     else:
-                        return "?"
+                        return missing_price
                 
                 # Helper function for clean price formatting (also used in totals)
                 def format_total_price(amount, precision=None):
@@ -933,18 +1234,26 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 instance_price_display = format_price(row.get('instance_price'), row.get('instance_price'))
                 total_price_display = format_price(row.get('total_price'), row.get('total_price'))
                 ri_savings_display = format_price(row.get('ri_savings'), row.get('ri_savings')) if row.get('ri_savings') is not None else None
+                if ri_loading:
+                    ri_savings_display = LOADING_PLACEHOLDER
             
             # Build row data dynamically based on columns
             row_data = []
             for col in columns:
                 if col['key'] == 'name':
                     row_data.append(str(row['name']))
+                elif col['key'] == 'account':
+                    row_data.append(str(row.get('account', '')))
                 elif col['key'] == 'class':
                     row_data.append(str(row['class']))
                 elif col['key'] == 'engine':
                     row_data.append(str(row.get('engine', '')))
                 elif col['key'] == 'storage':
-                    row_data.append(str(row['storage']))
+                    if row.get('is_aurora') and row['storage'] != "Aurora":
+                        # Aurora cluster volume used, shared by every member of the cluster
+                        row_data.append(f"[cyan]{row['storage']:.0f}[/cyan]")
+                    else:
+                        row_data.append(str(row['storage']))
                 elif col['key'] == 'backup_window':
                     row_data.append(str(row.get('backup_window', 'Not set')))
                 elif col['key'] == 'backup_retention':
@@ -959,6 +1268,14 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                     row_data.append(used_pct_display)
                 elif col['key'] == 'free_gb':
                     row_data.append(free_gb_display)
+                elif col['key'] == 'days_to_full':
+                    row_data.append(format_days_to_full(row.get('days_to_full'), missing_performance))
+                elif col['key'] == 'cpu_p95':
+                    value = row.get('cpu_p95')
+                    row_data.append(missing_performance if value is None else f"{value:.1f}")
+                elif col['key'] == 'rightsizing':
+                    row_data.append(format_rightsizing(row.get('rightsizing'), row.get('rightsizing_class'),
+                                                       missing_performance))
                 elif col['key'] == 'iops':
                     row_data.append(iops_display)
                 elif col['key'] == 'storage_throughput':
@@ -975,8 +1292,14 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                     row_data.append(total_price_display)
                 elif col['key'] == 'ri_savings':
                     row_data.append(ri_savings_display if ri_savings_display else '[dim]-[/dim]')
+                elif col['key'].endswith(TREND_KEY_SUFFIX):
+                    row_data.append(row.get(col['key']) or missing_performance)
+                elif col['key'].startswith(PERFORMANCE_KEY_PREFIX):
+                    value = row.get(col['key'])
+                    value_format = PERFORMANCE_COLUMNS[col['key'][len(PERFORMANCE_KEY_PREFIX):]][2]
+                    row_data.append(missing_performance if value is None else value_format.format(value))
             
-            table.add_row(*row_data)
+            table.add_row(*row_data, style="reverse" if show_cursor and row_index == cursor['index'] else None)
         
         # Calculate totals for pricing columns (only for pricing view)
         total_instance_price = 0
@@ -1031,7 +1354,7 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             for col in columns:
                 if col['key'] == 'name':
                     total_row.append(f"[bold]TOTAL ({instance_count} instances)[/bold]")
-                elif col['key'] in ['class', 'storage', 'used_pct', 'free_gb', 'iops', 'storage_throughput']:
+                elif col['key'] in ['account', 'class', 'storage', 'used_pct', 'free_gb', 'days_to_full', 'cpu_p95', 'rightsizing', 'iops', 'storage_throughput'] or col['key'].startswith(PERFORMANCE_KEY_PREFIX) or col['key'].endswith(TREND_KEY_SUFFIX):
                     total_row.append("")
                 elif col['key'] == 'instance_price':
                     total_row.append(f"[bold]${total_instance_price * price_multiplier:.{price_precision}f}[/bold]")
@@ -1060,7 +1383,7 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             for col in columns:
                 if col['key'] == 'name':
                     monthly_row.append(f"[bold magenta]📅 Monthly Estimate[/bold magenta]")
-                elif col['key'] in ['class', 'storage', 'used_pct', 'free_gb', 'iops', 'storage_throughput']:
+                elif col['key'] in ['account', 'class', 'storage', 'used_pct', 'free_gb', 'days_to_full', 'cpu_p95', 'rightsizing', 'iops', 'storage_throughput'] or col['key'].startswith(PERFORMANCE_KEY_PREFIX) or col['key'].endswith(TREND_KEY_SUFFIX):
                     monthly_row.append("")
                 elif col['key'] == 'instance_price':
                     monthly_row.append(f"[bold magenta]${total_instance_price * 24 * 30.42:.2f}[/bold magenta]")
@@ -1090,7 +1413,7 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
         
         # Update table title based on current view mode
         if current_view == 'backup_maintenance':
-            table.title = f"Amazon RDS Instances - Backup & Maintenance View ({instance_count} instances)"
+            table.title = f"Amazon RDS Instances - Backup & Maintenance View ({instance_count} instances){get_loading_info()}"
         else:
             pricing_view_mode = "Monthly" if show_monthly else "Hourly"
             
@@ -1110,11 +1433,11 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             if show_monthly:
                 total_display = total_overall_price * 24 * 30.42
                 daily_total = total_overall_price * 24
-                table.title = f"Amazon RDS Instances ({pricing_view_mode}) - Total: ${total_display:.2f}/mo | Daily: ${daily_total:.2f}/day ({instance_count} instances){ri_info}"
+                table.title = f"Amazon RDS Instances ({pricing_view_mode}) - Total: ${total_display:.2f}/mo | Daily: ${daily_total:.2f}/day ({instance_count} instances){ri_info}{get_loading_info()}"
             else:
                 daily_total = total_overall_price * 24
                 monthly_total = total_overall_price * 24 * 30.42
-                table.title = f"Amazon RDS Instances ({pricing_view_mode}) - Total: ${total_overall_price:.4f}/hr | Daily: ${daily_total:.2f}/day | Monthly: ${monthly_total:.2f}/mo ({instance_count} instances){ri_info}"
+                table.title = f"Amazon RDS Instances ({pricing_view_mode}) - Total: ${total_overall_price:.4f}/hr | Daily: ${daily_total:.2f}/day | Monthly: ${monthly_total:.2f}/mo ({instance_count} instances){ri_info}{get_loading_info()}"
         
         # Apply blur effect when help is shown
         if blur:
@@ -1140,7 +1463,7 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
     def create_backup_maintenance_table(blur=False):
         """Create a table showing backup and maintenance information."""
         # Get dynamic widths and padding based on terminal size
-        widths, dynamic_padding = get_backup_column_widths()
+        widths, dynamic_padding = get_backup_column_widths(show_account)
         table = Table(title="Amazon RDS Instances - Backup & Maintenance", box=box.SIMPLE_HEAVY, padding=(0, dynamic_padding))
         
         # Add columns with dynamic widths and sorting indicators
@@ -1155,6 +1478,8 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             {'name': 'Next', 'key': 'next_maintenance', 'justify': 'left', 'width_key': 'next'},
             {'name': 'Pending Actions', 'key': 'pending_actions', 'justify': 'left', 'width_key': 'pending_actions'}
         ]
+        if show_account:
+            columns.insert(1, {'name': 'Account', 'key': 'account', 'justify': 'left', 'width_key': 'account'})
         
         # Get shortcuts for current view
         shortcuts = get_shortcuts()
@@ -1170,6 +1495,7 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
         
         # Get sorted rows for backup view
         rows = []
+        backup_loading = is_loading('backup_maintenance')
         for inst in rds_instances:
             name = inst['DBInstanceIdentifier']
             klass = inst['DBInstanceClass']
@@ -1178,15 +1504,16 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             is_aurora = is_aurora_instance(engine)
             
             # Backup and maintenance data
-            backup_info = backup_data.get(name, {}) if backup_data else {}
-            maintenance_info = maintenance_data.get(name, {}) if maintenance_data else {}
+            backup_info = backup_data.get(get_instance_key(inst), {}) if backup_data else {}
+            maintenance_info = maintenance_data.get(get_instance_key(inst), {}) if maintenance_data else {}
             
             # Add multi-AZ indicator for display
             is_multi_az = inst.get('MultiAZ', False)
             base_display_name = f"{name} 👥" if is_multi_az else name
             
-            rows.append({
+            row = {
                 'name': base_display_name,
+                'account': inst.get('Account') or '',
                 'class': klass,
                 'engine': engine,
                 'storage': storage if not is_aurora else "Aurora",
@@ -1196,14 +1523,18 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 'next_maintenance': get_next_maintenance_status(maintenance_info.get('next_maintenance_time')),
                 'pending_actions': format_pending_actions_display(maintenance_info.get('pending_actions', [])),
                 'is_aurora': is_aurora,
-            })
+            }
+            if backup_loading:
+                for key in BACKUP_LOADING_KEYS:
+                    row[key] = LOADING_PLACEHOLDER
+            rows.append(row)
         
         # Apply current sort state (same as other views)
         rows = sort_rows(rows)
         
         # Add rows to table
         for row in rows:
-            table.add_row(
+            row_data = [
                 row['name'],
                 row['class'],
                 row['engine'],
@@ -1213,10 +1544,13 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 row['maintenance_window'],
                 row['next_maintenance'],
                 row['pending_actions']
-            )
+            ]
+            if show_account:
+                row_data.insert(1, row['account'])
+            table.add_row(*row_data)
         
         # Update title with instance count
-        table.title = f"Amazon RDS Instances - Backup & Maintenance ({len(rows)} instances)"
+        table.title = f"Amazon RDS Instances - Backup & Maintenance ({len(rows)} instances){get_loading_info()}"
         
         # Apply blur effect when help is shown
         if blur:
@@ -1241,7 +1575,11 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             # Create empty table with message
             table = Table(title="Reserved Instance Utilization - No RIs found", box=box.SIMPLE_HEAVY)
             table.add_column("Message", justify="center", style="dim")
-            table.add_row("No Reserved Instances found in this region.")
+            if is_loading('reserved_instances', 'ri_matches'):
+                table.title = "Reserved Instance Utilization - Loading..."
+                table.add_row("Fetching Reserved Instances...")
+            else:
+                table.add_row("No Reserved Instances found in this region.")
             
             # Apply blur effect when help is shown
             if blur:
@@ -1434,6 +1772,15 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
             help_panel = create_help_panel(has_multi_az)
             layout["help"].update(help_panel)
             
+        elif show_details and current_view == 'instances':
+            # Performance Insights pane below the table, like the help popup
+            layout.split_column(
+                Layout(name="main", ratio=3),
+                Layout(name="details", ratio=2)
+            )
+            layout["main"].update(render_table(has_multi_az))
+            layout["details"].update(create_details_panel())
+            
         else:
             # Normal mode - just the table, full screen
             layout.add_split(Layout(name="main"))
@@ -1449,11 +1796,89 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
         
         return layout
 
-    # Clear terminal and show loading
+    def create_details_panel():
+        """Performance Insights pane for the highlighted row. Only reads the loader's cache, never waits on the API."""
+        rows = cursor['rows']
+        if not rows:
+            return Panel("[dim]No instance selected[/dim]", title="📊 Performance Insights", border_style="bright_blue")
+        inst = instances_by_key[rows[cursor['index']]['instance_key']]
+        title = f"📊 Performance Insights - {inst['DBInstanceIdentifier']} (last {PI_WINDOW_MINUTES} min)"
+        if pi_loader is None:
+            body = "[dim]Performance Insights is not available for saved snapshots.[/dim]"
+        else:
+            state, data = pi_loader.get(inst)
+            if state == 'disabled':
+                body = "[dim]Performance Insights is not enabled for this instance.[/dim]"
+            elif data is None:
+                body = f"{LOADING_PLACEHOLDER} Loading Performance Insights..."
+            elif 'error' in data:
+                body = f"[red]Could not load Performance Insights:[/red] {data['error']}"
+            else:
+                body = format_performance_insights(data)
+                if state == 'loading':
+                    title += " [dim]refreshing…[/dim]"
+        return Panel(body, title=title, subtitle="[dim]↑/↓ select row, Enter to close[/dim]",
+                     border_style="bright_blue", expand=True, padding=(0, 1))
+
+    def refresh():
+        """Re-render the current view. Called from the key loop and from background stages."""
+        with render_lock:
+            live = live_ref.get('live')
+            if live is not None:
+                live.update(render_layout(), refresh=True)
+
+    def on_stage_complete(name, result):
+        """Swap in data from a finished background stage and re-render."""
+        nonlocal metrics, pricing, ri_matches, backup_data, maintenance_data, performance
+        if name == 'metrics':
+            metrics = result or {}
+        elif name == 'performance':
+            performance = result or {}
+        elif name == 'pricing':
+            # Show on-demand pricing right away; RI-adjusted pricing replaces it later
+            if not stage_runner.is_done('effective_pricing'):
+                pricing = result or {}
+        elif name == 'effective_pricing':
+            pricing = result or {}
+        elif name == 'ri_matches':
+            ri_matches = result
+        elif name == 'backup_maintenance':
+            backup_data, maintenance_data = result or ({}, {})
+        refresh()
+
+    def on_performance_insights_loaded(instance_key):
+        """Re-render when data for the open detail pane arrives."""
+        rows = cursor['rows']
+        if show_details and rows and rows[cursor['index']]['instance_key'] == instance_key:
+            refresh()
+
+    if pi_loader is not None:
+        pi_loader.on_update = on_performance_insights_loaded
+
+    if stage_runner is not None:
+        stage_runner.add_listener(on_stage_complete)
+        # Pick up stages that finished before the listener was registered
+        for name in list(stage_runner.results):
+            on_stage_complete(name, stage_runner.results[name])
+
+    if headless:
+        def set_view(view, monthly=False, details=False):
+            nonlocal current_view, show_monthly, show_details
+            current_view = view
+            show_monthly = monthly
+            show_details = details
+
+        return {
+            'get_rows': get_rows,
+            'sort_rows': sort_rows,
+            'render_table': render_table,
+            'render_layout': render_layout,
+            'sort_state': sort_state,
+            'cursor': cursor,
+            'set_view': set_view,
+        }
+
     clear_terminal()
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
-        progress.add_task(description="Fetching and processing RDS data...", total=None)
-        time.sleep(0.5)  # Simulate loading
 
     # Set up terminal for better Esc key handling
     setup_terminal_for_esc()
@@ -1471,7 +1896,20 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
         next_index = (current_index + direction) % len(views)
         current_view = views[next_index]
 
+    def move_cursor(delta):
+        """Move the highlighted row, scrolling the table to keep it on screen."""
+        count = len(cursor['rows'])
+        if not count:
+            return
+        cursor['index'] = max(0, min(count - 1, cursor['index'] + delta))
+        page = get_page_size()
+        if cursor['index'] < cursor['top']:
+            cursor['top'] = cursor['index']
+        elif cursor['index'] >= cursor['top'] + page:
+            cursor['top'] = cursor['index'] - page + 1
+
     with Live(render_layout(), refresh_per_second=4, console=console, screen=True) as live:
+        live_ref['live'] = live
         controls_msg = "\nPress [bold]?[/bold] for help, [bold]m[/bold] to toggle monthly/hourly, [bold]b[/bold] for backup view"
         if ri_matches:
             controls_msg += ", [bold]v[/bold] for RI utilization"
@@ -1485,40 +1923,54 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                 
                 # Handle exit keys - only q and Q for now (Esc disabled temporarily)
                 if key in ['q', 'Q']:
+                    with render_lock:
+                        live_ref.pop('live', None)
                     clear_terminal()
                     return
                 # Handle special keys - check for readchar constants and raw sequences
                 elif (hasattr(readchar.key, 'RIGHT') and key == readchar.key.RIGHT) or key == '\x1b[C':
                     cycle_view(1)  # Cycle forward
-                    live.update(render_layout())
+                    refresh()
                 elif (hasattr(readchar.key, 'LEFT') and key == readchar.key.LEFT) or key == '\x1b[D':
                     cycle_view(-1)  # Cycle backward
-                    live.update(render_layout())
+                    refresh()
                 elif key == '\t':  # Regular Tab
                     cycle_view(1)  # Cycle forward
-                    live.update(render_layout())
+                    refresh()
                 elif key == '\x1b[Z':  # Shift+Tab (raw sequence)
                     cycle_view(-1)  # Cycle backward
-                    live.update(render_layout())
+                    refresh()
+                elif ((hasattr(readchar.key, 'UP') and key == readchar.key.UP) or key == '\x1b[A') and current_view == 'instances':
+                    move_cursor(-1)
+                    refresh()
+                elif ((hasattr(readchar.key, 'DOWN') and key == readchar.key.DOWN) or key == '\x1b[B') and current_view == 'instances':
+                    move_cursor(1)
+                    refresh()
+                elif key in ['\r', '\n'] and current_view == 'instances':
+                    show_details = not show_details  # Toggle Performance Insights pane
+                    if not show_details and pi_loader is not None:
+                        pi_loader.cancel()  # Nothing left to show a queued fetch in
+                    move_cursor(0)  # Keep the row in view above the pane
+                    refresh()
                 elif key == '?':
                     show_help = not show_help  # Toggle help
-                    live.update(render_layout())
+                    refresh()
                 elif key == 'm':  # Lowercase m for monthly toggle
                     show_monthly = not show_monthly  # Toggle monthly/hourly view
-                    live.update(render_layout())
+                    refresh()
                 elif key == 't':  # Lowercase t for timezone toggle (only in backup view)
                     if current_view == 'backup_maintenance':
                         show_utc_time = not show_utc_time  # Toggle UTC/local timezone
-                        live.update(render_layout())
+                        refresh()
                 elif key == 'V':  # Capital V for pricing view
                     current_view = 'instances'  # Direct to pricing view
-                    live.update(render_layout())
+                    refresh()
                 elif key == 'R' and ri_matches:  # Capital R for RI view
                     current_view = 'ri_utilization'  # Direct to RI utilization
-                    live.update(render_layout())
+                    refresh()
                 elif key == 'B':  # Capital B for backup view
                     current_view = 'backup_maintenance'  # Direct to backup maintenance
-                    live.update(render_layout())
+                    refresh()
                 else:
                     shortcuts = get_shortcuts()
                     key_lower = key.lower()
@@ -1528,7 +1980,9 @@ def display_rds_table(rds_instances, metrics=None, pricing=None, ri_matches=None
                         else:
                             sort_state['key'] = shortcuts[key_lower]
                             sort_state['ascending'] = True
-                        live.update(render_layout())
+                        refresh()
             except KeyboardInterrupt:
+                with render_lock:
+                    live_ref.pop('live', None)
                 clear_terminal()
                 return
\ No newline at end of file